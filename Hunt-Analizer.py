@@ -42,6 +42,9 @@ def ensure_icon():
 # configuration / DB helpers
 
 DB_PATH = "tibia_hunts.db"
+# From schema version 5 on (written by main.py) Hunts has no text columns and
+# this script would corrupt or fail on the database.
+ULTIMO_SCHEMA_SUPORTADO = 4
 
 ensure_icon()
 
@@ -57,6 +60,13 @@ def resource_path(relative_path):
 # -------------------------
 # Database
 # -------------------------
+def versao_schema():
+    if not os.path.exists(DB_PATH):
+        return 0
+    with closing(sqlite3.connect(DB_PATH)) as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
 def conectar_sqlite():
     conn = sqlite3.connect(DB_PATH)
     conn.execute("PRAGMA foreign_keys = ON;")
@@ -251,6 +261,17 @@ def seguro_int(valor):
             return 0
 
 
+def ler_log(caminho):
+    # Bytes are read once; latin-1 only when they are not valid UTF-8
+    with open(caminho, "rb") as f:
+        dados = f.read()
+    try:
+        texto = dados.decode("utf-8")
+    except UnicodeDecodeError:
+        texto = dados.decode("latin-1")
+    return texto.replace("\r\n", "\n").replace("\r", "\n")
+
+
 def extrair_monstros(texto):
     m = re.search(r"Killed Monsters:\s*(.*?)(?:Looted Items:|$)", texto, re.DOTALL | re.IGNORECASE)
     trecho = m.group(1) if m else ""
@@ -1161,12 +1182,7 @@ class App(tk.Tk):
         )
         if not caminho:
             return
-        try:
-            with open(caminho, "r", encoding="utf-8") as f:
-                conteudo = f.read()
-        except UnicodeDecodeError:
-            with open(caminho, "r", encoding="latin-1") as f:
-                conteudo = f.read()
+        conteudo = ler_log(caminho)
         self.text_dados.delete("1.0", tk.END)
         self.text_dados.insert(tk.END, conteudo)
 
@@ -1195,12 +1211,7 @@ class App(tk.Tk):
             return
         ok, falhas = 0, 0
         for c in sorted(arquivos):
-            try:
-                with open(c, "r", encoding="utf-8") as f:
-                    conteudo = f.read()
-            except UnicodeDecodeError:
-                with open(c, "r", encoding="latin-1") as f:
-                    conteudo = f.read()
+            conteudo = ler_log(c)
             if self._salvar_hunt(conteudo, orig_path=c):
                 ok += 1
             else:
@@ -1219,12 +1230,7 @@ class App(tk.Tk):
             return
         ok, falhas = 0, 0
         for c in caminhos:
-            try:
-                with open(c, "r", encoding="utf-8") as f:
-                    conteudo = f.read()
-            except UnicodeDecodeError:
-                with open(c, "r", encoding="latin-1") as f:
-                    conteudo = f.read()
+            conteudo = ler_log(c)
             if self._salvar_hunt(conteudo, orig_path=c):
                 ok += 1
             else:
@@ -1403,5 +1409,15 @@ class App(tk.Tk):
 
 
 if __name__ == "__main__":
+    if versao_schema() > ULTIMO_SCHEMA_SUPORTADO:
+        raiz = tk.Tk()
+        raiz.withdraw()
+        messagebox.showerror(
+            "Banco atualizado",
+            "O banco de dados foi atualizado por uma versão mais nova do Hunt-Analyzer.\n"
+            "Abra o aplicativo com: python main.py",
+        )
+        raiz.destroy()
+        sys.exit(1)
     app = App()
     app.mainloop()
@@ -6,12 +6,14 @@ binaries = []
 hiddenimports = ['tkinter', 'matplotlib.backends.backend_tkagg']
 tmp_ret = collect_all('matplotlib')
 datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
+tmp_ret = collect_all('customtkinter')
+datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
 tmp_ret = collect_all('numpy')
 datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
 
 
 a = Analysis(
-    ['Hunt-Analizer.py'],
+    ['main.py'],
     pathex=[],
     binaries=binaries,
     datas=datas,
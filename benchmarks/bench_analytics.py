@@ -0,0 +1,119 @@
+"""Times hunt_analytics.analyze() on a synthetic period of 100k hunts.
+
+    python benchmarks/bench_analytics.py [--hunts N] [--db PATH]
+
+With pandas installed, the DataFrame + row-wise apply path the analysis tab
+used before is timed on the same data and its bests are checked against
+analyze(); its growth is only printed next to analyze()'s, as the order of
+same-day hunts was left to an unstable sort. With --db, get_columns + analyze() is also timed on every
+hunt of an existing database; opening it through the repository migrates it
+to the current schema, so point it at a copy.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.application.services.hunt_analytics import ANALYSIS_FIELDS, analyze  # noqa: E402
+
+
+def synthetic_columns(n: int, seed: int = 15) -> dict:
+    """Columns shaped like get_columns' output: sorted dates, some undated, some without duration."""
+    rng = np.random.default_rng(seed)
+    days = np.sort(rng.integers(0, 4 * 365, n))
+    dates = np.datetime64("2022-01-01") + days.astype("timedelta64[D]")
+    dates[-max(1, n // 200):] = np.datetime64("NaT")  # undated hunts come last
+    duration = rng.integers(0, 240, n)
+    duration[rng.random(n) < 0.02] = 0
+    loot = rng.integers(0, 3_000_000, n)
+    supplies = rng.integers(0, 1_500_000, n)
+    xp = rng.integers(0, 20_000_000, n)
+    return {
+        "date": dates,
+        "duration_min": duration,
+        "xp_gain": xp,
+        "raw_xp_gain": xp * 2 // 3,
+        "loot": loot,
+        "supplies": supplies,
+        "balance": loot - supplies,
+        "damage": rng.integers(0, 50_000_000, n),
+    }
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def pandas_baseline(cols: dict):
+    """The previous update_analysis computations, on a newest-first DataFrame like get_all's."""
+    import pandas as pd
+
+    df = pd.DataFrame({k: v[::-1] for k, v in cols.items()})
+    df["hours"] = df["duration_min"] / 60.0
+    df["raw_xph"] = df.apply(lambda x: x["raw_xp_gain"] / x["hours"] if x["hours"] > 0 else 0, axis=1)
+    df["bal_h"] = df.apply(lambda x: x["balance"] / x["hours"] if x["hours"] > 0 else 0, axis=1)
+    bests = {}
+    for attr, col in (("best_raw_xp_h", "raw_xph"), ("best_balance", "balance"), ("best_balance_h", "bal_h")):
+        row = df.loc[df[col].idxmax()]
+        bests[attr] = (float(row[col]), "" if pd.isna(row["date"]) else str(row["date"].date()))
+    df_sorted = df.sort_values("date")
+
+    def growth(col):
+        first_n = df_sorted.head(3)[col].mean()
+        last_n = df_sorted.tail(3)[col].mean()
+        return 0.0 if first_n == 0 else (last_n - first_n) / first_n * 100
+
+    return bests, growth("raw_xph"), growth("bal_h")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--hunts", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--db", help="also time get_columns + analyze() on this database")
+    args = ap.parse_args()
+
+    cols = synthetic_columns(args.hunts)
+    elapsed = best_of(lambda: analyze(cols), args.repeat)
+    print(f"analyze(), {args.hunts:,} hunts: {elapsed * 1000:.1f} ms")
+
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        print("pandas not installed: baseline skipped")
+    else:
+        start = time.perf_counter()
+        bests, growth_raw, growth_bal = pandas_baseline(cols)
+        print(f"pandas apply baseline: {(time.perf_counter() - start) * 1000:.1f} ms")
+        result = analyze(cols)
+        for attr, (value, date) in bests.items():
+            best = getattr(result, attr)
+            assert np.isclose(best.value, value) and best.date == date, (attr, best, value, date)
+        print("bests match the baseline")
+        print(f"growth raw XP/h: {result.growth_raw_xp_h:+.2f}% (baseline {growth_raw:+.2f}%), "
+              f"balance/h: {result.growth_balance_h:+.2f}% (baseline {growth_bal:+.2f}%)")
+
+    if args.db:
+        from src.infrastructure.database.sqlite_repository import SQLiteHuntRepository
+
+        repo = SQLiteHuntRepository(args.db)
+        try:
+            rows = len(repo.get_columns({}, ("date",))["date"])
+            elapsed = best_of(lambda: analyze(repo.get_columns({}, ANALYSIS_FIELDS)), args.repeat)
+            print(f"get_columns + analyze(), {rows:,} hunts in {args.db}: {elapsed * 1000:.1f} ms")
+        finally:
+            repo.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
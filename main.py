@@ -1,5 +1,9 @@
+# First import: startup time is traced from here (HUNT_ANALYZER_TRACE=1)
+from src.infrastructure import startup_trace
+import multiprocessing
 import sys
 from pathlib import Path
+from src.infrastructure.database.cached_repository import CachedHuntRepository
 from src.infrastructure.database.sqlite_repository import SQLiteHuntRepository
 from src.infrastructure.parser.log_parser import LogParser
 from src.ui.main_window import MainApp
@@ -16,10 +20,19 @@ def resource_path(relative_path):
     return Path(base_path) / relative_path
 
 if __name__ == "__main__":
+    # Required by the import's parse processes in frozen builds
+    multiprocessing.freeze_support()
+    startup_trace.mark("imports")
+
     # Dependency Injection Container (Manually)
     db_path = "tibia_hunts.db"
-    repository = SQLiteHuntRepository(db_path)
+    # Read results are cached until the next write
+    repository = CachedHuntRepository(SQLiteHuntRepository(db_path))
     parser = LogParser()
+    startup_trace.mark("database open/migrate")
     
     app = MainApp(repository=repository, parser=parser)
+    startup_trace.mark("main window built")
+    if startup_trace.ENABLED:
+        app.after_idle(lambda: startup_trace.finish(app.on_close))
     app.mainloop()
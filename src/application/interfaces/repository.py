@@ -1,20 +1,136 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from src.domain.entities import Hunt
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from src.domain.entities import Hunt, ScannedFile
+
+class SaveResult(NamedTuple):
+    hunt_id: Optional[int]
+    error: Optional[str] = None
+    existing: bool = False  # the same log was already stored as hunt_id
+
+class DuplicateCleanup(NamedTuple):
+    removed: int                 # hunts deleted as copies of an earlier one
+    backup_path: Optional[str]   # copy of the database taken first; None when nothing was deleted
+
+class LootBackfill(NamedTuple):
+    filled: int  # hunts that received loot rows in this call
+    done: bool   # no hunt left to examine
+
+# Orders of the hunt list, as (column, descending). "date" is date then
+# start time, with a missing date sorting first and a missing start time
+# last (descending), as in get_all; the numeric columns treat NULL as 0.
+# Ties are broken by id, in the same direction.
+SORT_COLUMNS = ("date", "id", "duration_min", "xp_gain", "loot", "supplies", "balance")
+HuntOrder = Tuple[str, bool]
+DEFAULT_ORDER: HuntOrder = ("date", True)
+
+# Position of a hunt in a list order: its sort values, then its id
+# ((date, start time, id) in the default order).
+PageKey = Tuple[Any, ...]
+
+class HuntPage(NamedTuple):
+    hunts: List[Hunt]
+    next_key: Optional[PageKey]  # pass as after_key for the next page; None on the last page
+
+@dataclass
+class HuntChanges:
+    """Hunts written since the last drain_changes().
+
+    characters, locations and dates hold the values of the changed hunts
+    both before and after the change, so a view can tell whether its
+    filters see any of them.
+    """
+    inserted: Set[int] = field(default_factory=set)
+    updated: Set[int] = field(default_factory=set)
+    deleted: Set[int] = field(default_factory=set)
+    characters: Set[str] = field(default_factory=set)
+    locations: Set[str] = field(default_factory=set)
+    dates: Set[str] = field(default_factory=set)
+    lists: bool = False       # characters/locations added, removed or a new default
+    everything: bool = False  # hunt data changed in bulk, without ids (loot backfill)
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted or self.lists or self.everything)
+
+    def merge(self, other: "HuntChanges") -> None:
+        self.inserted |= other.inserted
+        self.updated |= other.updated
+        self.deleted |= other.deleted
+        self.characters |= other.characters
+        self.locations |= other.locations
+        self.dates |= other.dates
+        self.lists |= other.lists
+        self.everything |= other.everything
+
+    def touches(self, filters: dict) -> bool:
+        """Whether a query with these filters may see one of the changed hunts."""
+        if self.everything:
+            return True
+        if not (self.inserted or self.updated or self.deleted):
+            return False
+        character = filters.get("character")
+        if character and character != "Todos" and character not in self.characters:
+            return False
+        location = (filters.get("location_like") or "").lower()
+        if location and not any(location in loc.lower() for loc in self.locations):
+            return False
+        start, end = filters.get("date_start"), filters.get("date_end")
+        if start or end:
+            return any((not start or d >= start) and (not end or d <= end) for d in self.dates)
+        return True
 
 class HuntRepository(ABC):
     @abstractmethod
     def save(self, hunt: Hunt) -> int:
         pass
 
+    @abstractmethod
+    def save_many(self, hunts: List[Hunt], chunk_size: int = 500) -> List[SaveResult]:
+        pass
+
     @abstractmethod
     def get_all(self, filters: dict) -> List[Hunt]:
         pass
 
+    @abstractmethod
+    def get_page(
+        self, filters: dict, after_key: Optional[PageKey] = None, limit: int = 200, order: HuntOrder = DEFAULT_ORDER
+    ) -> HuntPage:
+        pass
+
+    @abstractmethod
+    def get_page_keys(self, filters: dict, page_size: int, order: HuntOrder = DEFAULT_ORDER) -> List[PageKey]:
+        pass
+
+    @abstractmethod
+    def count(self, filters: dict) -> int:
+        pass
+
+    @abstractmethod
+    def get_columns(self, filters: dict, fields: Sequence[str]) -> Dict[str, Any]:
+        # Field name -> NumPy array, one element per hunt in chronological order
+        pass
+
     @abstractmethod
     def get_by_id(self, hunt_id: int) -> Optional[Hunt]:
         pass
 
+    @abstractmethod
+    def existing_session_keys(
+        self, keys: Iterable[Tuple[Optional[str], str, str]]
+    ) -> Dict[Tuple[Optional[str], str, str], int]:
+        pass
+
+    @abstractmethod
+    def count_duplicate_hunts(self) -> int:
+        """Hunts storing the same log as an earlier hunt (same content_hash)."""
+        pass
+
+    @abstractmethod
+    def remove_duplicate_hunts(self) -> DuplicateCleanup:
+        """Deletes those hunts, after backing up the database; an explicit user action."""
+        pass
+
     @abstractmethod
     def delete_many(self, item_ids: List[int]) -> None:
         pass
@@ -35,6 +151,17 @@ class HuntRepository(ABC):
     def get_monster_aggregates(self, filters: dict) -> List[tuple]:
         pass
 
+    @abstractmethod
+    def get_loot_aggregates(self, filters: dict) -> List[tuple]:
+        pass
+
+    @abstractmethod
+    def backfill_loot(
+        self, extract_items: Callable[[str], List[Tuple[str, int]]], batch_size: int = 500,
+        max_batches: Optional[int] = None,
+    ) -> LootBackfill:
+        pass
+
     @abstractmethod
     def list_characters(self) -> List[str]:
         pass
@@ -67,6 +194,18 @@ class HuntRepository(ABC):
     def delete_location(self, name: str) -> None:
         pass
 
+    @abstractmethod
+    def get_scan_manifest(self, folder: str) -> List[ScannedFile]:
+        pass
+
+    @abstractmethod
+    def save_scan_manifest(self, entries: List[ScannedFile]) -> None:
+        pass
+
+    @abstractmethod
+    def delete_scan_manifest(self, paths: List[str]) -> None:
+        pass
+
     @abstractmethod
     def get_setting(self, key: str) -> Optional[str]:
         pass
@@ -74,3 +213,17 @@ class HuntRepository(ABC):
     @abstractmethod
     def set_setting(self, key: str, value: str) -> None:
         pass
+
+    @abstractmethod
+    def drain_changes(self) -> HuntChanges:
+        """Changes committed since the last call. Touches no database: any thread may call it."""
+        pass
+
+    @abstractmethod
+    def release_thread(self) -> None:
+        """Frees what the calling thread holds; a short-lived thread calls it before exiting."""
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
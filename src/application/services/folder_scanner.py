@@ -0,0 +1,102 @@
+import hashlib
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.application.interfaces.repository import HuntRepository
+from src.domain.entities import ScannedFile
+from src.infrastructure.parser.log_parser import LogParser
+
+LOG_EXTENSIONS = (".txt", ".log")
+
+
+@dataclass
+class ScanResult:
+    new_files: List[str] = field(default_factory=list)  # hunt logs not in the database yet
+    known: int = 0      # files whose hunt is already stored
+    ignored: int = 0    # files that are not hunt logs
+    opened: int = 0     # files that had to be read this scan
+
+
+class FolderScanner:
+    """Incremental scan of the log folder, driven by the ScanManifest table.
+
+    A file whose size and mtime match its manifest entry is classified from
+    the manifest alone. Of changed files only the first bytes are read
+    (LogParser.read_head/session_key): the session line decides the classification,
+    so the manifest hash covers just those bytes. Logs are parsed in full
+    only when imported.
+    """
+
+    def __init__(self, repo: HuntRepository, parser: LogParser):
+        self.repo = repo
+        self.parser = parser
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _read_entry(self, path: str, st: os.stat_result, rec: Optional[ScannedFile]) -> ScannedFile:
+        head = self.parser.read_head(path)
+        digest = self.content_hash(head)
+        if rec and rec.content_hash == digest:
+            # Touched, or changed after the session line: same session
+            rec.size, rec.mtime_ns = st.st_size, st.st_mtime_ns
+            return rec
+        rec = ScannedFile(path, st.st_size, st.st_mtime_ns, digest)
+        # Of a concatenated dump, only the first session identifies the file
+        key = self.parser.session_key(head, path)
+        if key:
+            rec.session_key = f"{key.date} {key.start_time}"
+        return rec
+
+    def scan(self, folder: str) -> ScanResult:
+        result = ScanResult()
+        manifest: Dict[str, ScannedFile] = {e.path: e for e in self.repo.get_scan_manifest(folder)}
+        seen = set()
+        current: List[ScannedFile] = []           # every log file in the folder
+        updated: Dict[str, ScannedFile] = {}      # manifest rows to write back, by path
+
+        with os.scandir(folder) as it:
+            for entry in it:
+                if not entry.name.endswith(LOG_EXTENSIONS) or not entry.is_file():
+                    continue
+                st = entry.stat()
+                seen.add(entry.path)
+                rec = manifest.get(entry.path)
+                if rec and rec.size == st.st_size and rec.mtime_ns == st.st_mtime_ns:
+                    current.append(rec)
+                    continue
+
+                try:
+                    rec = self._read_entry(entry.path, st, rec)
+                except (OSError, ValueError):
+                    continue
+                result.opened += 1
+                current.append(rec)
+                updated[rec.path] = rec
+
+        # New or still-pending files (they may have been imported since the last
+        # scan) are checked against the database in a single query.
+        pending = [rec for rec in current if rec.session_key and rec.hunt_id is None]
+        stored = self.repo.existing_session_keys(
+            (None,) + tuple(rec.session_key.split(" ", 1)) for rec in pending
+        )
+        for rec in pending:
+            hunt_id = stored.get((None,) + tuple(rec.session_key.split(" ", 1)))
+            if hunt_id is not None:
+                rec.hunt_id = hunt_id
+                updated[rec.path] = rec
+
+        for rec in current:
+            if not rec.session_key:
+                result.ignored += 1
+                continue
+            if rec.hunt_id is None:
+                result.new_files.append(rec.path)
+            else:
+                result.known += 1
+
+        self.repo.save_scan_manifest(list(updated.values()))
+        self.repo.delete_scan_manifest([p for p in manifest if p not in seen])
+        return result
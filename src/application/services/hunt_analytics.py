@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+# Columns analyze() reads from HuntRepository.get_columns
+ANALYSIS_FIELDS = ("date", "duration_min", "xp_gain", "raw_xp_gain", "loot", "supplies", "balance", "damage")
+
+# Columns reported as totals
+_TOTAL_FIELDS = ("duration_min", "xp_gain", "raw_xp_gain", "loot", "supplies", "balance", "damage")
+
+
+@dataclass
+class Best:
+    value: float
+    date: str  # ISO date of the hunt, "" when it has none
+
+
+@dataclass
+class AnalysisResult:
+    hunts: int = 0
+    total_min: int = 0
+    total_xp: int = 0
+    total_raw_xp: int = 0
+    total_loot: int = 0
+    total_supplies: int = 0
+    total_balance: int = 0
+    total_damage: int = 0
+    # Totals over total hours; 0 when no hunt has a duration
+    xp_h: float = 0.0
+    raw_xp_h: float = 0.0
+    balance_h: float = 0.0
+    # Per-hunt averages; hunts without duration count as a rate of 0
+    avg_raw_xp: float = 0.0
+    avg_raw_xp_h: float = 0.0
+    avg_balance: float = 0.0
+    avg_balance_h: float = 0.0
+    best_raw_xp_h: Optional[Best] = None
+    best_balance: Optional[Best] = None
+    best_balance_h: Optional[Best] = None
+    # Percent change, first 3 vs last 3 hunts; None with fewer than 4 hunts
+    growth_raw_xp_h: Optional[float] = None
+    growth_balance_h: Optional[float] = None
+
+
+def _fmt_date(d) -> str:
+    return "" if np.isnat(d) else str(d)
+
+
+def _growth(values: np.ndarray) -> float:
+    first_n = values[:3].mean()
+    last_n = values[-3:].mean()
+    if first_n == 0:
+        return 0.0
+    return float((last_n - first_n) / first_n * 100)
+
+
+def analyze(cols: Dict[str, np.ndarray]) -> AnalysisResult:
+    """Summary statistics of a period, from get_columns(filters, ANALYSIS_FIELDS).
+
+    The columns must be in chronological order, as get_columns returns them.
+    """
+    dates = cols["date"]
+    n = len(dates)
+    result = AnalysisResult(hunts=n)
+    if not n:
+        return result
+
+    # Each column is summed once; the averages below reuse these totals
+    total_min, total_xp, total_raw, total_loot, total_supplies, total_balance, total_damage = (
+        int(cols[f].sum()) for f in _TOTAL_FIELDS
+    )
+    result.total_min = total_min
+    result.total_xp = total_xp
+    result.total_raw_xp = total_raw
+    result.total_loot = total_loot
+    result.total_supplies = total_supplies
+    result.total_balance = total_balance
+    result.total_damage = total_damage
+
+    horas = total_min / 60.0
+    if horas > 0:
+        result.xp_h = total_xp / horas
+        result.raw_xp_h = total_raw / horas
+        result.balance_h = total_balance / horas
+    result.avg_raw_xp = total_raw / n
+    result.avg_balance = total_balance / n
+
+    # Per-hunt rates, masked where the duration is 0
+    hours = cols["duration_min"] / 60.0
+    has_time = hours > 0
+    raw_xph = np.divide(cols["raw_xp_gain"], hours, out=np.zeros(n), where=has_time)
+    bal_h = np.divide(cols["balance"], hours, out=np.zeros(n), where=has_time)
+    result.avg_raw_xp_h = float(raw_xph.mean())
+    result.avg_balance_h = float(bal_h.mean())
+
+    balance = cols["balance"]
+    for attr, values in (("best_raw_xp_h", raw_xph), ("best_balance", balance), ("best_balance_h", bal_h)):
+        # Ties go to the latest hunt, as idxmax over the newest-first list did
+        i = n - 1 - int(values[::-1].argmax())
+        setattr(result, attr, Best(float(values[i]), _fmt_date(dates[i])))
+
+    if n >= 4:
+        result.growth_raw_xp_h = _growth(raw_xph)
+        result.growth_balance_h = _growth(bal_h)
+    return result
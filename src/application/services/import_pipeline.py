@@ -0,0 +1,335 @@
+import collections
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.application.interfaces.repository import HuntRepository
+from src.domain.entities import Hunt, LootItem, Monster
+from src.infrastructure.parser.log_parser import LogParser
+
+_END = object()
+
+# Files per chunk sent to a parse process, and chunks in flight per process
+_PARSE_CHUNK = 32
+_CHUNKS_PER_WORKER = 2
+
+
+def _parse_texts(texts: List[str]) -> List[Tuple[Optional[tuple], Optional[str]]]:
+    # Runs in a parse process. The texts are pickled to it; the results carry
+    # only the parsed fields, not the texts, which the parent still holds.
+    return [
+        (None, r.error) if r.error else ((r.info, r.monsters, r.items), None)
+        for r in LogParser().parse_many(texts, workers=1)
+    ]
+
+
+def build_hunt(
+    info: Dict[str, Any],
+    monsters: List[Tuple[str, int]],
+    items: List[Tuple[str, int]],
+    text: str,
+    character: str,
+    location: str,
+) -> Hunt:
+    """Hunt entity from LogParser.parse_session output."""
+    return Hunt(
+        id=None,
+        character=character,
+        location=location,
+        date=info["data_inicio"] or "",
+        start_time=info["hora_inicio"] or "",
+        end_time=info["hora_fim"] or "",
+        duration_min=info["duracao_min"],
+        raw_xp_gain=info["raw_xp_gain"],
+        xp_gain=info["xp_gain"],
+        loot=info["loot"],
+        supplies=info["supplies"],
+        balance=info["balance"],
+        damage=info["damage"],
+        healing=info["healing"],
+        raw_text=text,
+        monsters=[Monster(name=n, amount=q) for n, q in monsters],
+        looted_items=[LootItem(name=n, amount=q) for n, q in items],
+    )
+
+
+@dataclass
+class ImportProgress:
+    total: int                  # files in this run
+    done: int = 0               # files finished: saved, already stored or failed
+    saved: int = 0
+    duplicates: int = 0         # sessions or logs already in the database
+    failed: int = 0             # files, or sessions of a multi-session file, not imported
+    bytes_read: int = 0
+    elapsed: float = 0.0        # seconds
+    cancelled: bool = False
+    errors: List[str] = field(default_factory=list)  # "file: message"
+
+    @property
+    def files_per_s(self) -> float:
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes_read / 1e6 / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ImportPipeline:
+    """Bulk import of log files: read -> parse -> write, one thread per stage.
+
+    The stages are connected by bounded queues, so only a few hundred files
+    are in memory whatever the size of the import. run() itself is the write
+    stage, and therefore the only thread writing to the database: it saves
+    batches of hunts, one transaction each; a session whose log text is
+    already stored (same content hash) counts as a duplicate.
+
+    After each batch the position in the file list is stored in Settings.
+    A cancelled or interrupted import can be resumed from there with
+    pending(); a batch saved just before an interruption is recognized as
+    already stored on resume.
+    """
+
+    SETTING_PATHS = "import_pending_paths"
+    SETTING_POSITION = "import_pending_position"
+
+    def __init__(
+        self,
+        repo: HuntRepository,
+        parser: LogParser,
+        batch_size: int = 200,
+        queue_size: int = 64,
+        workers: Optional[int] = None,
+    ):
+        self.repo = repo
+        self.parser = parser
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        # Parse processes; parsing in a thread would compete with the writer for the GIL
+        self.workers = workers if workers is not None else min(4, (os.cpu_count() or 1) - 1)
+
+    def pending(self) -> List[str]:
+        """Files not yet imported by the last cancelled or interrupted run."""
+        paths = self.repo.get_setting(self.SETTING_PATHS)
+        if not paths:
+            return []
+        position = int(self.repo.get_setting(self.SETTING_POSITION) or 0)
+        return json.loads(paths)[position:]
+
+    def discard_pending(self) -> None:
+        self.repo.set_setting(self.SETTING_PATHS, "")
+        self.repo.set_setting(self.SETTING_POSITION, "0")
+
+    def run(
+        self,
+        paths: List[str],
+        character: str,
+        location: str,
+        progress: Optional[Callable[[ImportProgress], None]] = None,
+        cancel: Optional[threading.Event] = None,
+        resumable: bool = True,
+    ) -> ImportProgress:
+        """Imports paths; progress receives a snapshot after every batch.
+
+        Setting cancel stops the import after the batch being written.
+        With resumable=False the run leaves the pending() list alone, for
+        small background imports that must not replace a user's import.
+        """
+        paths = list(paths)
+        cancel = cancel or threading.Event()
+        stop = threading.Event()  # tells the other stages to quit early
+        read_q: "queue.Queue" = queue.Queue(self.queue_size)
+        parsed_q: "queue.Queue" = queue.Queue(self.queue_size)
+        result = ImportProgress(total=len(paths))
+        started = time.perf_counter()
+
+        if resumable:
+            self.repo.set_setting(self.SETTING_PATHS, json.dumps(paths))
+            self.repo.set_setting(self.SETTING_POSITION, "0")
+
+        def put(q: "queue.Queue", item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def get(q: "queue.Queue") -> Any:
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            return _END
+
+        def read_stage() -> None:
+            for path in paths:
+                if stop.is_set():
+                    return
+                try:
+                    size, texts = self.parser.read_sessions(path)
+                    item = (path, size, texts, None)
+                except (OSError, ValueError) as e:
+                    item = (path, 0, [], str(e))
+                if not put(read_q, item):
+                    return
+            put(read_q, _END)
+
+        def to_hunts(item: tuple, results: list) -> tuple:
+            # One hunt per session of the file; concatenated dumps hold several
+            path, size, texts, read_error = item
+            if read_error:
+                return (path, size, [], [read_error])
+            hunts, errors = [], []
+            for text, (parsed, error) in zip(texts, results):
+                if error is None:
+                    info, monsters, items = parsed
+                    if info["data_inicio"] or info["hora_inicio"]:
+                        hunts.append(build_hunt(info, monsters, items, text, character, location))
+                        continue
+                    error = "não é um log de sessão de caça"
+                errors.append(error)
+            return (path, size, hunts, errors)
+
+        def parse_serial() -> None:
+            while True:
+                item = get(read_q)
+                if item is _END:
+                    break
+                if not put(parsed_q, to_hunts(item, _parse_texts(item[2]))):
+                    return
+            put(parsed_q, _END)
+
+        def parse_pool(pool) -> None:
+            # Chunks are submitted as files arrive and collected in order
+            in_flight: "collections.deque" = collections.deque()
+            reading = True
+            while reading or in_flight:
+                if reading and len(in_flight) < self.workers * _CHUNKS_PER_WORKER:
+                    chunk = []
+                    while len(chunk) < _PARSE_CHUNK:
+                        item = get(read_q) if not chunk else self._get_nowait(read_q)
+                        if item is None:
+                            break
+                        if item is _END:
+                            reading = False
+                            break
+                        chunk.append(item)
+                    if chunk:
+                        try:
+                            future = pool.submit(_parse_texts, [t for i in chunk for t in i[2]])
+                        except Exception:
+                            future = None  # broken pool: parsed here when collected
+                        in_flight.append((chunk, future))
+                    continue
+                chunk, future = in_flight.popleft()
+                results = None
+                if future is not None:
+                    try:
+                        results = future.result()
+                    except Exception:
+                        pass
+                if results is None:
+                    # Broken pool (frozen app without freeze_support, sandboxed OS...)
+                    results = _parse_texts([t for i in chunk for t in i[2]])
+                results = iter(results)
+                for item in chunk:
+                    file_results = [next(results) for _ in item[2]]
+                    if not put(parsed_q, to_hunts(item, file_results)):
+                        return
+            put(parsed_q, _END)
+
+        def parse_stage() -> None:
+            if self.workers > 1 and len(paths) >= self.batch_size:
+                from concurrent.futures import ProcessPoolExecutor  # costly to import
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    parse_pool(pool)
+            else:
+                parse_serial()
+
+        failures: List[BaseException] = []
+
+        def guarded(stage: Callable[[], None]) -> Callable[[], None]:
+            # An unexpected error stops every stage and is raised by the writer
+            def run_stage() -> None:
+                try:
+                    stage()
+                except BaseException as e:
+                    failures.append(e)
+                    stop.set()
+            return run_stage
+
+        stages = [
+            threading.Thread(target=guarded(read_stage), name="import-read", daemon=True),
+            threading.Thread(target=guarded(parse_stage), name="import-parse", daemon=True),
+        ]
+        for t in stages:
+            t.start()
+
+        batch: List[Tuple[str, Hunt]] = []
+        consumed = 0  # files taken from parsed_q, in list order
+        try:
+            while True:
+                try:
+                    item = parsed_q.get(timeout=0.1)
+                except queue.Empty:
+                    if failures:
+                        break
+                    continue
+                finished = item is _END
+                if cancel.is_set() and not finished:
+                    result.cancelled = finished = True
+                if item is not _END:
+                    path, size, hunts, errors = item
+                    consumed += 1
+                    result.bytes_read += size
+                    result.failed += len(errors)
+                    result.errors.extend(f"{os.path.basename(path)}: {e}" for e in errors)
+                    batch.extend((path, h) for h in hunts)
+                if finished or len(batch) >= self.batch_size:
+                    self._write_batch(batch, result)
+                    batch = []
+                    result.done = consumed
+                    result.elapsed = time.perf_counter() - started
+                    if resumable:
+                        self.repo.set_setting(self.SETTING_POSITION, str(consumed))
+                    if progress:
+                        progress(replace(result, errors=list(result.errors)))
+                if finished:
+                    break
+        finally:
+            stop.set()
+            for t in stages:
+                t.join()
+        if failures:
+            raise failures[0]
+
+        result.elapsed = time.perf_counter() - started
+        if resumable and not result.cancelled:
+            self.discard_pending()
+        return result
+
+    @staticmethod
+    def _get_nowait(q: "queue.Queue") -> Any:
+        try:
+            return q.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _write_batch(self, batch: List[Tuple[str, Hunt]], result: ImportProgress) -> None:
+        if not batch:
+            return
+        saved = self.repo.save_many([h for _, h in batch], chunk_size=len(batch))
+        for (path, _), res in zip(batch, saved):
+            if res.error:
+                result.failed += 1
+                result.errors.append(f"{os.path.basename(path)}: {res.error}")
+            elif res.existing:
+                result.duplicates += 1  # same log text, stored before or earlier in the import
+            else:
+                result.saved += 1
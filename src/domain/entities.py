@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, List
 
 @dataclass
@@ -7,6 +7,12 @@ class Monster:
     amount: int
     hunt_id: Optional[int] = None
 
+@dataclass
+class LootItem:
+    name: str
+    amount: int
+    hunt_id: Optional[int] = None
+
 @dataclass
 class Hunt:
     id: Optional[int]
@@ -25,8 +31,19 @@ class Hunt:
     healing: int
     raw_text: str
     monsters: List[Monster]
+    looted_items: List[LootItem] = field(default_factory=list)
     
     @property
     def payment(self) -> int:
         # Business logic: Payment is equal to negative balance (waste)
         return abs(self.balance) if self.balance < 0 else 0
+
+@dataclass
+class ScannedFile:
+    """Fingerprint of a log file seen by the folder scan."""
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    hunt_id: Optional[int] = None
+    session_key: str = ""  # "YYYY-MM-DD HH:MM:SS" of the session start, "" if not a hunt log
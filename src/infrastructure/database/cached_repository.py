@@ -0,0 +1,300 @@
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import is_dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.application.interfaces.repository import (
+    DEFAULT_ORDER, DuplicateCleanup, HuntChanges, HuntOrder, HuntPage, HuntRepository, LootBackfill, PageKey,
+    SaveResult,
+)
+from src.domain.entities import Hunt, ScannedFile
+
+
+def _estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate memory held by a cached result, in bytes."""
+    size = sys.getsizeof(value)
+    if _depth > 4:
+        return size
+    if is_dataclass(value) and not isinstance(value, type):
+        return size + _estimate_size(value.__dict__, _depth + 1)
+    if isinstance(value, dict):
+        return size + sum(_estimate_size(k, _depth + 1) + _estimate_size(v, _depth + 1) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(_estimate_size(v, _depth + 1) for v in value)
+    return size
+
+
+def _normalize_filters(filters: Optional[dict]) -> Tuple:
+    """Hashable form of a filters dict; filters with no effect are dropped.
+
+    Every repository query treats a missing key, an empty value and the
+    "Todos" character alike, so they share one cache entry.
+    """
+    if not filters:
+        return ()
+    items = []
+    for key, value in filters.items():
+        if value in (None, "") or (key == "character" and value == "Todos"):
+            continue
+        items.append((key, value))
+    return tuple(sorted(items))
+
+
+class QueryCache:
+    """Bounded LRU of query results, with size accounting and a data generation.
+
+    A result is stored only if no write happened while it was being computed:
+    the generation is read before the query and compared when storing.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+
+    def get_or_compute(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = self.generation
+
+        value = compute()
+        size = _estimate_size(value)
+        with self._lock:
+            if generation == self.generation and size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, old_size) = self._entries.popitem(last=False)
+                    self._bytes -= old_size
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+class CachedHuntRepository(HuntRepository):
+    """Caches the read queries of another HuntRepository.
+
+    Reads are keyed by method and normalized arguments; every write bumps the
+    data generation, which drops all cached results. Cached lists and dicts
+    are returned as shallow copies, the Hunt objects in them are shared and
+    must be treated as read-only. get_by_id and the folder-scan lookups are
+    not cached: their results are edited by the callers.
+    """
+
+    def __init__(self, inner: HuntRepository, max_bytes: int = 32 * 1024 * 1024):
+        self.inner = inner
+        self.cache = QueryCache(max_bytes)
+
+    def __getattr__(self, name: str):
+        # Backend attributes outside the interface (db_path...) pass through uncached
+        return getattr(self.inner, name)
+
+    def _cached(self, method: str, args: Tuple, compute: Callable[[], Any]) -> Any:
+        value = self.cache.get_or_compute((method,) + args, compute)
+        if isinstance(value, list):
+            return list(value)
+        if isinstance(value, dict):
+            return dict(value)
+        return value
+
+    # Reads
+
+    def get_all(self, filters: dict) -> List[Hunt]:
+        return self._cached("get_all", (_normalize_filters(filters),), lambda: self.inner.get_all(filters))
+
+    def get_page(
+        self, filters: dict, after_key: Optional[PageKey] = None, limit: int = 200, order: HuntOrder = DEFAULT_ORDER
+    ) -> HuntPage:
+        page = self._cached(
+            "get_page", (_normalize_filters(filters), after_key, limit, tuple(order)),
+            lambda: self.inner.get_page(filters, after_key, limit, order),
+        )
+        return HuntPage(list(page.hunts), page.next_key)
+
+    def get_page_keys(self, filters: dict, page_size: int, order: HuntOrder = DEFAULT_ORDER) -> List[PageKey]:
+        return list(self._cached(
+            "get_page_keys", (_normalize_filters(filters), page_size, tuple(order)),
+            lambda: self.inner.get_page_keys(filters, page_size, order),
+        ))
+
+    def count(self, filters: dict) -> int:
+        return self._cached("count", (_normalize_filters(filters),), lambda: self.inner.count(filters))
+
+    def get_columns(self, filters: dict, fields: Sequence[str]) -> Dict[str, Any]:
+        # The arrays are shared between callers: they are made read-only
+        return self._cached(
+            "get_columns", (_normalize_filters(filters), tuple(fields)),
+            lambda: self._read_only(self.inner.get_columns(filters, fields)),
+        )
+
+    @staticmethod
+    def _read_only(columns: Dict[str, Any]) -> Dict[str, Any]:
+        for array in columns.values():
+            array.flags.writeable = False
+        return columns
+
+    def get_analytics(self, filters: dict) -> dict:
+        return self._cached("get_analytics", (_normalize_filters(filters),), lambda: self.inner.get_analytics(filters))
+
+    def get_monster_aggregates(self, filters: dict) -> List[tuple]:
+        return self._cached(
+            "get_monster_aggregates", (_normalize_filters(filters),),
+            lambda: self.inner.get_monster_aggregates(filters),
+        )
+
+    def get_loot_aggregates(self, filters: dict) -> List[tuple]:
+        return self._cached(
+            "get_loot_aggregates", (_normalize_filters(filters),),
+            lambda: self.inner.get_loot_aggregates(filters),
+        )
+
+    def list_characters(self) -> List[str]:
+        return self._cached("list_characters", (), self.inner.list_characters)
+
+    def get_default_character(self) -> str:
+        return self._cached("get_default_character", (), self.inner.get_default_character)
+
+    def list_locations(self) -> List[str]:
+        return self._cached("list_locations", (), self.inner.list_locations)
+
+    def get_setting(self, key: str) -> Optional[str]:
+        return self._cached("get_setting", (key,), lambda: self.inner.get_setting(key))
+
+    # Uncached reads
+
+    def get_by_id(self, hunt_id: int) -> Optional[Hunt]:
+        return self.inner.get_by_id(hunt_id)
+
+    def existing_session_keys(
+        self, keys: Iterable[Tuple[Optional[str], str, str]]
+    ) -> Dict[Tuple[Optional[str], str, str], int]:
+        return self.inner.existing_session_keys(keys)
+
+    def get_scan_manifest(self, folder: str) -> List[ScannedFile]:
+        return self.inner.get_scan_manifest(folder)
+
+    # Writes
+
+    def save(self, hunt: Hunt) -> int:
+        try:
+            return self.inner.save(hunt)
+        finally:
+            self.cache.invalidate()
+
+    def save_many(self, hunts: List[Hunt], chunk_size: int = 500) -> List[SaveResult]:
+        try:
+            return self.inner.save_many(hunts, chunk_size)
+        finally:
+            self.cache.invalidate()
+
+    def count_duplicate_hunts(self) -> int:
+        return self.inner.count_duplicate_hunts()
+
+    def remove_duplicate_hunts(self) -> DuplicateCleanup:
+        try:
+            return self.inner.remove_duplicate_hunts()
+        finally:
+            self.cache.invalidate()
+
+    def delete_many(self, item_ids: List[int]) -> None:
+        try:
+            self.inner.delete_many(item_ids)
+        finally:
+            self.cache.invalidate()
+
+    def update(self, hunt: Hunt) -> None:
+        try:
+            self.inner.update(hunt)
+        finally:
+            self.cache.invalidate()
+
+    def update_many(self, ids: List[int], updates: dict) -> None:
+        try:
+            self.inner.update_many(ids, updates)
+        finally:
+            self.cache.invalidate()
+
+    def backfill_loot(
+        self, extract_items: Callable[[str], List[Tuple[str, int]]], batch_size: int = 500,
+        max_batches: Optional[int] = None,
+    ) -> LootBackfill:
+        # Polled in small batches by the UI: a batch that filled nothing
+        # leaves the cache alone (its progress setting is only read inside)
+        filled = True  # unknown if the call fails
+        try:
+            result = self.inner.backfill_loot(extract_items, batch_size, max_batches)
+            filled = bool(result.filled)
+            return result
+        finally:
+            if filled:
+                self.cache.invalidate()
+
+    def set_default_character(self, name: str) -> None:
+        try:
+            self.inner.set_default_character(name)
+        finally:
+            self.cache.invalidate()
+
+    def add_character(self, name: str) -> None:
+        try:
+            self.inner.add_character(name)
+        finally:
+            self.cache.invalidate()
+
+    def delete_character(self, name: str) -> None:
+        try:
+            self.inner.delete_character(name)
+        finally:
+            self.cache.invalidate()
+
+    def add_location(self, name: str) -> None:
+        try:
+            self.inner.add_location(name)
+        finally:
+            self.cache.invalidate()
+
+    def delete_location(self, name: str) -> None:
+        try:
+            self.inner.delete_location(name)
+        finally:
+            self.cache.invalidate()
+
+    def save_scan_manifest(self, entries: List[ScannedFile]) -> None:
+        # The manifest is never cached, no need to invalidate
+        self.inner.save_scan_manifest(entries)
+
+    def delete_scan_manifest(self, paths: List[str]) -> None:
+        self.inner.delete_scan_manifest(paths)
+
+    def set_setting(self, key: str, value: str) -> None:
+        try:
+            self.inner.set_setting(key, value)
+        finally:
+            self.cache.invalidate()
+
+    def drain_changes(self) -> HuntChanges:
+        return self.inner.drain_changes()
+
+    def release_thread(self) -> None:
+        self.inner.release_thread()
+
+    def close(self) -> None:
+        self.inner.close()
@@ -0,0 +1,64 @@
+import sqlite3
+import threading
+from typing import Dict, List
+
+
+class ConnectionManager:
+    """Keeps one long-lived SQLite connection per thread.
+
+    Pragmas are applied once when a thread's connection is opened, and the
+    statement cache survives between repository calls. Connections are keyed
+    by the Thread object, not its ident, which the OS may hand to a new
+    thread; a short-lived thread calls release() when done, and connections
+    left behind by threads that have exited are closed on the next open.
+    """
+
+    def __init__(self, db_path: str, cached_statements: int = 256):
+        self.db_path = db_path
+        self.cached_statements = cached_statements
+        self._lock = threading.Lock()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+
+    def _open(self) -> sqlite3.Connection:
+        # check_same_thread=False only so close_all can run from the UI thread;
+        # each connection is otherwise used by the thread that opened it.
+        conn = sqlite3.connect(self.db_path, cached_statements=self.cached_statements, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Enable name-based access
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")  # safe with WAL, one fsync per checkpoint
+        conn.execute("PRAGMA foreign_keys = ON;")
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        thread = threading.current_thread()
+        conn = self._connections.get(thread)
+        if conn is None:
+            conn = self._open()
+            with self._lock:
+                self._connections[thread] = conn
+                dead = [t for t in self._connections if not t.is_alive()]
+                stale = [self._connections.pop(t) for t in dead]
+            self._close(stale)
+        return conn
+
+    def release(self) -> None:
+        """Closes the calling thread's connection, if it has one."""
+        with self._lock:
+            conn = self._connections.pop(threading.current_thread(), None)
+        if conn is not None:
+            self._close([conn])
+
+    def close_all(self) -> None:
+        with self._lock:
+            conns = list(self._connections.values())
+            self._connections.clear()
+        self._close(conns)
+
+    @staticmethod
+    def _close(conns: List[sqlite3.Connection]) -> None:
+        for conn in conns:
+            try:
+                conn.rollback()  # whatever a dead thread left open is abandoned
+                conn.close()
+            except sqlite3.Error:
+                pass
@@ -0,0 +1,521 @@
+import sqlite3
+from typing import Callable, List, Optional
+
+from src.infrastructure.database.raw_text_codec import decode_raw_text, encode_raw_text, raw_text_hash
+
+
+def _v1_baseline(conn: sqlite3.Connection) -> None:
+    """Tables as created by every release before versioned migrations.
+
+    Everything is IF NOT EXISTS: databases at user_version 0 may already have
+    any subset of them (including ones created by the legacy script).
+    """
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Characters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT UNIQUE NOT NULL,
+        is_default INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Locations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT UNIQUE NOT NULL
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Hunts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        personagem TEXT NOT NULL,
+        local TEXT NOT NULL,
+        data TEXT,
+        hora_inicio TEXT,
+        hora_fim TEXT,
+        duracao_min INTEGER,
+        raw_xp_gain INTEGER,
+        xp_gain INTEGER,
+        loot INTEGER,
+        supplies INTEGER,
+        pagamento INTEGER,
+        balance INTEGER,
+        damage INTEGER,
+        healing INTEGER,
+        raw_text TEXT
+    )
+    """)
+    # Very old databases predate the raw_text column
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(Hunts)")}
+    if "raw_text" not in cols:
+        conn.execute("ALTER TABLE Hunts ADD COLUMN raw_text TEXT")
+    # Session identity lookups (duplicate checks, folder scan)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_hunts_session ON Hunts (data, hora_inicio)")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Hunts_Monstros (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        hunt_id INTEGER NOT NULL,
+        personagem TEXT NOT NULL,
+        criatura TEXT NOT NULL,
+        quantidade INTEGER NOT NULL,
+        FOREIGN KEY(hunt_id) REFERENCES Hunts(id) ON DELETE CASCADE
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Hunts_Loot (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        hunt_id INTEGER NOT NULL,
+        item TEXT NOT NULL,
+        quantidade INTEGER NOT NULL,
+        FOREIGN KEY(hunt_id) REFERENCES Hunts(id) ON DELETE CASCADE
+    )
+    """)
+    # Per-hunt lookups/cascades and per-item drop queries
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_hunts_loot_hunt ON Hunts_Loot (hunt_id, item, quantidade)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_hunts_loot_item ON Hunts_Loot (item)")
+    # Folder scan manifest: lets unchanged log files be skipped without opening them.
+    # (The legacy ImportedFiles table keeps UNIQUE(hunt_id) and no stat data.)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS ScanManifest (
+        path TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        hunt_id INTEGER,
+        session_key TEXT NOT NULL DEFAULT '',
+        FOREIGN KEY(hunt_id) REFERENCES Hunts(id) ON DELETE SET NULL
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Settings (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """)
+
+
+def _v2_query_indexes(conn: sqlite3.Connection) -> None:
+    """Indexes shaped like the WHERE/ORDER BY clauses the UI actually runs."""
+    # Hunt list ordering (get_all): the expressions must match the ORDER BY
+    # exactly; walking the index backwards gives the DESC order, with the
+    # implicit rowid as the final "id DESC" tie-breaker. No sort step.
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_hunts_order
+    ON Hunts (COALESCE(data,'9999-99-99'), COALESCE(hora_inicio,'00:00:00'))
+    """)
+    # Same, filtered by character
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_hunts_personagem_order
+    ON Hunts (personagem, COALESCE(data,'9999-99-99'), COALESCE(hora_inicio,'00:00:00'))
+    """)
+    # Character + period filters of the analytics and aggregate queries
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_hunts_personagem_data ON Hunts (personagem, data)")
+    # Kill totals/aggregates join on hunt_id, and ON DELETE CASCADE looks it up;
+    # criatura and quantidade make the index covering for those queries.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_hunts_monstros_hunt ON Hunts_Monstros (hunt_id, criatura, quantidade)"
+    )
+
+
+def _v3_hunts_raw(conn: sqlite3.Connection) -> bool:
+    """Moves raw_text out of Hunts into compressed side storage.
+
+    Hunts.raw_text stays until v5 (always NULL for new rows); rows the legacy
+    script writes there in between are read as a fallback and moved by v5.
+    Returns True: the freed pages only go back to the OS with a VACUUM.
+    """
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS HuntsRaw (
+        hunt_id INTEGER PRIMARY KEY,
+        codec INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        FOREIGN KEY(hunt_id) REFERENCES Hunts(id) ON DELETE CASCADE
+    )
+    """)
+    _move_inline_raw_text(conn)
+    return True
+
+
+def _move_inline_raw_text(conn: sqlite3.Connection) -> None:
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, raw_text FROM Hunts WHERE id > ? AND raw_text IS NOT NULL ORDER BY id LIMIT 500",
+            (last_id,),
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        blobs = []
+        for hunt_id, raw_text in rows:
+            encoded = encode_raw_text(raw_text)
+            if encoded:
+                blobs.append((hunt_id,) + encoded)
+        conn.executemany("INSERT OR REPLACE INTO HuntsRaw (hunt_id, codec, data) VALUES (?, ?, ?)", blobs)
+        conn.executemany("UPDATE Hunts SET raw_text = NULL WHERE id = ?", [(r[0],) for r in rows])
+
+
+# DailyRollup column -> Hunts column
+_ROLLUP_METRICS = (
+    ("minutes", "duracao_min"), ("xp", "xp_gain"), ("raw_xp", "raw_xp_gain"),
+    ("loot", "loot"), ("supplies", "supplies"), ("pagamento", "pagamento"),
+    ("balance", "balance"), ("damage", "damage"), ("healing", "healing"),
+)
+
+
+def _rollup_add(row: str, hunts: str, kills: str, key: str = "personagem") -> str:
+    """Upsert adding a Hunts row's values (row is NEW/OLD) to its day.
+
+    key is the character column, named the same in Hunts and DailyRollup.
+    """
+    cols = ", ".join(c for c, _ in _ROLLUP_METRICS)
+    vals = ", ".join(f"COALESCE({row}.{h}, 0)" for _, h in _ROLLUP_METRICS)
+    sets = ", ".join(f"{c} = {c} + excluded.{c}" for c, _ in _ROLLUP_METRICS)
+    return f"""
+        INSERT INTO DailyRollup ({key}, data, hunts, {cols}, kills)
+        VALUES ({row}.{key}, COALESCE({row}.data, ''), {hunts}, {vals}, {kills})
+        ON CONFLICT({key}, data) DO UPDATE SET
+            hunts = hunts + excluded.hunts, {sets}, kills = kills + excluded.kills;
+    """
+
+
+def _rollup_sub(row: str, kills: str, key: str = "personagem") -> str:
+    """Removes a Hunts row's values (row is NEW/OLD) from its day, dropping emptied days."""
+    sets = ", ".join(f"{c} = {c} - COALESCE({row}.{h}, 0)" for c, h in _ROLLUP_METRICS)
+    match = f"{key} = {row}.{key} AND data = COALESCE({row}.data, '')"
+    return f"""
+        UPDATE DailyRollup SET hunts = hunts - 1, {sets}, kills = kills - {kills} WHERE {match};
+        DELETE FROM DailyRollup WHERE {match} AND hunts <= 0;
+    """
+
+
+def _rollup_kills(hunt_id: str, delta: str, key: str = "personagem") -> str:
+    """Adds delta kills to the day of hunt hunt_id (no-op once the hunt is gone)."""
+    return f"""
+        UPDATE DailyRollup SET kills = kills + {delta}
+        WHERE ({key}, data) = (SELECT {key}, COALESCE(data, '') FROM Hunts WHERE id = {hunt_id});
+    """
+
+
+def _v4_daily_rollup(conn: sqlite3.Connection) -> None:
+    """Per character and day totals of Hunts/Hunts_Monstros, kept exact by triggers.
+
+    A missing date is stored as ''. Deleting a hunt removes its kills in the
+    BEFORE DELETE trigger: the cascaded Hunts_Monstros deletes run after the
+    hunt row is gone, so their own trigger finds no day to update.
+    """
+    _create_daily_rollup(conn, "personagem", "TEXT")
+
+
+def _create_daily_rollup(conn: sqlite3.Connection, key: str, key_type: str) -> None:
+    """DailyRollup keyed by (key, data), its triggers, and its initial contents."""
+    metrics = ", ".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c, _ in _ROLLUP_METRICS)
+    conn.execute(f"""
+    CREATE TABLE IF NOT EXISTS DailyRollup (
+        {key} {key_type} NOT NULL,
+        data TEXT NOT NULL,
+        hunts INTEGER NOT NULL DEFAULT 0,
+        {metrics},
+        kills INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY ({key}, data)
+    ) WITHOUT ROWID
+    """)
+    # Period filters across all characters
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_daily_rollup_data ON DailyRollup (data)")
+
+    hunt_kills = "(SELECT COALESCE(SUM(quantidade), 0) FROM Hunts_Monstros WHERE hunt_id = {}.id)"
+    hunt_columns = ", ".join([key, "data"] + [h for _, h in _ROLLUP_METRICS])
+    old_kills, new_kills = hunt_kills.format("OLD"), hunt_kills.format("NEW")
+    triggers = {
+        # Monsters are inserted after their hunt, so a new hunt starts with 0 kills
+        "trg_rollup_hunt_insert": f"AFTER INSERT ON Hunts BEGIN {_rollup_add('NEW', '1', '0', key)} END",
+        "trg_rollup_hunt_delete": f"BEFORE DELETE ON Hunts BEGIN {_rollup_sub('OLD', old_kills, key)} END",
+        "trg_rollup_hunt_update": (
+            f"AFTER UPDATE OF {hunt_columns} ON Hunts BEGIN "
+            f"{_rollup_sub('OLD', old_kills, key)} {_rollup_add('NEW', '1', new_kills, key)} END"
+        ),
+        "trg_rollup_monster_insert": (
+            f"AFTER INSERT ON Hunts_Monstros BEGIN {_rollup_kills('NEW.hunt_id', 'NEW.quantidade', key)} END"
+        ),
+        "trg_rollup_monster_delete": (
+            f"AFTER DELETE ON Hunts_Monstros BEGIN {_rollup_kills('OLD.hunt_id', '-OLD.quantidade', key)} END"
+        ),
+        "trg_rollup_monster_update": (
+            f"AFTER UPDATE OF hunt_id, quantidade ON Hunts_Monstros BEGIN "
+            f"{_rollup_kills('OLD.hunt_id', '-OLD.quantidade', key)} "
+            f"{_rollup_kills('NEW.hunt_id', 'NEW.quantidade', key)} END"
+        ),
+    }
+    for name, body in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+    sums = ", ".join(f"SUM(COALESCE(h.{h_col}, 0))" for _, h_col in _ROLLUP_METRICS)
+    conn.execute("DELETE FROM DailyRollup")
+    conn.execute(f"""
+        INSERT INTO DailyRollup ({key}, data, hunts, {", ".join(c for c, _ in _ROLLUP_METRICS)}, kills)
+        SELECT h.{key}, COALESCE(h.data, ''), COUNT(*), {sums}, COALESCE(SUM(k.kills), 0)
+        FROM Hunts h
+        LEFT JOIN (SELECT hunt_id, SUM(quantidade) AS kills FROM Hunts_Monstros GROUP BY hunt_id) k
+               ON k.hunt_id = h.id
+        GROUP BY h.{key}, COALESCE(h.data, '')
+    """)
+
+
+def _v5_integer_keys(conn: sqlite3.Connection) -> bool:
+    """Hunts and Hunts_Monstros reference Characters, Locations and Creatures by id.
+
+    Both tables are rebuilt (migrate() runs with foreign keys off). Names no
+    longer in Characters/Locations come back as inactive entries, monster rows
+    of missing hunts are dropped and the AUTOINCREMENT counters carry over.
+    Inline raw_text left by the legacy script moves to HuntsRaw and the column
+    goes away; Hunt-Analizer.py refuses to open a database from this version on.
+    DailyRollup is rekeyed by character_id. Returns True for a VACUUM.
+    """
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Creatures (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT UNIQUE NOT NULL
+    )
+    """)
+    # Deleting a character/location still referenced by hunts only hides it
+    for table in ("Characters", "Locations"):
+        cols = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if "ativo" not in cols:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN ativo INTEGER NOT NULL DEFAULT 1")
+    conn.execute("INSERT OR IGNORE INTO Characters (nome, ativo) SELECT DISTINCT personagem, 0 FROM Hunts")
+    conn.execute("INSERT OR IGNORE INTO Locations (nome, ativo) SELECT DISTINCT local, 0 FROM Hunts")
+    conn.execute("INSERT OR IGNORE INTO Creatures (nome) SELECT DISTINCT criatura FROM Hunts_Monstros")
+    _move_inline_raw_text(conn)
+
+    seqs = conn.execute(
+        "SELECT name, seq FROM sqlite_sequence WHERE name IN ('Hunts', 'Hunts_Monstros')"
+    ).fetchall()
+    conn.execute("DROP TABLE IF EXISTS DailyRollup")
+
+    conn.execute("""
+    CREATE TABLE Hunts_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        character_id INTEGER NOT NULL,
+        location_id INTEGER NOT NULL,
+        data TEXT,
+        hora_inicio TEXT,
+        hora_fim TEXT,
+        duracao_min INTEGER,
+        raw_xp_gain INTEGER,
+        xp_gain INTEGER,
+        loot INTEGER,
+        supplies INTEGER,
+        pagamento INTEGER,
+        balance INTEGER,
+        damage INTEGER,
+        healing INTEGER,
+        FOREIGN KEY(character_id) REFERENCES Characters(id),
+        FOREIGN KEY(location_id) REFERENCES Locations(id)
+    )
+    """)
+    conn.execute("""
+        INSERT INTO Hunts_new
+        SELECT h.id, c.id, l.id, h.data, h.hora_inicio, h.hora_fim, h.duracao_min, h.raw_xp_gain,
+               h.xp_gain, h.loot, h.supplies, h.pagamento, h.balance, h.damage, h.healing
+        FROM Hunts h
+        JOIN Characters c ON c.nome = h.personagem
+        JOIN Locations l ON l.nome = h.local
+    """)
+    conn.execute("""
+    CREATE TABLE Hunts_Monstros_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        hunt_id INTEGER NOT NULL,
+        creature_id INTEGER NOT NULL,
+        quantidade INTEGER NOT NULL,
+        FOREIGN KEY(hunt_id) REFERENCES Hunts(id) ON DELETE CASCADE,
+        FOREIGN KEY(creature_id) REFERENCES Creatures(id)
+    )
+    """)
+    conn.execute("""
+        INSERT INTO Hunts_Monstros_new
+        SELECT m.id, m.hunt_id, cr.id, m.quantidade
+        FROM Hunts_Monstros m
+        JOIN Creatures cr ON cr.nome = m.criatura
+        WHERE m.hunt_id IN (SELECT id FROM Hunts)
+    """)
+    # Dropping the old tables also drops their indexes and triggers
+    conn.execute("DROP TABLE Hunts_Monstros")
+    conn.execute("DROP TABLE Hunts")
+    conn.execute("ALTER TABLE Hunts_new RENAME TO Hunts")
+    conn.execute("ALTER TABLE Hunts_Monstros_new RENAME TO Hunts_Monstros")
+    for name, seq in seqs:
+        conn.execute("DELETE FROM sqlite_sequence WHERE name IN (?, ?)", (name, name + "_new"))
+        conn.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT ?, MAX(?, COALESCE(MAX(id), 0)) FROM {name}",
+            (name, seq),
+        )
+
+    # Same index shapes as before, on the integer keys
+    conn.execute("CREATE INDEX idx_hunts_session ON Hunts (data, hora_inicio)")
+    conn.execute("""
+    CREATE INDEX idx_hunts_order
+    ON Hunts (COALESCE(data,'9999-99-99'), COALESCE(hora_inicio,'00:00:00'))
+    """)
+    conn.execute("""
+    CREATE INDEX idx_hunts_character_order
+    ON Hunts (character_id, COALESCE(data,'9999-99-99'), COALESCE(hora_inicio,'00:00:00'))
+    """)
+    conn.execute("CREATE INDEX idx_hunts_character_data ON Hunts (character_id, data)")
+    # Location filters, and the foreign key check when a location is deleted
+    conn.execute("CREATE INDEX idx_hunts_location ON Hunts (location_id)")
+    conn.execute("CREATE INDEX idx_hunts_monstros_hunt ON Hunts_Monstros (hunt_id, creature_id, quantidade)")
+
+    _create_daily_rollup(conn, "character_id", "INTEGER")
+    return True
+
+
+def _v6_content_hash(conn: sqlite3.Connection) -> None:
+    """Hunts.content_hash (raw_text_hash of the log), indexed.
+
+    Hashes are computed for the existing rows from HuntsRaw; rows without a
+    log keep NULL. The index is UNIQUE, unless sessions are already stored
+    more than once: those are left alone, deleting them is up to the user
+    (collapse_duplicate_hunts, behind a backup, offered at startup), and the
+    index becomes UNIQUE then. Saves look the hash up under the write lock,
+    so no further duplicate is added meanwhile.
+    """
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(Hunts)")}
+    if "content_hash" not in cols:
+        conn.execute("ALTER TABLE Hunts ADD COLUMN content_hash TEXT")
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT hunt_id, codec, data FROM HuntsRaw WHERE hunt_id > ? ORDER BY hunt_id LIMIT 500", (last_id,)
+        ).fetchall()
+        if not rows:
+            break
+        conn.executemany(
+            "UPDATE Hunts SET content_hash = ? WHERE id = ?",
+            [(raw_text_hash(decode_raw_text(codec, data)), hunt_id) for hunt_id, codec, data in rows],
+        )
+        last_id = rows[-1][0]
+    unique = "" if count_duplicate_hunts(conn) else "UNIQUE "
+    conn.execute(f"CREATE {unique}INDEX IF NOT EXISTS idx_hunts_content_hash ON Hunts (content_hash)")
+
+
+def _v7_sort_indexes(conn: sqlite3.Connection) -> None:
+    """Indexes for sorting the hunt list by a numeric column (SORT_COLUMNS).
+
+    The expressions match the repository's ORDER BY exactly and the rowid
+    is the id tie-breaker, so the best (or worst) sessions are read by
+    walking the index from one end, and a page by seeking it, with or
+    without a character filter.
+    """
+    for name, column in (
+        ("duration", "duracao_min"), ("xp", "xp_gain"), ("loot", "loot"),
+        ("supplies", "supplies"), ("balance", "balance"),
+    ):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_hunts_{name} ON Hunts (COALESCE({column},0))")
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_hunts_character_{name} ON Hunts (character_id, COALESCE({column},0))"
+        )
+
+
+def collapse_duplicate_hunts(conn: sqlite3.Connection) -> List[int]:
+    """Deletes all but the first stored hunt of each content_hash; returns their ids.
+
+    Duplicates are found with one grouped query over the hash, not by
+    comparing hunts pairwise. Their child rows are deleted explicitly, so
+    this does not depend on foreign keys being on, and folder scan entries
+    are moved to the hunt that is kept. The DailyRollup triggers keep the
+    totals exact. With no duplicate left idx_hunts_content_hash becomes
+    UNIQUE. Runs in the caller's transaction.
+    """
+    conn.execute("DROP TABLE IF EXISTS temp.duplicate_hunts")
+    conn.execute("""
+        CREATE TEMP TABLE duplicate_hunts AS
+        SELECT h.id AS id, k.keep_id AS keep_id
+        FROM Hunts h
+        JOIN (SELECT content_hash, MIN(id) AS keep_id FROM Hunts
+              WHERE content_hash IS NOT NULL
+              GROUP BY content_hash HAVING COUNT(*) > 1) k
+          ON k.content_hash = h.content_hash
+        WHERE h.id <> k.keep_id
+    """)
+    removed = [row[0] for row in conn.execute("SELECT id FROM temp.duplicate_hunts ORDER BY id")]
+    if removed:
+        conn.execute("""
+            UPDATE ScanManifest
+            SET hunt_id = (SELECT keep_id FROM temp.duplicate_hunts d WHERE d.id = ScanManifest.hunt_id)
+            WHERE hunt_id IN (SELECT id FROM temp.duplicate_hunts)
+        """)
+        # The hunt first: its rollup trigger still sees the kills it subtracts
+        conn.execute("DELETE FROM Hunts WHERE id IN (SELECT id FROM temp.duplicate_hunts)")
+        for table in ("Hunts_Monstros", "Hunts_Loot", "HuntsRaw"):
+            conn.execute(f"DELETE FROM {table} WHERE hunt_id IN (SELECT id FROM temp.duplicate_hunts)")
+    conn.execute("DROP TABLE temp.duplicate_hunts")
+    conn.execute("DROP INDEX IF EXISTS idx_hunts_content_hash")
+    conn.execute("CREATE UNIQUE INDEX idx_hunts_content_hash ON Hunts (content_hash)")
+    return removed
+
+
+def count_duplicate_hunts(conn: sqlite3.Connection) -> int:
+    """Hunts collapse_duplicate_hunts would delete."""
+    return conn.execute("""
+        SELECT COALESCE(SUM(n - 1), 0) FROM (
+            SELECT COUNT(*) AS n FROM Hunts WHERE content_hash IS NOT NULL
+            GROUP BY content_hash HAVING COUNT(*) > 1
+        )
+    """).fetchone()[0]
+
+
+# Position in the list is the schema version (first entry -> user_version 1).
+# Append only: never edit or reorder a migration that has shipped.
+# A migration returning True asks for a VACUUM once all of them have run.
+MIGRATIONS: List[Callable[[sqlite3.Connection], Optional[bool]]] = [
+    _v1_baseline,
+    _v2_query_indexes,
+    _v3_hunts_raw,
+    _v4_daily_rollup,
+    _v5_integer_keys,
+    _v6_content_hash,
+    _v7_sort_indexes,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Applies the pending migrations, each in its own transaction.
+
+    Returns how many were applied; 0 (after a single PRAGMA read) when the
+    database is already up to date. The planner statistics are refreshed with
+    ANALYZE whenever something changed.
+    """
+    current = schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        return 0
+
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None  # explicit BEGIN/COMMIT so the DDL is atomic too
+    # Table rebuilds drop and rename referenced tables; the pragma has no
+    # effect inside a transaction, so it is switched here.
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys = OFF")
+    vacuum = False
+    try:
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                vacuum = bool(MIGRATIONS[version - 1](conn)) or vacuum
+                # user_version is part of the database header, so it commits
+                # (or rolls back) together with the migration.
+                conn.execute(f"PRAGMA user_version = {version}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        conn.execute("ANALYZE")
+        if vacuum:
+            conn.execute("VACUUM")  # must run outside any transaction
+    finally:
+        conn.execute(f"PRAGMA foreign_keys = {'ON' if foreign_keys else 'OFF'}")
+        conn.isolation_level = previous_isolation
+    return SCHEMA_VERSION - current
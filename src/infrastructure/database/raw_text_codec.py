@@ -0,0 +1,64 @@
+import hashlib
+import zlib
+from typing import Optional, Tuple
+
+# Codec ids stored next to each blob in HuntsRaw. Never renumber or change a
+# dictionary that has shipped: add a new id instead, old rows stay readable.
+CODEC_PLAIN = 0        # utf-8, uncompressed
+CODEC_ZLIB_DICT_1 = 1  # zlib, preset dictionary _DICT_1
+
+# Preset dictionary for CODEC_ZLIB_DICT_1: the fixed parts of a
+# Hunting_Session_ log, so even a short session compresses well. zlib favours
+# the end of the dictionary, hence the header template last.
+_DICT_1 = (
+    "  1x a gold coin\n  1x a platinum coin\n  1x a crystal coin\n  1x a gold ingot\n"
+    "  1x a small emerald\n  1x a small ruby\n  1x a small sapphire\n  1x a small amethyst\n"
+    "  1x a small diamond\n  1x a small topaz\n"
+    "  1x a great health potion\n  1x a great spirit potion\n  1x a great mana potion\n"
+    "  1x an ultimate health potion\n  1x a supreme health potion\n  1x an ultimate mana potion\n"
+    "  1x a strong mana potion\n  1x a strong health potion\n"
+    "  1x a ring of healing\n  1x a life ring\n  1x boots of haste\n  1x a piece of cloth\n"
+    "  1x a crystal shard\n  1x a crystal splinter\n  1x a crystal fragment\n"
+    "Session data: From 2025-01-01, 00:00:00 to 2025-01-01, 00:00:00\n"
+    "Session: 00:00h\n"
+    "Raw XP Gain: 1,000,000\nXP Gain: 1,000,000\nRaw XP/h: 1,000,000\nXP/h: 1,000,000\n"
+    "Loot: 1,000,000\nSupplies: 1,000,000\nBalance: 1,000,000\n"
+    "Damage: 1,000,000\nDamage/h: 1,000,000\nHealing: 1,000,000\nHealing/h: 1,000,000\n"
+    "Killed Monsters:\n  1x \nLooted Items:\n  1x a "
+).encode("utf-8")
+
+_DICTIONARIES = {CODEC_ZLIB_DICT_1: _DICT_1}
+
+
+def encode_raw_text(text: Optional[str]) -> Optional[Tuple[int, bytes]]:
+    """Returns (codec, blob) for HuntsRaw, or None when there is no text to store."""
+    if not text:
+        return None
+    comp = zlib.compressobj(9, zdict=_DICT_1)
+    return CODEC_ZLIB_DICT_1, comp.compress(text.encode("utf-8")) + comp.flush()
+
+
+def decode_raw_text(codec: int, blob: bytes) -> str:
+    if codec == CODEC_PLAIN:
+        return bytes(blob).decode("utf-8")
+    zdict = _DICTIONARIES.get(codec)
+    if zdict is None:
+        raise ValueError(f"Unknown raw text codec: {codec}")
+    decomp = zlib.decompressobj(zdict=zdict)
+    return (decomp.decompress(blob) + decomp.flush()).decode("utf-8")
+
+
+def raw_text_hash(text: Optional[str]) -> Optional[str]:
+    """Hunts.content_hash: hash of the log text with whitespace normalized.
+
+    Line endings, indentation and blank lines are ignored, so a session read
+    from its file and the same session pasted in the Inserir tab hash alike.
+    None when there is no text.
+    """
+    if not text:
+        return None
+    lines = (line.strip() for line in text.splitlines())
+    normalized = "\n".join(line for line in lines if line)
+    if not normalized:
+        return None
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
@@ -1,121 +1,283 @@
+import itertools
+import os
 import sqlite3
-from typing import List, Optional, Dict, Tuple
-from contextlib import closing
-from src.domain.entities import Hunt, Monster
-from src.application.interfaces.repository import HuntRepository
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from contextlib import closing, contextmanager
+from src.domain.entities import Hunt, LootItem, Monster, ScannedFile
+from src.application.interfaces.repository import (
+    DEFAULT_ORDER, DuplicateCleanup, HuntChanges, HuntOrder, HuntPage, HuntRepository, LootBackfill, PageKey,
+    SaveResult,
+)
+from src.infrastructure.database.connection import ConnectionManager
+from src.infrastructure.database.migrations import collapse_duplicate_hunts, count_duplicate_hunts, migrate
+from src.infrastructure.database.raw_text_codec import decode_raw_text, encode_raw_text, raw_text_hash
 
 class SQLiteHuntRepository(HuntRepository):
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self._connections = ConnectionManager(db_path)
+        # Committed changes not yet taken by drain_changes()
+        self._changes = HuntChanges()
+        self._changes_lock = threading.Lock()
         self._init_db()
 
     def _get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable name-based access
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA foreign_keys = ON;")
-        return conn
+        return self._connections.get()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """The calling thread's long-lived connection (never closed here)."""
+        conn = self._get_connection()
+        try:
+            yield conn
+        except BaseException:
+            # Don't leave a half-done implicit transaction on a shared connection
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+    @staticmethod
+    @contextmanager
+    def _immediate(conn: sqlite3.Connection) -> Iterator[None]:
+        """Explicit BEGIN IMMEDIATE transaction: the write lock is held from its
+        first read, so what a write checks first cannot change under it."""
+        isolation_level = conn.isolation_level
+        conn.isolation_level = None  # no implicit BEGIN/COMMIT inside
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.isolation_level = isolation_level
+
+    def release_thread(self) -> None:
+        self._connections.release()
+
+    def close(self) -> None:
+        self._connections.close_all()
+
+    def drain_changes(self) -> HuntChanges:
+        with self._changes_lock:
+            changes, self._changes = self._changes, HuntChanges()
+        return changes
+
+    def _record(self, changes: HuntChanges) -> None:
+        # Called once the write is committed
+        with self._changes_lock:
+            self._changes.merge(changes)
+
+    @staticmethod
+    def _add_values(changes: HuntChanges, character: Optional[str], location: Optional[str], date: Optional[str]) -> None:
+        if character:
+            changes.characters.add(character)
+        if location:
+            changes.locations.add(location)
+        if date:
+            changes.dates.add(date)
+
+    @classmethod
+    def _inserted(cls, hunts: List[Hunt], results: List[SaveResult]) -> HuntChanges:
+        changes = HuntChanges(lists=True)  # a hunt may bring a new character or location
+        for hunt, res in zip(hunts, results):
+            if res.hunt_id is not None and not res.existing:
+                changes.inserted.add(res.hunt_id)
+                cls._add_values(changes, hunt.character, hunt.location, hunt.date)
+        return changes
+
+    @classmethod
+    def _add_stored_values(cls, conn: sqlite3.Connection, ids: List[int], changes: HuntChanges) -> None:
+        """Adds the current character, location and date of hunts ids to changes."""
+        for start in range(0, len(ids), 500):
+            part = ids[start:start + 500]
+            cursor = conn.execute(f"""
+                SELECT DISTINCT (SELECT nome FROM Characters WHERE id = character_id),
+                       (SELECT nome FROM Locations WHERE id = location_id), data
+                FROM Hunts WHERE id IN ({','.join('?' * len(part))})
+            """, part)
+            for character, location, date in cursor:
+                cls._add_values(changes, character, location, date)
 
     def _init_db(self):
-        with closing(self._get_connection()) as conn:
-            conn.execute("""
-            CREATE TABLE IF NOT EXISTS Characters (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT UNIQUE NOT NULL,
-                is_default INTEGER NOT NULL DEFAULT 0
-            )
-            """)
-            conn.execute("""
-            CREATE TABLE IF NOT EXISTS Locations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT UNIQUE NOT NULL
-            )
-            """)
-            conn.execute("""
-            CREATE TABLE IF NOT EXISTS Hunts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                personagem TEXT NOT NULL,
-                local TEXT NOT NULL,
-                data TEXT,
-                hora_inicio TEXT,
-                hora_fim TEXT,
-                duracao_min INTEGER,
-                raw_xp_gain INTEGER,
-                xp_gain INTEGER,
-                loot INTEGER,
-                supplies INTEGER,
-                pagamento INTEGER,
-                balance INTEGER,
-                damage INTEGER,
-                healing INTEGER,
-                raw_text TEXT
-            )
-            """)
-            conn.execute("""
-            CREATE TABLE IF NOT EXISTS Hunts_Monstros (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                hunt_id INTEGER NOT NULL,
-                personagem TEXT NOT NULL,
-                criatura TEXT NOT NULL,
-                quantidade INTEGER NOT NULL,
-                FOREIGN KEY(hunt_id) REFERENCES Hunts(id) ON DELETE CASCADE
-            )
-            """)
-            conn.execute("""
-            CREATE TABLE IF NOT EXISTS Settings (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-            """)
+        with self._connection() as conn:
+            # Creates/upgrades the schema; a single PRAGMA read when up to date
+            migrate(conn)
 
-            cursor = conn.execute("SELECT COUNT(*) FROM Characters")
+            cursor = conn.execute("SELECT COUNT(*) FROM Characters WHERE ativo = 1")
             if cursor.fetchone()[0] == 0:
                 conn.execute(
-                    "INSERT INTO Characters (nome, is_default) VALUES (?, 1)",
+                    "INSERT INTO Characters (nome, is_default) VALUES (?, 1) "
+                    "ON CONFLICT(nome) DO UPDATE SET ativo = 1, is_default = 1",
                     ("Nerdola Farmador",),
                 )
             else:
-                cursor = conn.execute("SELECT COUNT(*) FROM Characters WHERE is_default = 1")
+                cursor = conn.execute("SELECT COUNT(*) FROM Characters WHERE is_default = 1 AND ativo = 1")
                 if cursor.fetchone()[0] == 0:
                     conn.execute(
-                        "UPDATE Characters SET is_default = 1 WHERE id = (SELECT id FROM Characters LIMIT 1)"
+                        "UPDATE Characters SET is_default = 1 WHERE id = (SELECT id FROM Characters WHERE ativo = 1 LIMIT 1)"
                     )
             conn.commit()
 
-    def save(self, hunt: Hunt) -> int:
-        with closing(self._get_connection()) as conn:
-            with conn: # Transaction context
-                # Ensure Character and Location exist
-                conn.execute("INSERT OR IGNORE INTO Characters (nome) VALUES (?)", (hunt.character,))
-                conn.execute("INSERT OR IGNORE INTO Locations (nome) VALUES (?)", (hunt.location,))
-                
-                cur = conn.execute(
-                    """
-                    INSERT INTO Hunts (
-                        personagem, local, data, hora_inicio, hora_fim, duracao_min,
-                        raw_xp_gain, xp_gain, loot, supplies, pagamento, balance, damage, healing, raw_text
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        hunt.character, hunt.location, hunt.date, hunt.start_time, hunt.end_time,
-                        hunt.duration_min, hunt.raw_xp_gain, hunt.xp_gain, hunt.loot, hunt.supplies,
-                        hunt.payment, hunt.balance, hunt.damage, hunt.healing, hunt.raw_text
-                    ),
-                )
-                hunt_id = cur.lastrowid
-                
-                if hunt.monsters:
-                    data_monsters = [
-                        (hunt_id, hunt.character, m.name, m.amount)
-                        for m in hunt.monsters
-                    ]
-                    conn.executemany(
-                        "INSERT INTO Hunts_Monstros (hunt_id, personagem, criatura, quantidade) VALUES (?, ?, ?, ?)",
-                        data_monsters
-                    )
-                return hunt_id
+    # Names are stored once in Characters/Locations/Creatures; rows reference their ids
+    _CHARACTER_ID = "(SELECT id FROM Characters WHERE nome = ?)"
+    _LOCATION_ID = "(SELECT id FROM Locations WHERE nome = ?)"
+    # Saving a hunt for a deleted (hidden) character or location shows it again
+    _UPSERT_CHARACTER = "INSERT INTO Characters (nome) VALUES (?) ON CONFLICT(nome) DO UPDATE SET ativo = 1"
+    _UPSERT_LOCATION = "INSERT INTO Locations (nome) VALUES (?) ON CONFLICT(nome) DO UPDATE SET ativo = 1"
+    _INSERT_CREATURE = "INSERT OR IGNORE INTO Creatures (nome) VALUES (?)"
+
+    # The same log is stored once: content_hash (raw_text_hash) is looked up
+    # before inserting, and is UNIQUE once old duplicates have been removed
+    _INSERT_HUNT = f"""
+        INSERT INTO Hunts (
+            id, character_id, location_id, data, hora_inicio, hora_fim, duracao_min,
+            raw_xp_gain, xp_gain, loot, supplies, pagamento, balance, damage, healing, content_hash
+        ) VALUES (?, {_CHARACTER_ID}, {_LOCATION_ID}, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _INSERT_MONSTER = """
+        INSERT INTO Hunts_Monstros (hunt_id, creature_id, quantidade)
+        VALUES (?, (SELECT id FROM Creatures WHERE nome = ?), ?)
+    """
+    _INSERT_LOOT = "INSERT INTO Hunts_Loot (hunt_id, item, quantidade) VALUES (?, ?, ?)"
+    # raw_text lives compressed in HuntsRaw, away from the rows every listing scans
+    _INSERT_RAW = "INSERT INTO HuntsRaw (hunt_id, codec, data) VALUES (?, ?, ?)"
+
+    @staticmethod
+    def _hunt_row(hunt_id: Optional[int], hunt: Hunt, content_hash: Optional[str]) -> tuple:
+        return (
+            hunt_id, hunt.character, hunt.location, hunt.date, hunt.start_time, hunt.end_time,
+            hunt.duration_min, hunt.raw_xp_gain, hunt.xp_gain, hunt.loot, hunt.supplies,
+            hunt.payment, hunt.balance, hunt.damage, hunt.healing, content_hash
+        )
 
-    def _row_to_hunt(self, row, monsters: List[Monster] = None) -> Hunt:
+    @staticmethod
+    def _stored_hashes(conn: sqlite3.Connection, hashes: List[str]) -> Dict[str, int]:
+        """content_hash -> id of the (first) hunt already storing one of these logs."""
+        stored: Dict[str, int] = {}
+        for start in range(0, len(hashes), 500):
+            part = hashes[start:start + 500]
+            cursor = conn.execute(
+                f"SELECT content_hash, MIN(id) FROM Hunts WHERE content_hash IN ({','.join('?' * len(part))}) "
+                "GROUP BY content_hash", part
+            )
+            stored.update((r[0], r[1]) for r in cursor)
+        return stored
+
+    @staticmethod
+    def _raw_row(hunt_id: int, hunt: Hunt) -> Optional[tuple]:
+        encoded = encode_raw_text(hunt.raw_text)
+        return (hunt_id,) + encoded if encoded else None
+
+    def _insert_hunt(self, conn: sqlite3.Connection, hunt: Hunt) -> SaveResult:
+        content_hash = raw_text_hash(hunt.raw_text)
+        stored = self._stored_hashes(conn, [content_hash] if content_hash else [])
+        if stored:
+            return SaveResult(stored[content_hash], existing=True)
+
+        # Ensure Character and Location exist
+        conn.execute(self._UPSERT_CHARACTER, (hunt.character,))
+        conn.execute(self._UPSERT_LOCATION, (hunt.location,))
+
+        cursor = conn.execute(self._INSERT_HUNT, self._hunt_row(None, hunt, content_hash))
+        hunt_id = cursor.lastrowid
+        raw_row = self._raw_row(hunt_id, hunt)
+        if raw_row:
+            conn.execute(self._INSERT_RAW, raw_row)
+        if hunt.monsters:
+            conn.executemany(self._INSERT_CREATURE, [(m.name,) for m in hunt.monsters])
+            conn.executemany(self._INSERT_MONSTER, [(hunt_id, m.name, m.amount) for m in hunt.monsters])
+        if hunt.looted_items:
+            conn.executemany(self._INSERT_LOOT, [(hunt_id, i.name, i.amount) for i in hunt.looted_items])
+        return SaveResult(hunt_id)
+
+    def save(self, hunt: Hunt) -> int:
+        """Id of the new hunt, or of the one already storing the same log."""
+        with self._connection() as conn:
+            with self._immediate(conn):  # no other save between the hash check and the insert
+                result = self._insert_hunt(conn, hunt)
+        self._record(self._inserted([hunt], [result]))
+        return result.hunt_id
+
+    def save_many(self, hunts: List[Hunt], chunk_size: int = 500) -> List[SaveResult]:
+        """Inserts many hunts over one connection, one transaction per chunk.
+
+        Returns a SaveResult per hunt, in order. A row that fails is reported
+        with its error and does not prevent the rest of its chunk from saving.
+        A log already stored, or repeated in hunts, is not saved again: its
+        result carries the existing id and existing=True.
+        """
+        results: List[SaveResult] = []
+        with self._connection() as conn:
+            for start in range(0, len(hunts), chunk_size):
+                chunk = hunts[start:start + chunk_size]
+                with self._immediate(conn):
+                    chunk_results = self._insert_chunk(conn, chunk)
+                results.extend(chunk_results)
+                self._record(self._inserted(chunk, chunk_results))
+        return results
+
+    def _insert_chunk(self, conn: sqlite3.Connection, chunk: List[Hunt]) -> List[SaveResult]:
+        conn.execute("SAVEPOINT chunk")
+        try:
+            hashes = [raw_text_hash(h.raw_text) for h in chunk]
+            stored = self._stored_hashes(conn, [c for c in hashes if c])
+
+            # Ids are assigned here (the transaction holds the write lock) so
+            # child rows can be bulk-inserted together with their hunts.
+            next_id = conn.execute("""
+                SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'Hunts'), 0),
+                           COALESCE((SELECT MAX(id) FROM Hunts), 0)) + 1
+            """).fetchone()[0]
+            results = []
+            new: List[Tuple[int, Hunt, Optional[str]]] = []
+            for hunt, content_hash in zip(chunk, hashes):
+                if content_hash in stored:
+                    results.append(SaveResult(stored[content_hash], existing=True))
+                    continue
+                hunt_id = next_id + len(new)
+                if content_hash:
+                    stored[content_hash] = hunt_id  # repeated later in the chunk
+                new.append((hunt_id, hunt, content_hash))
+                results.append(SaveResult(hunt_id))
+
+            conn.executemany(self._UPSERT_CHARACTER, {(h.character,) for _, h, _ in new})
+            conn.executemany(self._UPSERT_LOCATION, {(h.location,) for _, h, _ in new})
+            conn.executemany(self._INSERT_CREATURE, {(m.name,) for _, h, _ in new for m in h.monsters})
+            conn.executemany(self._INSERT_HUNT, [self._hunt_row(i, h, c) for i, h, c in new])
+            conn.executemany(self._INSERT_RAW, [
+                r for r in (self._raw_row(i, h) for i, h, _ in new) if r
+            ])
+            conn.executemany(self._INSERT_MONSTER, [
+                (i, m.name, m.amount) for i, h, _ in new for m in h.monsters
+            ])
+            conn.executemany(self._INSERT_LOOT, [
+                (i, it.name, it.amount) for i, h, _ in new for it in h.looted_items
+            ])
+            conn.execute("RELEASE chunk")
+            return results
+        except sqlite3.Error:
+            conn.execute("ROLLBACK TO chunk")
+            conn.execute("RELEASE chunk")
+
+        # Some row failed: retry one by one to isolate it
+        results = []
+        for hunt in chunk:
+            conn.execute("SAVEPOINT row")
+            try:
+                results.append(self._insert_hunt(conn, hunt))
+                conn.execute("RELEASE row")
+            except sqlite3.Error as e:
+                conn.execute("ROLLBACK TO row")
+                conn.execute("RELEASE row")
+                results.append(SaveResult(None, str(e)))
+        return results
+
+    def _row_to_hunt(self, row, monsters: List[Monster] = None, looted_items: List[LootItem] = None) -> Hunt:
         return Hunt(
             id=row["id"],
             character=row["personagem"],
@@ -131,18 +293,21 @@ class SQLiteHuntRepository(HuntRepository):
             balance=row["balance"],
             damage=row["damage"],
             healing=row["healing"],
-            raw_text=row["raw_text"] if "raw_text" in row.keys() else "",
-            monsters=monsters or []
+            raw_text="",  # stored in HuntsRaw, loaded by get_by_id
+            monsters=monsters or [],
+            looted_items=looted_items or []
         )
 
-    def get_all(self, filters: dict) -> List[Hunt]:
+    @staticmethod
+    def _hunt_filters(filters: dict) -> Tuple[List[str], list]:
+        """WHERE conditions and parameters of the hunt list filters."""
         where = []
         params = []
         if filters.get("character") and filters["character"] != "Todos":
-            where.append("personagem = ?")
+            where.append(f"character_id = {SQLiteHuntRepository._CHARACTER_ID}")
             params.append(filters["character"])
         if filters.get("location_like"):
-            where.append("local LIKE ?")
+            where.append("location_id IN (SELECT id FROM Locations WHERE nome LIKE ?)")
             params.append(f"%{filters['location_like']}%")
         
         # Date range filtering
@@ -161,51 +326,280 @@ class SQLiteHuntRepository(HuntRepository):
             where.append("hora_inicio = ?")
             params.append(filters["start_time"])
 
+        # Only these hunts (a tuple of ids), e.g. to reread rows just edited
+        if filters.get("ids"):
+            where.append(f"id IN ({','.join('?' * len(filters['ids']))})")
+            params.extend(filters["ids"])
+        return where, params
+
+    _LIST_COLUMNS = """
+        id, data, hora_inicio, hora_fim, duracao_min,
+        (SELECT nome FROM Characters WHERE id = character_id) AS personagem,
+        (SELECT nome FROM Locations WHERE id = location_id) AS local,
+        xp_gain, loot, supplies, pagamento, balance, raw_xp_gain, damage, healing
+    """
+    # Same expressions as idx_hunts_order / idx_hunts_character_order
+    _ORDER_DATA = "COALESCE(data,'9999-99-99')"
+    _ORDER_HORA = "COALESCE(hora_inicio,'00:00:00')"
+    _LIST_ORDER = f"ORDER BY {_ORDER_DATA} DESC, {_ORDER_HORA} DESC, id DESC"
+    # Sort expressions of each SORT_COLUMNS order, before the id tie-breaker;
+    # each has an index of the same expressions, alone and after character_id
+    _SORT_KEYS = {
+        "date": (_ORDER_DATA, _ORDER_HORA),
+        "id": (),
+        "duration_min": ("COALESCE(duracao_min,0)",),
+        "xp_gain": ("COALESCE(xp_gain,0)",),
+        "loot": ("COALESCE(loot,0)",),
+        "supplies": ("COALESCE(supplies,0)",),
+        "balance": ("COALESCE(balance,0)",),
+    }
+
+    def _sort_keys(self, order: HuntOrder) -> Tuple[List[str], str, str]:
+        """Sort expressions (id last), ORDER BY clause and keyset comparison of an order."""
+        column, descending = order
+        if column not in self._SORT_KEYS:
+            raise ValueError(f"Unsupported sort column: {column}")
+        keys = list(self._SORT_KEYS[column]) + ["id"]
+        direction = "DESC" if descending else "ASC"
+        order_sql = "ORDER BY " + ", ".join(f"{k} {direction}" for k in keys)
+        return keys, order_sql, "<" if descending else ">"
+
+    def get_all(self, filters: dict) -> List[Hunt]:
+        where, params = self._hunt_filters(filters)
         where_sql = ("WHERE " + " AND ".join(where)) if where else ""
         
         sql = f"""
-            SELECT id, data, hora_inicio, hora_fim, duracao_min, personagem, local,
-                   xp_gain, loot, supplies, pagamento, balance, raw_xp_gain, damage, healing, raw_text
+            SELECT {self._LIST_COLUMNS}
             FROM Hunts
             {where_sql}
-            ORDER BY COALESCE(data,'9999-99-99') DESC, COALESCE(hora_inicio,'00:00:00') DESC, id DESC
+            {self._LIST_ORDER}
         """
         
-        with closing(self._get_connection()) as conn:
+        with self._connection() as conn:
             cursor = conn.execute(sql, params)
             rows = cursor.fetchall()
             return [self._row_to_hunt(row) for row in rows]
 
+    def get_page(
+        self, filters: dict, after_key: Optional[PageKey] = None, limit: int = 200, order: HuntOrder = DEFAULT_ORDER
+    ) -> HuntPage:
+        """One page of the list in order, starting after the hunt at after_key.
+
+        Keyset pagination: the page is read by seeking the index of the
+        order to after_key, so its cost does not grow with how deep the
+        page is.
+        """
+        keys, order_sql, before = self._sort_keys(order)
+        where, params = self._hunt_filters(filters)
+        if after_key is not None:
+            # The redundant first bound is what lets SQLite seek the index;
+            # the row-value comparison alone is only applied as a filter.
+            where.append(
+                f"{keys[0]} {before}= ? AND ({', '.join(keys)}) {before} ({', '.join('?' * len(keys))})"
+            )
+            params.extend([after_key[0]] + list(after_key))
+        where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+        key_columns = "".join(f", {k} AS k{i}" for i, k in enumerate(keys[:-1]))
+
+        sql = f"""
+            SELECT {self._LIST_COLUMNS}{key_columns}
+            FROM Hunts
+            {where_sql}
+            {order_sql}
+            LIMIT ?
+        """
+        with self._connection() as conn:
+            rows = conn.execute(sql, params + [limit]).fetchall()
+        hunts = [self._row_to_hunt(row) for row in rows]
+        next_key = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_key = tuple(last[f"k{i}"] for i in range(len(keys) - 1)) + (last["id"],)
+        return HuntPage(hunts, next_key)
+
+    def get_page_keys(self, filters: dict, page_size: int, order: HuntOrder = DEFAULT_ORDER) -> List[PageKey]:
+        """after_key of every page of get_page's result but the first.
+
+        Element i starts page i + 1, so a list can jump to any page without
+        reading the ones before it. One pass over the index of the order.
+        """
+        keys, order_sql, _ = self._sort_keys(order)
+        where, params = self._hunt_filters(filters)
+        where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+        sql = f"""
+            SELECT * FROM (
+                SELECT {', '.join(keys)}, ROW_NUMBER() OVER ({order_sql}) AS n
+                FROM Hunts
+                {where_sql}
+            )
+            WHERE n % ? = 0
+        """
+        with self._connection() as conn:
+            keys = [tuple(r)[:-1] for r in conn.execute(sql, params + [page_size])]
+            # A key on the last row would start an empty page
+            if keys and len(keys) * page_size == conn.execute(
+                f"SELECT COUNT(*) FROM Hunts {where_sql}", params
+            ).fetchone()[0]:
+                keys.pop()
+            return keys
+
+    def count(self, filters: dict) -> int:
+        where, params = self._hunt_filters(filters)
+        where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+        with self._connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM Hunts {where_sql}", params).fetchone()[0]
+
+    # get_columns field (Hunt attribute name) -> SQL expression and array dtype.
+    # Every expression yields an integer: NULL/invalid metrics read as 0, and
+    # dates/times as NaT. Dates are days and times seconds since the epoch,
+    # reinterpreted as datetime64/timedelta64 without conversion.
+    _NAT = "(-9223372036854775807 - 1)"
+    _COLUMN_FIELDS = {
+        "id": ("id", "int64"),
+        "date": (f"COALESCE(CAST(julianday(data) - 2440587.5 AS INTEGER), {_NAT})", "datetime64[D]"),
+        "start_time": (f"COALESCE(CAST(strftime('%s', '1970-01-01 ' || hora_inicio) AS INTEGER), {_NAT})",
+                       "timedelta64[s]"),
+        "end_time": (f"COALESCE(CAST(strftime('%s', '1970-01-01 ' || hora_fim) AS INTEGER), {_NAT})",
+                     "timedelta64[s]"),
+        "duration_min": ("COALESCE(CAST(duracao_min AS INTEGER), 0)", "int64"),
+        "raw_xp_gain": ("COALESCE(CAST(raw_xp_gain AS INTEGER), 0)", "int64"),
+        "xp_gain": ("COALESCE(CAST(xp_gain AS INTEGER), 0)", "int64"),
+        "loot": ("COALESCE(CAST(loot AS INTEGER), 0)", "int64"),
+        "supplies": ("COALESCE(CAST(supplies AS INTEGER), 0)", "int64"),
+        "payment": ("COALESCE(CAST(pagamento AS INTEGER), 0)", "int64"),
+        "balance": ("COALESCE(CAST(balance AS INTEGER), 0)", "int64"),
+        "damage": ("COALESCE(CAST(damage AS INTEGER), 0)", "int64"),
+        "healing": ("COALESCE(CAST(healing AS INTEGER), 0)", "int64"),
+    }
+
+    def get_columns(self, filters: dict, fields: Sequence[str]) -> Dict[str, Any]:
+        """The given Hunt fields of the filtered hunts as typed NumPy arrays.
+
+        Rows are in chronological order (date, start time, id; undated hunts
+        last), the exact reverse of get_all's order. The cursor is
+        streamed as one flat int64 sequence into a single buffer, with no Hunt,
+        dict or Row object per hunt.
+        """
+        import numpy as np  # only the analysis tab needs it; keeps it off the startup path
+        unknown = [f for f in fields if f not in self._COLUMN_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown column fields: {', '.join(unknown)}")
+        if not fields:
+            return {}
+        where, params = self._hunt_filters(filters)
+        where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+        exprs = ", ".join(self._COLUMN_FIELDS[f][0] for f in fields)
+        sql = f"SELECT {exprs} FROM Hunts {where_sql} ORDER BY {self._ORDER_DATA}, {self._ORDER_HORA}, id"
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # plain tuples
+            cursor.execute(sql, params)
+            flat = np.fromiter(itertools.chain.from_iterable(cursor), dtype=np.int64)
+        table = flat.reshape(-1, len(fields))
+        return {
+            f: np.ascontiguousarray(table[:, i]).view(self._COLUMN_FIELDS[f][1])
+            for i, f in enumerate(fields)
+        }
+
     def get_by_id(self, hunt_id: int) -> Optional[Hunt]:
-        with closing(self._get_connection()) as conn:
-            cursor = conn.execute("SELECT * FROM Hunts WHERE id = ?", (hunt_id,))
+        with self._connection() as conn:
+            cursor = conn.execute(f"SELECT {self._LIST_COLUMNS} FROM Hunts WHERE id = ?", (hunt_id,))
             row = cursor.fetchone()
             if not row:
                 return None
             
             m_cursor = conn.execute(
-                "SELECT criatura, quantidade FROM Hunts_Monstros WHERE hunt_id = ? ORDER BY quantidade DESC",
+                "SELECT cr.nome AS criatura, hm.quantidade FROM Hunts_Monstros hm "
+                "JOIN Creatures cr ON cr.id = hm.creature_id WHERE hm.hunt_id = ? ORDER BY hm.quantidade DESC",
                 (hunt_id,)
             )
             monsters = [Monster(name=r["criatura"], amount=r["quantidade"], hunt_id=hunt_id) for r in m_cursor.fetchall()]
-            
-            return self._row_to_hunt(row, monsters)
+
+            l_cursor = conn.execute(
+                "SELECT item, quantidade FROM Hunts_Loot WHERE hunt_id = ? ORDER BY quantidade DESC",
+                (hunt_id,)
+            )
+            looted_items = [LootItem(name=r["item"], amount=r["quantidade"], hunt_id=hunt_id) for r in l_cursor.fetchall()]
+
+            hunt = self._row_to_hunt(row, monsters, looted_items)
+            raw = conn.execute("SELECT codec, data FROM HuntsRaw WHERE hunt_id = ?", (hunt_id,)).fetchone()
+            if raw:
+                hunt.raw_text = decode_raw_text(raw["codec"], raw["data"])
+            return hunt
+
+    def existing_session_keys(
+        self, keys: Iterable[Tuple[Optional[str], str, str]]
+    ) -> Dict[Tuple[Optional[str], str, str], int]:
+        """Maps each (character, date, start_time) key already stored to a hunt id.
+
+        A None character matches a session of any character and an empty
+        start_time any session of that date, as with get_all's filters. The
+        whole batch is answered by one join against a temporary key table.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS session_keys (personagem TEXT, data TEXT, hora_inicio TEXT)"
+            )
+            conn.execute("DELETE FROM temp.session_keys")
+            conn.executemany("INSERT INTO temp.session_keys VALUES (?, ?, ?)", keys)
+            cursor = conn.execute("""
+                SELECT k.personagem, k.data, k.hora_inicio, MIN(h.id) AS hunt_id
+                FROM temp.session_keys k
+                JOIN Hunts h ON h.data = k.data AND (k.hora_inicio = '' OR h.hora_inicio = k.hora_inicio)
+                WHERE k.personagem IS NULL OR h.character_id = (SELECT id FROM Characters WHERE nome = k.personagem)
+                GROUP BY k.personagem, k.data, k.hora_inicio
+            """)
+            found = {(r["personagem"], r["data"], r["hora_inicio"]): r["hunt_id"] for r in cursor.fetchall()}
+            conn.rollback()
+            return found
+
+    def count_duplicate_hunts(self) -> int:
+        with self._connection() as conn:
+            return count_duplicate_hunts(conn)
+
+    def remove_duplicate_hunts(self) -> DuplicateCleanup:
+        """Keeps the first stored hunt of each log and deletes the others.
+
+        When there is something to delete, the database is first copied next
+        to itself (sqlite3 backup API) so the deleted hunts can be recovered.
+        """
+        with self._connection() as conn:
+            backup_path = None
+            if count_duplicate_hunts(conn):
+                backup_path = f"{self.db_path}.{time.strftime('%Y%m%d-%H%M%S')}.bak"
+                with closing(sqlite3.connect(backup_path)) as target:
+                    conn.backup(target)
+            with self._immediate(conn):  # the index swap commits with the deletes
+                removed = collapse_duplicate_hunts(conn)
+        if removed:
+            self._record(HuntChanges(everything=True))
+        return DuplicateCleanup(len(removed), backup_path)
 
     def delete_many(self, item_ids: List[int]) -> None:
-         with closing(self._get_connection()) as conn:
+         changes = HuntChanges(deleted=set(item_ids))
+         with self._connection() as conn:
              with conn:
+                self._add_stored_values(conn, list(item_ids), changes)
                 placeholders = ",".join("?" for _ in item_ids)
                 conn.execute(f"DELETE FROM Hunts WHERE id IN ({placeholders})", tuple(item_ids))
+         self._record(changes)
 
     def update(self, hunt: Hunt) -> None:
-         with closing(self._get_connection()) as conn:
+         changes = HuntChanges(updated={hunt.id}, lists=True)
+         self._add_values(changes, hunt.character, hunt.location, hunt.date)
+         with self._connection() as conn:
             with conn:
-                conn.execute("INSERT OR IGNORE INTO Characters (nome) VALUES (?)", (hunt.character,))
-                conn.execute("INSERT OR IGNORE INTO Locations (nome) VALUES (?)", (hunt.location,))
+                self._add_stored_values(conn, [hunt.id], changes)  # where the hunt was listed until now
+                conn.execute(self._UPSERT_CHARACTER, (hunt.character,))
+                conn.execute(self._UPSERT_LOCATION, (hunt.location,))
 
-                conn.execute("""
+                conn.execute(f"""
                     UPDATE Hunts
-                    SET personagem=?, local=?, data=?, hora_inicio=?, hora_fim=?, duracao_min=?,
+                    SET character_id={self._CHARACTER_ID}, location_id={self._LOCATION_ID}, data=?, hora_inicio=?, hora_fim=?, duracao_min=?,
                         raw_xp_gain=?, xp_gain=?, loot=?, supplies=?, pagamento=?, balance=?, damage=?, healing=?
                     WHERE id = ?
                 """, (
@@ -213,62 +607,62 @@ class SQLiteHuntRepository(HuntRepository):
                     hunt.duration_min, hunt.raw_xp_gain, hunt.xp_gain, hunt.loot, hunt.supplies,
                     hunt.payment, hunt.balance, hunt.damage, hunt.healing, hunt.id
                 ))
-                conn.execute("UPDATE Hunts_Monstros SET personagem=? WHERE hunt_id=?", (hunt.character, hunt.id))
+         self._record(changes)
 
     def update_many(self, ids: List[int], updates: dict) -> None:
-         with closing(self._get_connection()) as conn:
+         changes = HuntChanges(updated=set(ids), lists=True)
+         self._add_values(changes, updates.get("character"), updates.get("location"), None)
+         with self._connection() as conn:
             with conn:
+                self._add_stored_values(conn, list(ids), changes)
                 qmarks = ",".join("?" for _ in ids)
                 
                 if "character" in updates:
-                     conn.execute("INSERT OR IGNORE INTO Characters (nome) VALUES (?)", (updates["character"],))
-                     conn.execute(f"UPDATE Hunts SET personagem=? WHERE id IN ({qmarks})", tuple([updates["character"]] + ids))
-                     conn.execute(f"UPDATE Hunts_Monstros SET personagem=? WHERE hunt_id IN ({qmarks})", tuple([updates["character"]] + ids))
+                     conn.execute(self._UPSERT_CHARACTER, (updates["character"],))
+                     conn.execute(
+                         f"UPDATE Hunts SET character_id={self._CHARACTER_ID} WHERE id IN ({qmarks})",
+                         tuple([updates["character"]] + ids),
+                     )
                 
                 if "location" in updates:
-                     conn.execute("INSERT OR IGNORE INTO Locations (nome) VALUES (?)", (updates["location"],))
-                     conn.execute(f"UPDATE Hunts SET local=? WHERE id IN ({qmarks})", tuple([updates["location"]] + ids))
+                     conn.execute(self._UPSERT_LOCATION, (updates["location"],))
+                     conn.execute(
+                         f"UPDATE Hunts SET location_id={self._LOCATION_ID} WHERE id IN ({qmarks})",
+                         tuple([updates["location"]] + ids),
+                     )
+         self._record(changes)
 
     def get_analytics(self, filters: dict) -> dict:
+        """Totals for the filters, read from DailyRollup (one row per character and day)."""
         where = []
         params = []
         if filters.get("character") and filters["character"] != "Todos":
-            where.append("h.personagem = ?")
+            where.append(f"character_id = {self._CHARACTER_ID}")
             params.append(filters["character"])
         
         if filters.get("date_start") and filters.get("date_end"):
-            where.append("h.data >= ? AND h.data <= ?")
+            where.append("data >= ? AND data <= ?")
             params.extend([filters["date_start"], filters["date_end"]])
 
         where_sql = ("WHERE " + " AND ".join(where)) if where else ""
 
         sql = f"""
             SELECT
-                COUNT(*),
-                COALESCE(SUM(h.duracao_min),0),
-                COALESCE(SUM(h.xp_gain),0),
-                COALESCE(SUM(h.raw_xp_gain),0),
-                COALESCE(SUM(h.supplies),0),
-                COALESCE(SUM(h.pagamento),0),
-                COALESCE(SUM(h.balance),0)
-            FROM Hunts h
+                COALESCE(SUM(hunts),0),
+                COALESCE(SUM(minutes),0),
+                COALESCE(SUM(xp),0),
+                COALESCE(SUM(raw_xp),0),
+                COALESCE(SUM(supplies),0),
+                COALESCE(SUM(pagamento),0),
+                COALESCE(SUM(balance),0),
+                COALESCE(SUM(kills),0)
+            FROM DailyRollup
             {where_sql}
         """
         
-        with closing(self._get_connection()) as conn:
-            cursor = conn.execute(sql, params)
-            row = cursor.fetchone()
-            qtd, total_min, total_xp, total_raw_xp, total_supplies, total_pagto, total_balance = row, 0, 0, 0, 0, 0, 0
-            if row:
-                qtd, total_min, total_xp, total_raw_xp, total_supplies, total_pagto, total_balance = row
-
-            k_sql = f"""
-                SELECT COALESCE(SUM(hm.quantidade),0) as total_kills
-                FROM Hunts h LEFT JOIN Hunts_Monstros hm ON hm.hunt_id = h.id
-                {where_sql}
-            """
-            cursor = conn.execute(k_sql, params)
-            total_kills = int(cursor.fetchone()[0] or 0)
+        with self._connection() as conn:
+            row = conn.execute(sql, params).fetchone()
+            qtd, total_min, total_xp, total_raw_xp, total_supplies, total_pagto, total_balance, total_kills = row
 
         return {
             "count": qtd,
@@ -278,14 +672,14 @@ class SQLiteHuntRepository(HuntRepository):
             "total_supplies": total_supplies,
             "total_pagto": total_pagto,
             "total_balance": total_balance,
-            "total_kills": total_kills
+            "total_kills": int(total_kills or 0)
         }
 
     def get_monster_aggregates(self, filters: dict) -> List[Tuple[str, int]]:
         where = []
         params = []
         if filters.get("character") and filters["character"] != "Todos":
-            where.append("h.personagem = ?")
+            where.append(f"h.character_id = {self._CHARACTER_ID}")
             params.append(filters["character"])
         
         if filters.get("date_start") and filters.get("date_end"):
@@ -295,98 +689,203 @@ class SQLiteHuntRepository(HuntRepository):
         where_sql = ("WHERE " + " AND ".join(where)) if where else ""
         
         sql = f"""
-            SELECT hm.criatura, SUM(hm.quantidade) as total
+            SELECT cr.nome AS criatura, SUM(hm.quantidade) as total
             FROM Hunts_Monstros hm
             JOIN Hunts h ON h.id = hm.hunt_id
+            JOIN Creatures cr ON cr.id = hm.creature_id
             {where_sql}
-            GROUP BY hm.criatura
+            GROUP BY hm.creature_id
             ORDER BY total DESC
         """
         
-        with closing(self._get_connection()) as conn:
+        with self._connection() as conn:
             cursor = conn.execute(sql, params)
             return [(row["criatura"], row["total"]) for row in cursor.fetchall()]
 
-    def get_chart_data(self, filters: dict) -> List[dict]:
+    def get_loot_aggregates(self, filters: dict) -> List[Tuple[str, int]]:
         where = []
         params = []
         if filters.get("character") and filters["character"] != "Todos":
-            where.append("personagem = ?")
+            where.append(f"h.character_id = {self._CHARACTER_ID}")
             params.append(filters["character"])
         
         if filters.get("date_start") and filters.get("date_end"):
-            where.append("data >= ? AND data <= ?")
+            where.append("h.data >= ? AND h.data <= ?")
             params.extend([filters["date_start"], filters["date_end"]])
 
         where_sql = ("WHERE " + " AND ".join(where)) if where else ""
         
         sql = f"""
-            SELECT data, hora_inicio, raw_xp_gain, balance, duracao_min
-            FROM Hunts
+            SELECT hl.item, SUM(hl.quantidade) as total
+            FROM Hunts_Loot hl
+            JOIN Hunts h ON h.id = hl.hunt_id
             {where_sql}
-            ORDER BY data, hora_inicio
+            GROUP BY hl.item
+            ORDER BY total DESC
         """
         
-        with closing(self._get_connection()) as conn:
+        with self._connection() as conn:
             cursor = conn.execute(sql, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return [(row["item"], row["total"]) for row in cursor.fetchall()]
+
+    def backfill_loot(
+        self, extract_items: Callable[[str], List[Tuple[str, int]]], batch_size: int = 500,
+        max_batches: Optional[int] = None,
+    ) -> LootBackfill:
+        """Fills Hunts_Loot from the raw_text of hunts saved before it existed.
+
+        Walks Hunts by id in batches, one transaction each; progress is kept in
+        Settings so an interrupted run resumes where it stopped. With
+        max_batches the call stops after that many batches, so a long
+        backfill can be spread over several calls until done is True.
+        """
+        last_id = int(self.get_setting("loot_backfill_last_id") or 0)
+        filled = 0
+        batches = 0
+        done = False
+        with self._connection() as conn:
+            while max_batches is None or batches < max_batches:
+                batches += 1
+                rows = conn.execute(
+                    """
+                    SELECT h.id, r.codec, r.data FROM Hunts h
+                    LEFT JOIN HuntsRaw r ON r.hunt_id = h.id
+                    WHERE h.id > ?
+                      AND NOT EXISTS (SELECT 1 FROM Hunts_Loot hl WHERE hl.hunt_id = h.id)
+                    ORDER BY h.id
+                    LIMIT ?
+                    """,
+                    (last_id, batch_size),
+                ).fetchall()
+                if not rows:
+                    done = True
+                    break
+
+                data_loot = []
+                for row in rows:
+                    raw_text = decode_raw_text(row["codec"], row["data"]) if row["data"] is not None else ""
+                    items = extract_items(raw_text) if raw_text else []
+                    data_loot.extend((row["id"], name, amount) for name, amount in items)
+                    filled += 1 if items else 0
+                last_id = rows[-1]["id"]
+
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO Hunts_Loot (hunt_id, item, quantidade) VALUES (?, ?, ?)",
+                        data_loot
+                    )
+                    conn.execute(
+                        "INSERT INTO Settings (key, value) VALUES ('loot_backfill_last_id', ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                        (str(last_id),),
+                    )
+        if filled:
+            self._record(HuntChanges(everything=True))
+        return LootBackfill(filled, done)
 
     def list_characters(self) -> List[str]:
-        with closing(self._get_connection()) as conn:
-            cursor = conn.execute("SELECT nome, is_default FROM Characters ORDER BY nome")
+        with self._connection() as conn:
+            cursor = conn.execute("SELECT nome, is_default FROM Characters WHERE ativo = 1 ORDER BY nome")
             rows = cursor.fetchall()
         default = [r["nome"] for r in rows if r["is_default"]]
         others = [r["nome"] for r in rows if not r["is_default"]]
         return default + others
 
     def get_default_character(self) -> str:
-        with closing(self._get_connection()) as conn:
-            cursor = conn.execute("SELECT nome FROM Characters WHERE is_default = 1 LIMIT 1")
+        with self._connection() as conn:
+            cursor = conn.execute("SELECT nome FROM Characters WHERE is_default = 1 AND ativo = 1 LIMIT 1")
             r = cursor.fetchone()
             return r["nome"] if r else ""
 
     def set_default_character(self, name: str) -> None:
-        with closing(self._get_connection()) as conn:
+        with self._connection() as conn:
             with conn:
                 conn.execute("UPDATE Characters SET is_default = 0")
                 conn.execute("UPDATE Characters SET is_default = 1 WHERE nome = ?", (name,))
+        self._record(HuntChanges(lists=True))
 
     def add_character(self, name: str) -> None:
         if not name.strip(): return
-        with closing(self._get_connection()) as conn:
+        with self._connection() as conn:
             with conn:
-                conn.execute("INSERT OR IGNORE INTO Characters (nome) VALUES (?)", (name.strip(),))
+                conn.execute(self._UPSERT_CHARACTER, (name.strip(),))
+        self._record(HuntChanges(lists=True))
 
     def delete_character(self, name: str) -> None:
-        with closing(self._get_connection()) as conn:
+        with self._connection() as conn:
             with conn:
-                conn.execute("DELETE FROM Characters WHERE nome = ?", (name,))
+                # Characters still referenced by hunts are only hidden from the lists
+                conn.execute(
+                    "DELETE FROM Characters WHERE nome = ? AND NOT EXISTS "
+                    "(SELECT 1 FROM Hunts WHERE character_id = Characters.id)",
+                    (name,),
+                )
+                conn.execute("UPDATE Characters SET ativo = 0, is_default = 0 WHERE nome = ?", (name,))
+        self._record(HuntChanges(lists=True))
 
     def list_locations(self) -> List[str]:
-        with closing(self._get_connection()) as conn:
-            cursor = conn.execute("SELECT nome FROM Locations ORDER BY nome")
+        with self._connection() as conn:
+            cursor = conn.execute("SELECT nome FROM Locations WHERE ativo = 1 ORDER BY nome")
             return [r["nome"] for r in cursor.fetchall()]
 
     def add_location(self, name: str) -> None:
         if not name.strip(): return
-        with closing(self._get_connection()) as conn:
+        with self._connection() as conn:
             with conn:
-                conn.execute("INSERT OR IGNORE INTO Locations (nome) VALUES (?)", (name.strip(),))
+                conn.execute(self._UPSERT_LOCATION, (name.strip(),))
+        self._record(HuntChanges(lists=True))
 
     def delete_location(self, name: str) -> None:
-        with closing(self._get_connection()) as conn:
+        with self._connection() as conn:
+            with conn:
+                conn.execute(
+                    "DELETE FROM Locations WHERE nome = ? AND NOT EXISTS "
+                    "(SELECT 1 FROM Hunts WHERE location_id = Locations.id)",
+                    (name,),
+                )
+                conn.execute("UPDATE Locations SET ativo = 0 WHERE nome = ?", (name,))
+        self._record(HuntChanges(lists=True))
+
+    def get_scan_manifest(self, folder: str) -> List[ScannedFile]:
+        # Primary-key range scan over every path under folder
+        prefix = os.path.join(folder, "")
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "SELECT path, size, mtime_ns, content_hash, hunt_id, session_key "
+                "FROM ScanManifest WHERE path >= ? AND path < ?",
+                (prefix, prefix + "\U0010ffff"),
+            )
+            return [ScannedFile(**dict(r)) for r in cursor.fetchall()]
+
+    def save_scan_manifest(self, entries: List[ScannedFile]) -> None:
+        if not entries: return
+        with self._connection() as conn:
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO ScanManifest (path, size, mtime_ns, content_hash, hunt_id, session_key)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET
+                        size=excluded.size, mtime_ns=excluded.mtime_ns, content_hash=excluded.content_hash,
+                        hunt_id=excluded.hunt_id, session_key=excluded.session_key
+                    """,
+                    [(e.path, e.size, e.mtime_ns, e.content_hash, e.hunt_id, e.session_key) for e in entries],
+                )
+
+    def delete_scan_manifest(self, paths: List[str]) -> None:
+        if not paths: return
+        with self._connection() as conn:
             with conn:
-                conn.execute("DELETE FROM Locations WHERE nome = ?", (name,))
+                conn.executemany("DELETE FROM ScanManifest WHERE path = ?", [(p,) for p in paths])
 
     def get_setting(self, key: str) -> Optional[str]:
-        with closing(self._get_connection()) as conn:
+        with self._connection() as conn:
             cursor = conn.execute("SELECT value FROM Settings WHERE key=?", (key,))
             res = cursor.fetchone()
             return res["value"] if res else None
 
     def set_setting(self, key: str, value: str) -> None:
-        with closing(self._get_connection()) as conn:
+        with self._connection() as conn:
             with conn:
                 conn.execute(
                     "INSERT INTO Settings (key, value) VALUES (?, ?) "
@@ -0,0 +1,190 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; the name follows
+
+
+class FolderWatcher:
+    """Watches the log folder for session logs that were just written.
+
+    On Linux, inotify reports files as they are closed after writing. Other
+    systems (or an unavailable inotify) fall back to polling the folder: a
+    file counts as finished once its size and mtime stay the same for one
+    poll. The poll interval grows from min_interval to max_interval while
+    nothing changes, and drops back on activity.
+
+    Bursts of writes are coalesced: a file is reported once, after settle
+    seconds without events (inotify) or once it stops changing (polling).
+    Finished paths pile up until drain() takes them; the watcher never
+    touches the database or the UI itself.
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        prefix: str = "Hunting_Session_",
+        extensions: Tuple[str, ...] = (".txt", ".log"),
+        settle: float = 0.5,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+    ):
+        self.folder = folder
+        self.prefix = prefix
+        self.extensions = extensions
+        self.settle = settle
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._finished: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.mode = ""  # "inotify" or "polling" once started
+
+    def start(self) -> None:
+        fd = self._inotify_fd()
+        self.mode = "inotify" if fd is not None else "polling"
+        target = (lambda: self._watch_inotify(fd)) if fd is not None else self._watch_polling
+        self._thread = threading.Thread(target=target, name="log-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def drain(self) -> List[str]:
+        """Paths finished since the last call, sorted."""
+        with self._lock:
+            paths = sorted(self._finished)
+            self._finished.clear()
+        return paths
+
+    def _accepts(self, name: str) -> bool:
+        return name.startswith(self.prefix) and name.lower().endswith(self.extensions)
+
+    def _report(self, paths) -> None:
+        with self._lock:
+            self._finished.update(paths)
+
+    # -- inotify -----------------------------------------------------------
+
+    def _inotify_fd(self) -> Optional[int]:
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            if libc.inotify_add_watch(fd, os.fsencode(self.folder), _IN_CLOSE_WRITE | _IN_MOVED_TO) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _watch_inotify(self, fd: int) -> None:
+        started = time.time()
+        pending: Set[str] = set()
+        try:
+            while not self._stop.is_set():
+                # Waits indefinitely (in steps, to notice stop) until an event
+                # arrives, then only for the settle period
+                ready, _, _ = select.select([fd], [], [], self.settle if pending else 1.0)
+                if not ready:
+                    if pending:
+                        self._report(pending)
+                        pending = set()
+                    continue
+                try:
+                    data = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                for mask, name in self._events(data):
+                    if mask & _IN_Q_OVERFLOW:
+                        # Events were lost: whatever changed since the watch began
+                        pending.update(self._modified_since(started))
+                    elif mask & _IN_IGNORED:
+                        # The folder itself went away or was unmounted
+                        self._report(pending)
+                        os.close(fd)
+                        fd = -1
+                        self.mode = "polling"
+                        self._watch_polling()
+                        return
+                    elif name and self._accepts(name):
+                        pending.add(os.path.join(self.folder, name))
+        finally:
+            if fd >= 0:
+                os.close(fd)
+
+    @staticmethod
+    def _events(data: bytes) -> List[Tuple[int, str]]:
+        events = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            _, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((mask, os.fsdecode(name)))
+        return events
+
+    def _modified_since(self, since: float) -> List[str]:
+        return [path for path, (_, mtime_ns) in self._snapshot().items() if mtime_ns >= since * 1e9]
+
+    # -- polling -----------------------------------------------------------
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        files: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.folder) as it:
+                for entry in it:
+                    if self._accepts(entry.name):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        files[entry.path] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass  # folder missing for now (unmounted drive...): try again later
+        return files
+
+    def _watch_polling(self) -> None:
+        known = self._snapshot()  # present at start: left to the startup scan
+        changing: Dict[str, Tuple[int, int]] = {}
+        interval = self.min_interval
+        while not self._stop.wait(interval):
+            current = self._snapshot()
+            finished = []
+            for path, sig in current.items():
+                if known.get(path) == sig:
+                    continue
+                if changing.get(path) == sig:
+                    # Unchanged for a whole poll: the write is over
+                    finished.append(path)
+                    known[path] = sig
+                    del changing[path]
+                else:
+                    changing[path] = sig
+            for path in [p for p in changing if p not in current]:
+                del changing[path]  # deleted before it settled
+            if finished:
+                self._report(finished)
+            if finished or changing:
+                interval = self.min_interval
+            else:
+                interval = min(interval * 2, self.max_interval)
@@ -1,7 +1,146 @@
+import mmap
+import os
 import re
-from typing import Any, Dict, List, Tuple
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern, Tuple, Union
+
+
+def _clean(value: str) -> str:
+    return value.replace(",", "").replace("−", "-").replace("–", "-").strip()
+
+
+class _Field(NamedTuple):
+    key: str
+    label: str                          # text before the colon on the log line
+    value: Pattern[str]                 # matched right after the label's colon
+    legacy: Pattern[str]                # whole-text search, used only when the line is not found
+    convert: Callable[[Any], Any]       # match -> value
+    default: Any
+    line_start: bool = False            # label must not be indented
+
+
+def _as_int(m) -> int:
+    value = m.group(1).replace(",", "")
+    try:
+        return int(value)
+    except ValueError:
+        # Unicode minus signs, decimal points...
+        return LogParser.safe_int(_clean(value))
+
+
+def _as_str(m) -> str:
+    # Date/time groups only capture digits and separators, nothing to clean
+    return m.group(1)
+
+
+def _as_minutes(m) -> int:
+    return int(m.group(1)) * 60 + int(m.group(2))
+
+
+_NUMBER = r"\s*([\d,.]+)"
+_SIGNED = r"\s*([-\d,−–]+)"
+_FROM_DATE = r"From\s+(\d{4}-\d{2}-\d{2}),"
+_FROM_TIME = r"From\s+\d{4}-\d{2}-\d{2},\s+(\d{2}:\d{2}:\d{2})"
+_TO_TIME = r"to\s+\d{4}-\d{2}-\d{2},\s+(\d{2}:\d{2}:\d{2})"
+
+# Every scalar field of a Hunting_Session_ log. Fields sharing a label
+# ("Session data") are all read from the same line.
+_FIELDS: Tuple[_Field, ...] = (
+    _Field("duracao_min", "Session", re.compile(r"\s+(\d{2}):(\d{2})h"),
+           re.compile(r"Session:\s+(\d{2}):(\d{2})h"), _as_minutes, 0),
+    _Field("raw_xp_gain", "Raw XP Gain", re.compile(_NUMBER),
+           re.compile(r"Raw XP Gain:" + _NUMBER), _as_int, 0),
+    _Field("xp_gain", "XP Gain", re.compile(_NUMBER),
+           re.compile(r"^XP Gain:" + _NUMBER, re.MULTILINE), _as_int, 0, line_start=True),
+    _Field("loot", "Loot", re.compile(_SIGNED),
+           re.compile(r"Loot:" + _SIGNED), _as_int, 0),
+    _Field("supplies", "Supplies", re.compile(_SIGNED),
+           re.compile(r"Supplies:" + _SIGNED), _as_int, 0),
+    _Field("balance", "Balance", re.compile(_SIGNED),
+           re.compile(r"Balance:" + _SIGNED), _as_int, 0),
+    _Field("damage", "Damage", re.compile(_SIGNED),
+           re.compile(r"Damage:" + _SIGNED), _as_int, 0),
+    _Field("healing", "Healing", re.compile(_SIGNED),
+           re.compile(r"Healing:" + _SIGNED), _as_int, 0),
+    _Field("data_inicio", "Session data", re.compile(r".*?" + _FROM_DATE),
+           re.compile(_FROM_DATE), _as_str, ""),
+    _Field("hora_inicio", "Session data", re.compile(r".*?" + _FROM_TIME),
+           re.compile(_FROM_TIME), _as_str, ""),
+    _Field("hora_fim", "Session data", re.compile(r".*?" + _TO_TIME),
+           re.compile(_TO_TIME), _as_str, ""),
+)
+
+_FIELDS_BY_LABEL: Dict[str, Tuple[_Field, ...]] = {}
+for _f in _FIELDS:
+    _FIELDS_BY_LABEL[_f.label] = _FIELDS_BY_LABEL.get(_f.label, ()) + (_f,)
+del _f
+
+
+def _label_alternation(line_start: bool) -> str:
+    labels = {f.label for f in _FIELDS if f.line_start == line_start}
+    # Longest first so "Session data" is tried before "Session"
+    return "|".join(re.escape(l) for l in sorted(labels, key=len, reverse=True))
+
+
+# One line-anchored pattern recognises every known label; the monster list
+# header ends the scalar scan.
+_LABEL_LINE = re.compile(
+    r"^(?:(?P<anchored>" + _label_alternation(True) + r")"
+    r"|[ \t]*(?P<label>" + _label_alternation(False) + r")"
+    r"|[ \t]*(?P<monsters>(?i:Killed Monsters))):",
+    re.MULTILINE,
+)
+_MONSTERS_START = re.compile(r"Killed Monsters:", re.IGNORECASE)
+_MONSTERS_END = re.compile(r"Looted Items:", re.IGNORECASE)
+_ITEMS_START = _MONSTERS_END
+# The item list runs to the end of the log, or to the next session of a concatenated dump
+_ITEMS_END = re.compile(r"Session data:")
+# Greedy name capture (stripped afterwards) avoids the backtracking of "(.+?)\s*$"
+_LIST_ENTRY = re.compile(r"^\s*(\d+)\s*x\s+(.+)$", re.MULTILINE | re.IGNORECASE)
+_LEADING_WS = re.compile(r"\s*")
+
+# Byte-level counterparts, used before anything is decoded. Both markers are
+# ASCII, so they match the same bytes in UTF-8 and latin-1 files.
+_SESSION_START_BYTES = re.compile(rb"Session data:")
+_MONSTERS_START_BYTES = re.compile(rb"Killed Monsters:", re.IGNORECASE)
+# Files from this size on are mapped instead of read into memory
+_MMAP_MIN_SIZE = 1 << 20
+# The "Session data" line opens every log; its date/time fields, as matched
+# by the data_inicio/hora_inicio/hora_fim patterns
+_SESSION_KEY_BYTES = re.compile(
+    rb"Session data:[^\n]*?From\s+(\d{4}-\d{2}-\d{2}),\s+(\d{2}:\d{2}:\d{2})"
+    rb"(?:[^\n]*?to\s+\d{4}-\d{2}-\d{2},\s+(\d{2}:\d{2}:\d{2}))?"
+)
+# Bytes read by read_head; the session line is well within the first hundred
+HEAD_SIZE = 512
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+class SessionKey(NamedTuple):
+    date: str           # YYYY-MM-DD of the session start
+    start_time: str     # HH:MM:SS
+    end_time: str       # HH:MM:SS, "" when the log has none
+
+
+class ParsedLog(NamedTuple):
+    source: Union[str, os.PathLike]     # the path or text given to parse_many
+    text: str                           # decoded log content ("" on read errors)
+    info: Dict[str, Any]                # parse_hunt_data output ({} on errors)
+    monsters: List[Tuple[str, int]]
+    items: List[Tuple[str, int]]
+    error: Optional[str] = None
+
+
+# Below this many items the process pool costs more than it saves
+_PARALLEL_MIN_ITEMS = 8
+_PARALLEL_CHUNK = 16
+
 
 class LogParser:
+    def __init__(self):
+        self._last: Optional[tuple] = None  # (text, parse_session(text)) of the last wrapper call
+
     @staticmethod
     def safe_int(value: Any) -> int:
         try:
@@ -12,54 +151,193 @@ class LogParser:
             except Exception:
                 return 0
 
+    def _list_entries(self, text: str, start: int, end_pattern: Pattern[str]):
+        """Reads "<qty>x <name>" lines from start up to end_pattern (or the end of the text).
+
+        Returns the entries and the match of end_pattern (None at end of text).
+        """
+        start = _LEADING_WS.match(text, start).end()
+        end = end_pattern.search(text, start)
+        trecho = text[start:end.start()] if end else text[start:]
+        entries = [(nome.strip(), self.safe_int(qtd)) for qtd, nome in _LIST_ENTRY.findall(trecho)]
+        return entries, end
+
     @staticmethod
-    def _search(text: str, pattern: str, flags=0, default="0") -> str:
-        m = re.search(pattern, text, flags)
-        if not m:
-            return default
-        val = m.group(1)
-        val = val.replace(",", "").replace("−", "-").replace("–", "-").strip()
-        return val
+    def _scan_header(text: str) -> Tuple[Dict[str, Any], Optional[int]]:
+        """Scalar fields found on their own lines, up to the monster list.
+
+        Also returns where the monster list header ends (None when absent).
+        """
+        found: Dict[str, Any] = {}
+        for m in _LABEL_LINE.finditer(text):
+            kind = m.lastgroup
+            if kind == "monsters":
+                return found, m.end()
+            for field in _FIELDS_BY_LABEL[m.group(kind)]:
+                if field.key not in found:
+                    v = field.value.match(text, m.end())
+                    if v:
+                        found[field.key] = field.convert(v)
+        return found, None
+
+    def parse_session(self, text: str) -> Tuple[Dict[str, Any], List[Tuple[str, int]], List[Tuple[str, int]]]:
+        """Single scan returning the parse_hunt_data dict, the monster list and the looted items."""
+        found, monsters_at = self._scan_header(text)
+        monsters = None
+        items_start = None
+        if monsters_at is not None:
+            monsters, items_start = self._list_entries(text, monsters_at, _MONSTERS_END)
+
+        info: Dict[str, Any] = {}
+        for field in _FIELDS:
+            if field.key in found:
+                info[field.key] = found[field.key]
+                continue
+            # Unusual layout (value on the next line, header after the monster
+            # list, text pasted without line breaks): original whole-text search.
+            m = field.legacy.search(text)
+            info[field.key] = field.convert(m) if m else field.default
+
+        if monsters is None:
+            m = _MONSTERS_START.search(text)
+            monsters, items_start = self._list_entries(text, m.end(), _MONSTERS_END) if m else ([], None)
+        if items_start is None:
+            items_start = _ITEMS_START.search(text)
+        items = self._list_entries(text, items_start.end(), _ITEMS_END)[0] if items_start else []
+        return info, monsters, items
+
+    def _parsed(self, text: str) -> tuple:
+        # parse_hunt_data, extract_monsters and extract_items of the same text
+        # share one parse_session; read once, so threads sharing the parser
+        # never see another text's result
+        last = self._last
+        if last is None or (last[0] is not text and last[0] != text):
+            last = (text, self.parse_session(text))
+            self._last = last
+        return last[1]
+
+    # Callers needing more than one part should use parse_session directly;
+    # the results below are shared with the next call on the same text.
 
     def extract_monsters(self, text: str) -> List[Tuple[str, int]]:
-        m = re.search(r"Killed Monsters:\s*(.*?)(?:Looted Items:|$)", text, re.DOTALL | re.IGNORECASE)
-        trecho = m.group(1) if m else ""
-        padrao = re.compile(r'^\s*(\d+)\s*x\s+(.+?)\s*$', re.MULTILINE | re.IGNORECASE)
-        monstros = padrao.findall(trecho)
-        return [(nome.strip(), self.safe_int(qtd)) for qtd, nome in monstros]
+        return self._parsed(text)[1]
+
+    def extract_items(self, text: str) -> List[Tuple[str, int]]:
+        return self._parsed(text)[2]
 
     def parse_hunt_data(self, text: str) -> Dict[str, Any]:
-        duracao_min = 0
-        m = re.search(r"Session:\s+(\d{2}):(\d{2})h", text)
+        return self._parsed(text)[0]
+
+    def parse_header(self, data: Buffer) -> Dict[str, Any]:
+        """parse_hunt_data for raw log bytes, decoding only what precedes the monster list.
+
+        Logs whose header misses a field (unusual layouts) are decoded and
+        parsed in full, so no field is lost to the shortcut.
+        """
+        m = _MONSTERS_START_BYTES.search(data)
         if m:
+            found, _ = self._scan_header(self.decode_log(data[:m.start()]))
+            if len(found) == len(_FIELDS):
+                return {field.key: found[field.key] for field in _FIELDS}
+        return self.parse_hunt_data(self.decode_log(data[:]))
+
+    @staticmethod
+    def read_head(path: Union[str, os.PathLike]) -> bytes:
+        with open(path, "rb") as f:
+            return f.read(HEAD_SIZE)
+
+    def session_key(self, head: bytes, path: Union[str, os.PathLike]) -> Optional[SessionKey]:
+        """Date and start/end time of the log's (first) session, from its head (read_head).
+
+        Enough to tell whether a log is already imported without parsing it.
+        Only a session line the byte pattern misses costs a header parse of
+        the file. None for files that are not session logs.
+        """
+        m = _SESSION_KEY_BYTES.search(head)
+        if m:
+            return SessionKey(*(g.decode("ascii") if g else "" for g in m.groups()))
+        if b"Session data:" not in head:
+            return None  # not a session log
+        # Unusual layout (values on the next line...): header parse of the first session
+        with self.open_log(path) as data:
+            info = self.parse_header(data[:self.session_spans(data)[0][1]])
+        if not info["data_inicio"]:
+            return None
+        return SessionKey(info["data_inicio"], info["hora_inicio"], info["hora_fim"])
+
+    @staticmethod
+    def session_spans(data: Buffer) -> List[Tuple[int, int]]:
+        """Byte ranges of the sessions in a log, several for concatenated dumps.
+
+        Each session starts at its "Session data:" header; anything before the
+        first one stays with the first session.
+        """
+        starts = [m.start() for m in _SESSION_START_BYTES.finditer(data)][1:]
+        bounds = [0] + starts + [len(data)]
+        return list(zip(bounds, bounds[1:]))
+
+    @staticmethod
+    @contextmanager
+    def open_log(path: Union[str, os.PathLike]) -> Iterator[Buffer]:
+        """The file's bytes, read in one call, or memory-mapped when large."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+                yield f.read()
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data
+
+    @staticmethod
+    def read_sessions(path: Union[str, os.PathLike]) -> Tuple[int, List[str]]:
+        """File size and the decoded text of each session in the file."""
+        with LogParser.open_log(path) as data:
+            return len(data), [LogParser.decode_log(data[a:b]) for a, b in LogParser.session_spans(data)]
+
+    @staticmethod
+    def decode_log(data: bytes) -> str:
+        # UTF-8 decoding stops at the first invalid byte, so a latin-1 file
+        # costs little more than a single decode
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            text = data.decode("latin-1")
+        # Same newline handling as reading the file in text mode
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    @staticmethod
+    def read_log(path: Union[str, os.PathLike]) -> str:
+        with LogParser.open_log(path) as data:
+            return LogParser.decode_log(data[:])
+
+    def parse_many(self, paths_or_texts: Iterable[Union[str, os.PathLike]],
+                   workers: Optional[int] = None) -> List[ParsedLog]:
+        """Parses many logs, in worker processes when the batch is large enough.
+
+        Items are file paths, or log contents (any str spanning several lines).
+        Results keep the input order; a failing item carries its error message
+        instead of aborting the batch.
+        """
+        items = list(paths_or_texts)
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(items) >= _PARALLEL_MIN_ITEMS:
+            from concurrent.futures import ProcessPoolExecutor  # rarely needed, costly to import
+            chunk = max(1, min(_PARALLEL_CHUNK, len(items) // (workers * 4)))
             try:
-                h, mm = int(m.group(1)), int(m.group(2))
-                duracao_min = h * 60 + mm
+                with ProcessPoolExecutor(max_workers=min(workers, len(items))) as pool:
+                    return list(pool.map(_parse_item, items, chunksize=chunk))
             except Exception:
-                duracao_min = 0
-
-        raw_xp = self.safe_int(self._search(text, r"Raw XP Gain:\s*([\d,.]+)"))
-        xp = self.safe_int(self._search(text, r"^XP Gain:\s*([\d,.]+)", flags=re.MULTILINE))
-        loot = self.safe_int(self._search(text, r"Loot:\s*([-\d,−–]+)"))
-        supplies = self.safe_int(self._search(text, r"Supplies:\s*([-\d,−–]+)"))
-        balance = self.safe_int(self._search(text, r"Balance:\s*([-\d,−–]+)"))
-        damage = self.safe_int(self._search(text, r"Damage:\s*([-\d,−–]+)"))
-        healing = self.safe_int(self._search(text, r"Healing:\s*([-\d,−–]+)"))
-
-        data_inicio = self._search(text, r"From\s+(\d{4}-\d{2}-\d{2}),", default="")
-        hora_inicio = self._search(text, r"From\s+\d{4}-\d{2}-\d{2},\s+(\d{2}:\d{2}:\d{2})", default="")
-        hora_fim = self._search(text, r"to\s+\d{4}-\d{2}-\d{2},\s+(\d{2}:\d{2}:\d{2})", default="")
-
-        return {
-            "duracao_min": duracao_min,
-            "raw_xp_gain": raw_xp,
-            "xp_gain": xp,
-            "loot": loot,
-            "supplies": supplies,
-            "balance": balance,
-            "damage": damage,
-            "healing": healing,
-            "data_inicio": data_inicio,
-            "hora_inicio": hora_inicio,
-            "hora_fim": hora_fim,
-        }
+                pass  # broken pool (frozen app without freeze_support, sandboxed OS...): parsed below
+        return [_parse_item(item, self) for item in items]
+
+
+def _parse_item(item: Union[str, os.PathLike], parser: Optional[LogParser] = None) -> ParsedLog:
+    parser = parser or LogParser()
+    try:
+        if isinstance(item, str) and "\n" in item:
+            text = item
+        else:
+            text = LogParser.read_log(item)
+        info, monsters, items = parser.parse_session(text)
+        return ParsedLog(item, text, info, monsters, items)
+    except Exception as e:
+        return ParsedLog(item, "", {}, [], [], str(e))
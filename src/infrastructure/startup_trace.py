@@ -0,0 +1,54 @@
+"""Cold-start timing, enabled with the HUNT_ANALYZER_TRACE environment variable.
+
+main.py marks each startup phase; once the window is up, the phases and the
+heavy modules already imported are printed, and the total is checked against
+HUNT_ANALYZER_STARTUP_BUDGET_MS (default 1500). With HUNT_ANALYZER_TRACE=exit
+the app closes right after the report and exits with status 1 when over
+budget, so the check can be scripted. Per-module import times are available
+with `python -X importtime main.py`.
+"""
+import os
+import sys
+import time
+from typing import Callable, List, Tuple
+
+# Imported first by main.py: everything is measured from here
+_START = time.perf_counter()
+
+MODE = os.environ.get("HUNT_ANALYZER_TRACE", "")
+ENABLED = bool(MODE)
+BUDGET_MS = float(os.environ.get("HUNT_ANALYZER_STARTUP_BUDGET_MS", "1500"))
+
+# Only needed once a tab or a chart is opened
+HEAVY_MODULES = ("numpy", "matplotlib", "mplcursors", "pandas", "PIL")
+
+_marks: List[Tuple[str, float]] = []
+
+
+def mark(label: str) -> None:
+    if ENABLED:
+        _marks.append((label, time.perf_counter()))
+
+
+def report() -> bool:
+    """Prints the time of each phase; True when the total is within budget."""
+    previous = _START
+    print("Startup trace:")
+    for label, t in _marks:
+        print(f"  {label:<24} {(t - previous) * 1000:8.1f} ms")
+        previous = t
+    total_ms = (previous - _START) * 1000
+    within = total_ms <= BUDGET_MS
+    print(f"  {'total':<24} {total_ms:8.1f} ms (budget {BUDGET_MS:.0f} ms{'' if within else ', EXCEEDED'})")
+    loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+    print(f"  heavy modules loaded: {', '.join(loaded) or 'none'}")
+    return within
+
+
+def finish(close_app: Callable[[], None]) -> None:
+    """Called once the main loop is idle, i.e. the window has been drawn."""
+    mark("first idle")
+    within = report()
+    if MODE == "exit":
+        close_app()
+        sys.exit(0 if within else 1)
@@ -4,40 +4,40 @@ from tkinter import messagebox
 from datetime import datetime, date, timedelta
 from typing import Optional, List
 import os
+import threading
 
-from src.application.interfaces.repository import HuntRepository
+from src.application.interfaces.repository import HuntChanges, HuntRepository
 from src.domain.entities import Hunt
 from src.infrastructure.parser.log_parser import LogParser
 from src.infrastructure.config_repository import ConfigRepository
+from src.application.services.folder_scanner import FolderScanner
+from src.application.services.import_pipeline import ImportPipeline
+from src.infrastructure.folder_watcher import FolderWatcher
+from src.ui.worker import BackgroundWorker
 
 ctk.set_appearance_mode("System")  # Modes: "System" (standard), "Dark", "Light"
 ctk.set_default_color_theme("blue")  # Themes: "blue" (standard), "green", "dark-blue"
 
 class MainApp(ctk.CTk):
+    # How often logs finished in the watched folder are collected for import
+    WATCH_POLL_MS = 2000
+    # Hunts per loot backfill request; the tabs' queries run between requests
+    LOOT_BACKFILL_BATCH = 200
+
     def __init__(self, repository: HuntRepository, parser: LogParser):
         super().__init__()
         self.repo = repository
         self.parser = parser
         self.config = ConfigRepository()
+        # Every repository call from the UI goes through this thread
+        self.worker = BackgroundWorker(self)
         
         self.title("Hunt-Analyzer")
-        
-        # Icon
-        try:
-            # 1. Try .icns for macOS Dock/Window (standard way)
-            if os.path.exists("tibia-analyzer.icns"):
-                self.wm_iconbitmap("tibia-analyzer.icns")
-            
-            # 2. Try .png with iconphoto (Cross-platform and fallback for some macOS contexts)
-            # This often fixes the dock icon when running from source if .icns fails
-            if os.path.exists("tibia-analyzer.png"):
-                icon_img = tk.PhotoImage(file="tibia-analyzer.png")
-                self.wm_iconphoto(True, icon_img)
-        except Exception as e:
-            print(f"Warning: Could not load icon: {e}")
+        # The icon files are several MB to decode: loaded once the window is up
+        self.after(100, self._load_icon)
 
-        # Restore configuration
-        saved_geo = self.repo.get_setting("window_geometry")
+        # Restore configuration; waiting is fine here, the window is not shown yet
+        saved_geo = self.worker.submit(self.repo.get_setting, "window_geometry").result()
         if saved_geo:
             self.geometry(saved_geo)
         else:
@@ -50,21 +50,53 @@ class MainApp(ctk.CTk):
         
         self.log_folder = self.config.get_log_dir()
         self.period_mode = "mes"
+        self.watcher: Optional[FolderWatcher] = None
+        self._closing = threading.Event()  # cancels background imports
+        self._watch_import = None  # (thread, outcome) of the running watcher import
 
         self._build_ui()
         self.after(1000, self.check_auto_import)
+        self.after(1200, self._backfill_loot)
+        self.after(1300, lambda: self.remove_duplicate_hunts(startup=True))
+        self.after(1500, self.tab_inserir.check_pending_import)
+
+    def _load_icon(self):
+        try:
+            # 1. Try .icns for macOS Dock/Window (standard way)
+            if os.path.exists("tibia-analyzer.icns"):
+                self.wm_iconbitmap("tibia-analyzer.icns")
+            
+            # 2. Try .png with iconphoto (Cross-platform and fallback for some macOS contexts)
+            # This often fixes the dock icon when running from source if .icns fails
+            if os.path.exists("tibia-analyzer.png"):
+                icon_img = tk.PhotoImage(file="tibia-analyzer.png")
+                self.wm_iconphoto(True, icon_img)
+        except Exception as e:
+            print(f"Warning: Could not load icon: {e}")
 
     def on_close(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        # Imports stop after their current batch and can be resumed next time
+        self._closing.set()
+        self.tab_inserir.stop_import()
+        if self._watch_import is not None:
+            self._watch_import[0].join()
+        # Pending requests are dropped; with the worker stopped this thread
+        # can use the repository directly
+        self.worker.close()
         try:
             geo = self.geometry()
             self.repo.set_setting("window_geometry", geo)
         except Exception:
             pass
+        self.repo.close()
         self.destroy()
 
     def _build_ui(self):
         # Use CTkTabview for modern look
-        self.tabview = ctk.CTkTabview(self)
+        self.tabview = ctk.CTkTabview(self, command=self._on_tab_change)
         self.tabview.pack(fill="both", expand=True, padx=8, pady=8)
 
         # Create tabs
@@ -74,24 +106,102 @@ class MainApp(ctk.CTk):
 
         # We will create separate classes/frames for each tab to improve SRP
         from src.ui.tab_insert import InsertTab
-        from src.ui.tab_analysis import AnalysisTab
-        from src.ui.tab_hunts import HuntsTab
 
         # Parent is now the specific tab frame within tabview
         self.tab_inserir = InsertTab(self.tabview.tab("Inserir"), self.repo, self.parser, self)
         self.tab_inserir.pack(fill="both", expand=True)
 
-        self.tab_analises = AnalysisTab(self.tabview.tab("Análises"), self.repo, self)
-        self.tab_analises.pack(fill="both", expand=True)
-        
-        self.tab_hunts = HuntsTab(self.tabview.tab("Hunts"), self.repo, self)
-        self.tab_hunts.pack(fill="both", expand=True)
+        # Built when first shown: their modules (numpy, matplotlib) and first
+        # queries stay off the startup path
+        self.tab_analises = None
+        self.tab_hunts = None
+        # Changes not yet applied by a tab that is hidden, by tab name
+        self._pending_changes = {}
+
+    def _on_tab_change(self):
+        name = self.tabview.get()
+        if name == "Análises" and self.tab_analises is None:
+            from src.ui.tab_analysis import AnalysisTab
+            self.tab_analises = AnalysisTab(self.tabview.tab("Análises"), self.repo, self)
+            self.tab_analises.pack(fill="both", expand=True)
+        elif name == "Hunts" and self.tab_hunts is None:
+            from src.ui.tab_hunts import HuntsTab
+            self.tab_hunts = HuntsTab(self.tabview.tab("Hunts"), self.repo, self)
+            self.tab_hunts.pack(fill="both", expand=True)
+        else:
+            tab = self._tabs().get(name)
+            changes = self._pending_changes.pop(name, None)
+            if tab is not None and changes:
+                tab.apply_changes(changes)
+
+    def _tabs(self):
+        return {"Análises": self.tab_analises, "Hunts": self.tab_hunts}
 
     def refresh_all(self):
-        """Called when data changes"""
+        """Called when data changes: passes what changed to the tabs.
+
+        The visible tab updates at once; hidden ones keep the changes until shown.
+        """
         # self.tab_inserir.refresh_combos() # if needed
-        self.tab_analises.refresh_options()
-        self.tab_hunts.refresh_list()
+        changes = self.repo.drain_changes()
+        if not changes:
+            return
+        shown = self.tabview.get()
+        for name, tab in self._tabs().items():
+            if tab is None:
+                continue  # not built yet: loads fresh data when first shown
+            if name == shown:
+                tab.apply_changes(changes)
+            else:
+                self._pending_changes.setdefault(name, HuntChanges()).merge(changes)
+
+    def _backfill_loot(self, filled=0):
+        # Hunts saved before Hunts_Loot existed only have their items in raw_text.
+        # Off the startup path: one batch per worker request until none is left.
+        def done(result):
+            total = filled + result.filled
+            if not result.done:
+                self._backfill_loot(total)
+            elif total:
+                print(f"Loot backfill: {total} hunts")
+                self.refresh_all()
+
+        self.worker.submit(
+            self.repo.backfill_loot, self.parser.extract_items, self.LOOT_BACKFILL_BATCH, 1,
+            on_done=done, on_error=lambda e: print(f"Loot backfill error: {e}"),
+        )
+
+    def remove_duplicate_hunts(self, startup=False):
+        """Offers to delete hunts saved more than once before the content hash
+        existed (Hunts tab button, and at startup when there are any)."""
+        def confirm(count):
+            if not count:
+                if not startup:
+                    messagebox.showinfo("Duplicadas", "Nenhuma hunt duplicada encontrada.")
+                return
+            if not messagebox.askyesno(
+                "Remover duplicadas",
+                f"{count} hunt(s) têm o mesmo log de uma hunt salva antes.\n"
+                "Será mantida a primeira hunt salva de cada log e as demais serão apagadas.\n"
+                "Uma cópia do banco de dados é feita antes. Continuar?",
+            ):
+                return
+            self.worker.submit(
+                self.repo.remove_duplicate_hunts,
+                on_done=done, on_error=lambda e: messagebox.showerror("Erro", str(e)),
+            )
+
+        def done(result):
+            self.refresh_all()
+            resumo = f"Hunts apagadas: {result.removed}"
+            if result.backup_path:
+                resumo += f"\nCópia do banco: {result.backup_path}"
+            messagebox.showinfo("Pronto", resumo)
+
+        self.worker.submit(
+            self.repo.count_duplicate_hunts,
+            on_done=confirm, on_error=lambda e: messagebox.showerror("Erro", str(e)),
+        )
 
     def check_auto_import(self):
         folder = self.config.get_log_dir()
@@ -99,49 +209,74 @@ class MainApp(ctk.CTk):
             return
 
         print(f"Checking for new hunts in {folder}...")
-        # Simple check logic: iterate all files, parse, see if exists
-        # To avoid performance hit, maybe we should only check if 'last_modified' > 'last_check'
-        # But user asked to "check for new hunts".
-        
-        # We can reuse the import logic from TabInsert if possible, or duplicate/extract it.
-        # Let's import the file content checking logic.
-        
-        new_count = 0
-        try:
-            for fname in os.listdir(folder):
-                if not (fname.endswith(".txt") or fname.endswith(".log")): continue
-                fpath = os.path.join(folder, fname)
-                
-                # Parsing every file might be slow if many files. 
-                # Optimization: Check if we already have a hunt with same date/start_time/char?
-                # For now, simplest approach:
-                
-                try:
-                    with open(fpath, "r", encoding="utf-8") as f: content = f.read()
-                except: continue
-                
-                info = self.parser.parse_hunt_data(content)
-                if not info["data_inicio"]: continue
-                
-                # Check existance by Unique constraint (approx)
-                # Ideally Repo should have exists(date, start_time, character)
-                # Doing a lightweight check in memory if list small, or just parse one by one.
-                
-                # To really do "Auto Import" we would need to auto-insert. 
-                # But requirement says "Alert the user if there is new hunts".
-                # It does NOT say "Import them". Just "Alert".
-                
-                # To know if they are "new", we must know if they are in DB.
-                filters = {"date": info["data_inicio"], "start_time": info["hora_inicio"]} 
-                # If char is known, add it.
-                
-                exists = self.repo.get_all(filters)
-                if not exists:
-                    new_count += 1
-            
-            if new_count > 0:
-                messagebox.showinfo("Novas Hunts", f"Encontradas {new_count} hunts novas na pasta configurada!\nVá na aba Inserir para importá-las.")
-                
-        except Exception as e:
-            print(f"Auto-check error: {e}")
+        # Requirement: alert the user about new hunts (importing is done in the Inserir tab).
+        # The scan manifest keeps unchanged files from being opened again.
+        self.worker.submit(
+            FolderScanner(self.repo, self.parser).scan, folder,
+            key="auto_import",
+            on_done=self._on_auto_import_scan,
+            on_error=lambda e: print(f"Auto-check error: {e}"),
+        )
+
+        # Logs written from now on are imported as they appear
+        if self.watcher is None:
+            self.watcher = FolderWatcher(folder)
+            self.watcher.start()
+            print(f"Watching {folder} ({self.watcher.mode})")
+            self.after(self.WATCH_POLL_MS, self._poll_watcher)
+
+    def _poll_watcher(self):
+        if self.watcher is None:
+            return  # closing
+        if self._watch_import is not None and not self._watch_import[0].is_alive():
+            outcome = self._watch_import[1]
+            self._watch_import = None
+            if "error" in outcome:
+                print(f"Auto-import error: {outcome['error']}")
+            else:
+                self._on_new_logs_imported(outcome["result"])
+        # Logs finished meanwhile stay in the watcher until the import running ends
+        if self._watch_import is None:
+            paths = self.watcher.drain()
+            if paths:
+                self._start_watch_import(paths)
+        self.after(self.WATCH_POLL_MS, self._poll_watcher)
+
+    def _start_watch_import(self, paths):
+        outcome = {}  # "result" or "error", set by the thread before it ends
+
+        def run():
+            # Its own thread, as the Inserir tab's imports, so the worker keeps
+            # answering the tabs' queries; the outcome is picked up by _poll_watcher
+            try:
+                outcome["result"] = self._import_new_logs(paths)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                self.repo.release_thread()
+
+        thread = threading.Thread(target=run, name="watch-import", daemon=True)
+        self._watch_import = (thread, outcome)
+        thread.start()
+
+    def _import_new_logs(self, paths):
+        # Runs on the watcher's import thread; sessions already stored are skipped
+        character = self.repo.get_default_character() or "Desconhecido"
+        return ImportPipeline(self.repo, self.parser).run(
+            paths, character, "Desconhecido", resumable=False, cancel=self._closing
+        )
+
+    def _on_new_logs_imported(self, result):
+        print(f"Auto-import: {result.saved} saved, {result.duplicates} already stored, {result.failed} failed")
+        for error in result.errors:
+            print(f"  {error}")
+        if result.saved:
+            self.refresh_all()
+
+    def _on_auto_import_scan(self, result):
+        print(f"Scan: {len(result.new_files)} new, {result.known} known, "
+              f"{result.ignored} ignored, {result.opened} files read")
 
+        new_count = len(result.new_files)
+        if new_count > 0:
+            messagebox.showinfo("Novas Hunts", f"Encontradas {new_count} hunts novas na pasta configurada!\nVá na aba Inserir para importá-las.")
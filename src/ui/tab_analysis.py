@@ -2,20 +2,18 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import date, datetime, timedelta
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.dates as mdates
-import pandas as pd
-import mplcursors
 
 from src.application.interfaces.repository import HuntRepository
+from src.application.services.hunt_analytics import ANALYSIS_FIELDS, analyze
 
 class AnalysisTab(ctk.CTkFrame):
     def __init__(self, parent, repo: HuntRepository, main_app):
         super().__init__(parent)
         self.repo = repo
         self.main_app = main_app
+        self.worker = main_app.worker
         self.period_mode = "mes"
+        self._filters = {}  # of the analysis shown
         self._build()
 
     def _build(self):
@@ -77,14 +75,27 @@ class AnalysisTab(ctk.CTkFrame):
         self.txt_analises = ctk.CTkTextbox(frm, width=800, height=200)
         self.txt_analises.pack(fill="both", expand=True, padx=8, pady=8)
         
-        # Init
+        # Init: refresh_options runs the first analysis once the options load
+        self.set_period("mes", update=False)
         self.refresh_options()
-        self.set_period("mes")
 
-    def refresh_options(self):
-        chars = self.repo.list_characters()
-        default = self.repo.get_default_character()
-        
+    def refresh_options(self, update=True):
+        # With update=False the analysis is recomputed only if the selected character goes away
+        self.worker.submit(
+            lambda: (self.repo.list_characters(), self.repo.get_default_character()),
+            key="analysis.options", on_done=lambda result: self._apply_options(result, update),
+        )
+
+    def apply_changes(self, changes):
+        """Recomputes after a write (HuntChanges), if it touched the period and character shown."""
+        touched = changes.touches(self._filters)
+        if changes.lists:
+            self.refresh_options(update=touched)
+        elif touched:
+            self.update_analysis()
+
+    def _apply_options(self, result, update=True):
+        chars, default = result
         vals = [default] + [c for c in chars if c != default] if default in chars else chars
         vals += ["Todos"]
         
@@ -96,9 +107,10 @@ class AnalysisTab(ctk.CTkFrame):
         else:
             self.combo_personagem.set(default if default else (vals[0] if vals else ""))
             
-        self.update_analysis()
+        if update or self.combo_personagem.get() != curr:
+            self.update_analysis()
 
-    def set_period(self, mode):
+    def set_period(self, mode, update=True):
         # ... logic to fill date entries ...
         hoje = date.today()
         ini, fim, label = None, None, ""
@@ -127,7 +139,8 @@ class AnalysisTab(ctk.CTkFrame):
             self.entry_dt_fim.insert(0, fim.strftime("%d-%m-%Y"))
             self.lbl_periodo.configure(text=f"Período: {ini.strftime('%d-%m-%Y')} a {fim.strftime('%d-%m-%Y')} {label}")
         
-        self.update_analysis()
+        if update:
+            self.update_analysis()
 
     def _get_dates(self):
         # On some systems, CTkEntry.get() might return None if empty? No, usually ""
@@ -155,131 +168,86 @@ class AnalysisTab(ctk.CTkFrame):
         if char and char != "Todos": filters["character"] = char
         if d_ini: filters["date_start"] = d_ini
         if d_fim: filters["date_end"] = d_fim
+        self._filters = filters
 
-        raw_hunts = self.repo.get_all(filters)
-        
-        if not raw_hunts:
+        def compute():
+            r = analyze(self.repo.get_columns(filters, ANALYSIS_FIELDS))
+            return r, (self.repo.get_monster_aggregates(filters) if r.hunts else [])
+
+        # A newer period/character selection supersedes this one
+        self.worker.submit(
+            compute, key="analysis.update",
+            on_done=lambda result: self._show_analysis(char, d_ini, d_fim, *result),
+            on_error=self._show_analysis_error,
+        )
+
+    def _show_analysis_error(self, e):
+        self.txt_analises.delete("1.0", tk.END)
+        self.txt_analises.insert(tk.END, f"Erro ao carregar análise: {e}\n")
+
+    def _show_analysis(self, char, d_ini, d_fim, r, monster_stats):
+        if not r.hunts:
             # Clear everything
             for v in self.metric_vars.values(): v.set("-")
             self.txt_analises.delete("1.0", tk.END)
             return
 
-        # DATA HANDLING WITH PANDAS (Enhancement)
-        df = pd.DataFrame([h.__dict__ for h in raw_hunts])
-        
-        # Ensure numerics
-        numeric_cols = ["duration_min", "xp_gain", "raw_xp_gain", "loot", "supplies", "balance", "damage", "healing"]
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-            
-        total_min = df["duration_min"].sum()
-        horas = total_min / 60.0
-        
-        total_xp = df["xp_gain"].sum()
-        total_raw = df["raw_xp_gain"].sum()
-        total_balance = df["balance"].sum()
-        total_kills = 0 # No monster detail in main dict usually, but check if we need complex aggreg
+        total_min = r.total_min
         
         # Metrics
-        self.metric_vars["Hunts"].set(self._fmt(len(df)))
+        self.metric_vars["Hunts"].set(self._fmt(r.hunts))
         self.metric_vars["Horas"].set(f"{int(total_min//60):02d}h{int(total_min%60):02d}m")
-        self.metric_vars["XP total"].set(self._fmt(total_xp))
-        self.metric_vars["XP/h"].set(self._fmt(total_xp/horas if horas>0 else 0))
-        self.metric_vars["Raw XP"].set(self._fmt(total_raw))
-        self.metric_vars["Raw XP/h"].set(self._fmt(total_raw/horas if horas>0 else 0))
-        self.metric_vars["Balance"].set(self._fmt(total_balance))
-        self.metric_vars["Balance/h"].set(self._fmt(total_balance/horas if horas>0 else 0))
-        
-        # Determine top creature if possible (need monster logic) 
-        # For now, skip monster detail or iterate if needed
+        self.metric_vars["XP total"].set(self._fmt(r.total_xp))
+        self.metric_vars["XP/h"].set(self._fmt(r.xp_h))
+        self.metric_vars["Raw XP"].set(self._fmt(r.total_raw_xp))
+        self.metric_vars["Raw XP/h"].set(self._fmt(r.raw_xp_h))
+        self.metric_vars["Balance"].set(self._fmt(r.total_balance))
+        self.metric_vars["Balance/h"].set(self._fmt(r.balance_h))
         
         # Text summary
         self.txt_analises.delete("1.0", tk.END)
         self.txt_analises.insert(tk.END, "===== RESUMO GERAL =====\n")
         self.txt_analises.insert(tk.END, f"Personagem: {char}\n")
         self.txt_analises.insert(tk.END, f"Período: {d_ini} a {d_fim}\n")
-        self.txt_analises.insert(tk.END, f"Total de Hunts: {len(df)}\n\n")
+        self.txt_analises.insert(tk.END, f"Total de Hunts: {r.hunts}\n\n")
 
         # --- RAW XP ANALYSIS ---
         self.txt_analises.insert(tk.END, "===== ANÁLISE DE RAW XP =====\n")
-        self.txt_analises.insert(tk.END, f"Total Raw XP:     {self._fmt(total_raw)}\n")
-        
-        avg_raw = df['raw_xp_gain'].mean()
-        self.txt_analises.insert(tk.END, f"Média Raw XP/hunt: {self._fmt(avg_raw)}\n")
-        
-        # Avoid div zero for calculation of rates per hunt
-        # Calculate 'raw_xph' column for stats
-        df['hours'] = df['duration_min'] / 60.0
-        df['raw_xph'] = df.apply(lambda x: x['raw_xp_gain'] / x['hours'] if x['hours'] > 0 else 0, axis=1)
-        
-        avg_raw_xph = df['raw_xph'].mean()
-        self.txt_analises.insert(tk.END, f"Média Raw XP/h:    {self._fmt(avg_raw_xph)}\n")
-        
-        max_raw_xph_idx = df['raw_xph'].idxmax()
-        max_raw_hunt = df.loc[max_raw_xph_idx]
-        self.txt_analises.insert(tk.END, f"Melhor Raw XP/h:   {self._fmt(max_raw_hunt['raw_xph'])} ({max_raw_hunt['date']})\n\n")
+        self.txt_analises.insert(tk.END, f"Total Raw XP:     {self._fmt(r.total_raw_xp)}\n")
+        self.txt_analises.insert(tk.END, f"Média Raw XP/hunt: {self._fmt(r.avg_raw_xp)}\n")
+        self.txt_analises.insert(tk.END, f"Média Raw XP/h:    {self._fmt(r.avg_raw_xp_h)}\n")
+        best = r.best_raw_xp_h
+        self.txt_analises.insert(tk.END, f"Melhor Raw XP/h:   {self._fmt(best.value)} ({best.date})\n\n")
 
         # --- BALANCE ANALYSIS ---
         self.txt_analises.insert(tk.END, "===== ANÁLISE DE BALANCE =====\n")
-        self.txt_analises.insert(tk.END, f"Total Balance:    {self._fmt(total_balance)}\n")
-        self.txt_analises.insert(tk.END, f"Total Loot:       {self._fmt(df['loot'].sum())}\n")
-        self.txt_analises.insert(tk.END, f"Total Supplies:   {self._fmt(df['supplies'].sum())}\n")
-        
-        avg_bal = df['balance'].mean()
-        self.txt_analises.insert(tk.END, f"Média Profit/hunt: {self._fmt(avg_bal)}\n")
+        self.txt_analises.insert(tk.END, f"Total Balance:    {self._fmt(r.total_balance)}\n")
+        self.txt_analises.insert(tk.END, f"Total Loot:       {self._fmt(r.total_loot)}\n")
+        self.txt_analises.insert(tk.END, f"Total Supplies:   {self._fmt(r.total_supplies)}\n")
+        self.txt_analises.insert(tk.END, f"Média Profit/hunt: {self._fmt(r.avg_balance)}\n")
+        self.txt_analises.insert(tk.END, f"Média Profit/h:    {self._fmt(r.avg_balance_h)}\n")
+        best = r.best_balance
+        self.txt_analises.insert(tk.END, f"Melhor Profit (total): {self._fmt(best.value)} ({best.date})\n")
+        best = r.best_balance_h
+        self.txt_analises.insert(tk.END, f"Melhor Profit/h:       {self._fmt(best.value)} ({best.date})\n\n")
         
-        df['bal_h'] = df.apply(lambda x: x['balance'] / x['hours'] if x['hours'] > 0 else 0, axis=1)
-        avg_bal_h = df['bal_h'].mean()
-        self.txt_analises.insert(tk.END, f"Média Profit/h:    {self._fmt(avg_bal_h)}\n")
-
-     
-
-        max_profit_idx = df['balance'].idxmax()
-        best_profit = df.loc[max_profit_idx]
-        self.txt_analises.insert(tk.END, f"Melhor Profit (total): {self._fmt(best_profit['balance'])} ({best_profit['date']})\n")
-        
-        max_bal_h_idx = df['bal_h'].idxmax()
-        best_bal_h = df.loc[max_bal_h_idx]
-        self.txt_analises.insert(tk.END, f"Melhor Profit/h:       {self._fmt(best_bal_h['bal_h'])} ({best_bal_h['date']})\n\n")
-        
-        if "damage" in df.columns:
-            self.txt_analises.insert(tk.END, f"Dano Total:     {self._fmt(df['damage'].sum())}\n")
+        self.txt_analises.insert(tk.END, f"Dano Total:     {self._fmt(r.total_damage)}\n")
 
         # --- MONSTER ANALYSIS ---
         self.txt_analises.insert(tk.END, "\n===== ANÁLISE DE MONSTROS (Top 4) =====\n")
-        try:
-            monster_stats = self.repo.get_monster_aggregates(filters)
-            if monster_stats:
-                # Show top 4
-                for rank, (name, count) in enumerate(monster_stats[:4], 1):
-                    self.txt_analises.insert(tk.END, f"{rank}. {name}: {self._fmt(count)}\n")
-            else:
-                self.txt_analises.insert(tk.END, "Nenhum monstro registrado no período.\n")
-        except Exception as e:
-            self.txt_analises.insert(tk.END, f"Erro ao carregar monstros: {e}\n")
+        if monster_stats:
+            # Show top 4
+            for rank, (name, count) in enumerate(monster_stats[:4], 1):
+                self.txt_analises.insert(tk.END, f"{rank}. {name}: {self._fmt(count)}\n")
+        else:
+            self.txt_analises.insert(tk.END, "Nenhum monstro registrado no período.\n")
 
         # --- PROGRESS ANALYSIS ---
         self.txt_analises.insert(tk.END, "\n===== PROGRESSO (Evolução) =====\n")
-        if len(df) >= 4:
-            # Sort by date just to be sure
-            if 'date_obj' not in df.columns:
-                df['date_obj'] = pd.to_datetime(df['date'])
-            df_sorted = df.sort_values('date_obj')
-            
-            # Helper for growth
-            def calc_growth(col_name):
-                # Take simple avg of first 3 vs last 3
-                first_n = df_sorted.head(3)[col_name].mean()
-                last_n = df_sorted.tail(3)[col_name].mean()
-                if first_n == 0: return 0.0
-                return ((last_n - first_n) / first_n) * 100
-
-            growth_raw = calc_growth('raw_xph')
-            growth_bal = calc_growth('bal_h')
-            
+        if r.growth_raw_xp_h is not None:
             self.txt_analises.insert(tk.END, f"Comparação (Primeiras 3 vs Últimas 3 hunts no período):\n")
-            self.txt_analises.insert(tk.END, f"Crescimento Raw XP/h: {growth_raw:+.2f}%\n")
-            self.txt_analises.insert(tk.END, f"Crescimento Profit/h: {growth_bal:+.2f}%\n")
+            self.txt_analises.insert(tk.END, f"Crescimento Raw XP/h: {r.growth_raw_xp_h:+.2f}%\n")
+            self.txt_analises.insert(tk.END, f"Crescimento Profit/h: {r.growth_balance_h:+.2f}%\n")
         else:
             self.txt_analises.insert(tk.END, "Dados insuficientes para cálculo de progresso (mínimo 4 hunts).\n")
 
@@ -291,31 +259,31 @@ class AnalysisTab(ctk.CTkFrame):
         if d_ini: filters["date_start"] = d_ini
         if d_fim: filters["date_end"] = d_fim
         
-        raw_hunts = self.repo.get_all(filters)
-        if not raw_hunts:
+        self.worker.submit(
+            self.repo.get_columns, filters, ("date", "duration_min", "raw_xp_gain", "balance", "supplies"),
+            key="analysis.chart", on_done=self._open_chart,
+        )
+
+    def _open_chart(self, cols):
+        if not len(cols["date"]):
              messagebox.showinfo("Sem dados", "Não há hunts no período.")
              return
 
-        # PANDAS CHARTING
-        df = pd.DataFrame([h.__dict__ for h in raw_hunts])
-        
-        # Ensure numerics
-        numeric_cols = ["duration_min", "raw_xp_gain", "balance", "supplies"]
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-
-        df['date_obj'] = pd.to_datetime(df['date'])
-        df = df.sort_values('date_obj')
-        
-        dates = df['date_obj']
-        hours = df['duration_min'] / 60.0
+        # Imported on first use: matplotlib is the slowest import of the app
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        import matplotlib.dates as mdates
+        import mplcursors
+
+        # Already sorted by date
+        dates = cols["date"]
+        hours = cols["duration_min"] / 60.0
         # Avoid zero division
-        hours = hours.replace(0, 1) # simple fallback
+        hours[hours == 0] = 1 # simple fallback
         
-        raw_xph = df['raw_xp_gain'] / hours
-        balanceh = df['balance'] / hours
-        supplyh = df['supplies'] / hours
+        raw_xph = cols["raw_xp_gain"] / hours
+        balanceh = cols["balance"] / hours
+        supplyh = cols["supplies"] / hours
 
         win = ctk.CTkToplevel(self)
         win.title("Gráfico XP/Balance/Supply")
@@ -1,18 +1,203 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+from collections import OrderedDict
 from datetime import datetime
+from typing import Dict, List, Optional
 import os
 import re
 
-from src.application.interfaces.repository import HuntRepository
+from src.application.interfaces.repository import DEFAULT_ORDER, HuntOrder, HuntPage, HuntRepository, PageKey
 from src.domain.entities import Hunt
+from src.ui.virtual_tree import RowSource, VirtualTreeview
+
+class HuntRowSource(RowSource):
+    """Hunts of the list, fetched a page at a time as they come into view.
+
+    Pages are read with keyset paging (get_page), so jumping deep into the
+    list needs the after_key of the page: it is known once the page before
+    has been loaded, or for every page after get_page_keys. The most recently
+    shown pages are kept, and each row is formatted once, the first time it
+    is drawn. Responses of a list that has been reset since are dropped.
+    """
+
+    MAX_PAGES = 64        # pages kept in memory
+    MAX_IN_FLIGHT = 2     # page requests queued at the worker
+
+    def __init__(self, repo: HuntRepository, worker, page_size: int, on_loaded):
+        self.repo = repo
+        self.worker = worker
+        self.page_size = page_size
+        self.on_loaded = on_loaded    # called on the Tk thread when rows arrive
+        self.on_error = None
+        self.filters = {}
+        self.order: HuntOrder = DEFAULT_ORDER
+        self.total = 0
+        self._gen = 0                 # bumped on reset
+        self._pages: "OrderedDict[int, list]" = OrderedDict()  # page -> [hunts, formatted values]
+        self._after: Dict[int, Optional[PageKey]] = {0: None}  # page -> its get_page after_key
+        self._requested: set = set()
+
+    @property
+    def generation(self) -> int:
+        return self._gen
+
+    def __len__(self) -> int:
+        return self.total
+
+    def reset(
+        self, filters: dict, order: HuntOrder, total: int, first_page: HuntPage, keep_keys: bool = False
+    ) -> None:
+        """New list (or the same one reread); keep_keys keeps the page keys until set_keys."""
+        self._gen += 1
+        self.filters = filters
+        self.order = order
+        self.total = total
+        self._pages.clear()
+        self._requested.clear()
+        if not keep_keys:
+            self._after = {0: None}
+        self._store(0, first_page)
+
+    def set_keys(self, generation: int, keys: List[PageKey]) -> None:
+        """Page keys from get_page_keys, requested for the list of that generation."""
+        if generation != self._gen:
+            return
+        after = {0: None}
+        after.update((i + 1, k) for i, k in enumerate(keys))
+        # Pages read with keys that are out of date begin at the wrong row
+        for page in [p for p in self._pages if self._after.get(p) != after.get(p)]:
+            del self._pages[page]
+        self._after = after
+
+    def values(self, index: int) -> Optional[tuple]:
+        entry = self._entry(index)
+        if entry is None:
+            return None
+        hunts, formatted = entry
+        offset = index % self.page_size
+        if formatted[offset] is None:
+            formatted[offset] = HuntsTab._row_values(hunts[offset])
+        return formatted[offset]
+
+    def key(self, index: int) -> Optional[int]:
+        entry = self._entry(index)
+        return entry[0][index % self.page_size].id if entry is not None else None
+
+    def prefetch(self, first: int, last: int) -> None:
+        for page in range(first // self.page_size, (max(first, last - 1)) // self.page_size + 1):
+            if len(self._requested) >= self.MAX_IN_FLIGHT:
+                break
+            if page in self._pages or page in self._requested or page not in self._after:
+                continue  # without its key, waits for the page before or for set_keys
+            self._requested.add(page)
+            self.worker.submit(
+                self.repo.get_page, self.filters, self._after[page], self.page_size, self.order,
+                on_done=lambda result, p=page, g=self._gen: self._on_page(g, p, result),
+                on_error=lambda e, p=page, g=self._gen: self._on_page_error(g, p, e),
+            )
+
+    def keys(self, first: int, last: int, done) -> None:
+        first_page, last_page = first // self.page_size, (last - 1) // self.page_size
+        missing = [p for p in range(first_page, last_page + 1) if p not in self._pages]
+        if not missing:
+            done([self.key(i) for i in range(first, last)])
+            return
+        known = {p: self._after[p] for p in range(missing[0] + 1) if p in self._after}
+        generation = self._gen
+        filters, order = self.filters, self.order
+
+        def load() -> Dict[int, List[int]]:
+            # Worker thread: walks from the nearest known key to the last missing page
+            start = max(known)
+            after = known[start]
+            ids = {}
+            for page in range(start, last_page + 1):
+                hunt_page = self.repo.get_page(filters, after, self.page_size, order)
+                ids[page] = [h.id for h in hunt_page.hunts]
+                after = hunt_page.next_key
+                if after is None:
+                    break
+            return ids
+
+        def loaded(ids: Dict[int, List[int]]) -> None:
+            if generation != self._gen:
+                return
+            for page, entry in self._pages.items():
+                ids.setdefault(page, [h.id for h in entry[0]])
+            size = self.page_size
+            done([ids[i // size][i % size] for i in range(first, last)
+                  if i // size in ids and i % size < len(ids[i // size])])
+
+        self.worker.submit(load, on_done=loaded, on_error=lambda e: self._on_page_error(generation, None, e))
+
+    def loaded_hunts(self, ids) -> Dict[int, Hunt]:
+        """The hunts among ids that are in memory, by id."""
+        return {h.id: h for hunts, _ in self._pages.values() for h in hunts if h.id in ids}
+
+    def replace_rows(self, hunts: Dict[int, Hunt]) -> None:
+        """Swaps rows in memory for their new version (same place in the list)."""
+        for page_hunts, formatted in self._pages.values():
+            for i, h in enumerate(page_hunts):
+                if h.id in hunts:
+                    page_hunts[i] = hunts[h.id]
+                    formatted[i] = None  # formatted again when drawn
+
+    def _entry(self, index: int) -> Optional[list]:
+        page = index // self.page_size
+        entry = self._pages.get(page)
+        if entry is not None:
+            self._pages.move_to_end(page)
+            if index % self.page_size >= len(entry[0]):
+                return None  # the list shrank since the count
+        return entry
+
+    def _store(self, page: int, hunt_page: HuntPage) -> None:
+        self._pages[page] = [hunt_page.hunts, [None] * len(hunt_page.hunts)]
+        self._pages.move_to_end(page)
+        if hunt_page.next_key is not None:
+            self._after.setdefault(page + 1, hunt_page.next_key)
+        while len(self._pages) > self.MAX_PAGES:
+            self._pages.popitem(last=False)
+
+    def _on_page(self, generation: int, page: int, hunt_page: HuntPage) -> None:
+        if generation != self._gen:
+            return
+        self._requested.discard(page)
+        self._store(page, hunt_page)
+        self.on_loaded()
+
+    def _on_page_error(self, generation: int, page: Optional[int], e: BaseException) -> None:
+        if generation != self._gen:
+            return
+        self._requested.discard(page)
+        if self.on_error:
+            self.on_error(e)
+
 
 class HuntsTab(ctk.CTkFrame):
+    PAGE_SIZE = 200
+    # Columns whose heading sorts the list (in SQL), by repository sort column
+    SORT_BY = {
+        "id": "id", "data": "date", "inicio": "date", "duracao": "duration_min",
+        "xp": "xp_gain", "loot": "loot", "supplies": "supplies", "balance": "balance",
+    }
+    # Hunt fields behind each sort column, to tell whether an edit moves a row
+    SORT_FIELDS = {
+        "date": ("date", "start_time"), "id": (), "duration_min": ("duration_min",),
+        "xp_gain": ("xp_gain",), "loot": ("loot",), "supplies": ("supplies",), "balance": ("balance",),
+    }
+
     def __init__(self, parent, repo: HuntRepository, main_app):
         super().__init__(parent)
         self.repo = repo
         self.main_app = main_app
+        self.worker = main_app.worker
+        self._filters = None        # filters of the list shown, None before the first load
+        self._order = DEFAULT_ORDER  # (sort column, descending) of the list shown
+        self._sort_column = "data"   # heading showing the order
+        self.source = HuntRowSource(repo, self.worker, self.PAGE_SIZE, on_loaded=lambda: self.view.refresh())
+        self.source.on_error = self._on_page_error
         self._build()
 
     def _build(self):
@@ -30,18 +215,22 @@ class HuntsTab(ctk.CTkFrame):
         ctk.CTkButton(filt, text="Atualizar", width=100, command=self.refresh_list).pack(side="left", padx=6)
 
         # Treeview (Keep ttk for now as CTK has no native table)
-        # We need a style wrapper for dark mode treeview usually, but standard works for now.
+        # Only the rows on screen exist as items; they are refilled as the list scrolls
         cols = ("id","data","inicio","fim","duracao","personagem","local","xp","loot","supplies","pagamento","balance")
-        self.tree = ttk.Treeview(frm, columns=cols, show="headings", height=18, selectmode="extended")
-        
-        for c, w in zip(cols, (60,90,80,80,80,130,180,90,90,90,90,90)):
-            self.tree.heading(c, text=c.upper())
-            self.tree.column(c, width=w, anchor="center")
-            
-        self.tree.pack(fill="both", expand=True, padx=8, pady=6)
+        tree_box = ctk.CTkFrame(frm)
+        tree_box.pack(fill="both", expand=True, padx=8, pady=6)
+        self.view = VirtualTreeview(tree_box, self.source, cols, (60,90,80,80,80,130,180,90,90,90,90,90))
+        for c in self.SORT_BY:
+            self.view.tree.heading(c, command=lambda c=c: self.sort_by(c))
+        self._show_sort()
+        self.view.on_select = self._update_count
+        self.view.pack(fill="both", expand=True)
+
+        self.lbl_count = ctk.CTkLabel(frm, text="")
+        self.lbl_count.pack(anchor="w", padx=8)
         
         # Double click -> Edit
-        self.tree.bind("<Double-1>", self.edit_selected_hunt)
+        self.view.tree.bind("<Double-1>", self.edit_selected_hunt)
 
         # Actions
         actions = ctk.CTkFrame(frm)
@@ -49,13 +238,53 @@ class HuntsTab(ctk.CTkFrame):
         ctk.CTkButton(actions, text="Editar", command=self.edit_selected_hunt).pack(side="left", padx=4)
         ctk.CTkButton(actions, text="Exportar selecionadas…", command=self.export_selected_hunts).pack(side="left", padx=4)
         ctk.CTkButton(actions, text="Apagar selecionadas", fg_color="red", hover_color="darkred", command=self.delete_selected_hunts).pack(side="left", padx=4)
+        ctk.CTkButton(actions, text="Remover duplicadas…", command=self.main_app.remove_duplicate_hunts).pack(side="right", padx=4)
         
         self.refresh_list()
 
-    def refresh_list(self):
-        # Refresh combo using repo
-        chars = self.repo.list_characters()
-        default = self.repo.get_default_character()
+    def refresh_list(self, reload=True):
+        # Refresh combo using repo; with reload=False the list is reread only if the filters change
+        self.worker.submit(
+            lambda: (self.repo.list_characters(), self.repo.get_default_character()),
+            key="hunts.options", on_done=lambda result: self._apply_options(result, reload),
+            on_error=self._on_page_error,
+        )
+
+    def apply_changes(self, changes):
+        """Updates the list after a write (HuntChanges from the repository)."""
+        touched = self._filters is not None and changes.touches(self._filters)
+        if touched and not (changes.inserted or changes.deleted or changes.everything):
+            # Edits only: the rows can be swapped in place if they keep their place
+            touched = not self._update_rows(changes.updated)
+        if touched or changes.lists:
+            self.refresh_list(reload=touched)
+
+    def _update_rows(self, ids):
+        """Rereads edited rows into the list; False when the whole list must be reread."""
+        loaded = self.source.loaded_hunts(ids)
+        if len(loaded) < len(ids):
+            return False  # rows not in memory may have joined the list, or moved in it
+        filters = dict(self._filters, ids=tuple(sorted(ids)))
+        generation = self.source.generation
+
+        def done(hunts):
+            if generation != self.source.generation:
+                return  # reread since
+            current = {h.id: h for h in hunts}
+            fields = self.SORT_FIELDS[self.source.order[0]]
+            for hid, old in loaded.items():
+                new = current.get(hid)
+                if new is None or any(getattr(new, f) != getattr(old, f) for f in fields):
+                    self.refresh_list()  # left the filter or moved in the order
+                    return
+            self.source.replace_rows(current)
+            self.view.refresh()
+
+        self.worker.submit(self.repo.get_all, filters, key="hunts.rows", on_done=done, on_error=self._on_page_error)
+        return True
+
+    def _apply_options(self, result, reload=True):
+        chars, default = result
         
         # Keep current selection if valid
         curr = self.combo_personagem_list.get()
@@ -76,35 +305,85 @@ class HuntsTab(ctk.CTkFrame):
             filters["character"] = f_char
         if f_loc:
             filters["location_like"] = f_loc
-            
-        hunts = self.repo.get_all(filters)
+
+        # Count and first page first, so the list shows up at once; the page
+        # keys (a pass over the whole list) follow, for jumps deep into it
+        order = self._order
+        same = filters == self._filters and order == self.source.order
+        if same and not reload:
+            return
+        self._filters = filters
+        selected = tuple(sorted(self.view.selected))
+
+        def load():
+            # Selected hunts still in the list stay selected
+            kept = {h.id for h in self.repo.get_all(dict(filters, ids=selected))} if selected else set()
+            return self.repo.count(filters), self.repo.get_page(filters, None, self.PAGE_SIZE, order), kept
+
+        self.worker.submit(
+            load, key="hunts.page", on_done=lambda result: self._show_list(filters, order, result, same, selected),
+            on_error=self._on_page_error,
+        )
+
+    def _show_list(self, filters, order, result, same, selected):
+        total, page, kept = result
+        self.source.reset(filters, order, total, page, keep_keys=same)
+        self.view.selected.difference_update(set(selected) - kept)
+        self.view.refresh(keep_position=same)
+        self._update_count()
+        self.worker.submit(
+            self.repo.get_page_keys, filters, self.PAGE_SIZE, order,
+            key="hunts.keys", on_done=lambda keys, g=self.source.generation: self._set_keys(g, keys),
+            on_error=self._on_page_error,
+        )
+
+    def sort_by(self, column):
+        """Heading click: sorts by the column, or reverses the order if already sorted by it."""
+        if column == self._sort_column:
+            self._order = (self._order[0], not self._order[1])
+        else:
+            self._order = (self.SORT_BY[column], True)  # newest / largest first
+        self._sort_column = column
+        self._show_sort()
+        self.refresh_list()
+
+    def _show_sort(self):
+        for c in self.SORT_BY:
+            arrow = (" ▼" if self._order[1] else " ▲") if c == self._sort_column else ""
+            self.view.tree.heading(c, text=c.upper() + arrow)
+
+    def _set_keys(self, generation, keys):
+        self.source.set_keys(generation, keys)
+        self.view.refresh()
+
+    def _update_count(self):
+        text = f"{self.source.total} hunts"
+        if self.view.selected:
+            text += f" ({len(self.view.selected)} selecionadas)"
+        self.lbl_count.configure(text=text)
+
+    def _on_page_error(self, e):
+        self.lbl_count.configure(text=f"Erro ao carregar hunts: {e}")
+
+    @staticmethod
+    def _row_values(h: Hunt) -> tuple:
+        # Format display
+        hh = int(h.duration_min // 60)
+        mm = int(h.duration_min % 60)
+        dur = f"{hh:02d}:{mm:02d}h"
         
-        # Populate Tree
-        self.tree.delete(*self.tree.get_children())
-        for h in hunts:
-            # Format display
-            hh = int(h.duration_min // 60)
-            mm = int(h.duration_min % 60)
-            dur = f"{hh:02d}:{mm:02d}h"
-            
-            data_fmt = h.date
-            try:
-                data_fmt = datetime.strptime(h.date, "%Y-%m-%d").strftime("%d-%m-%Y")
-            except: pass
-            
-            self.tree.insert("", "end", values=(
-                h.id, data_fmt, h.start_time, h.end_time, dur, h.character, h.location,
-                h.xp_gain, h.loot, h.supplies, h.payment, h.balance
-            ))
+        data_fmt = h.date
+        try:
+            data_fmt = datetime.strptime(h.date, "%Y-%m-%d").strftime("%d-%m-%Y")
+        except: pass
+        
+        return (
+            h.id, data_fmt, h.start_time, h.end_time, dur, h.character, h.location,
+            h.xp_gain, h.loot, h.supplies, h.payment, h.balance
+        )
 
     def _get_selected_ids(self):
-        sels = self.tree.selection()
-        ids = []
-        for s in sels:
-            vals = self.tree.item(s, "values")
-            if vals:
-                ids.append(int(vals[0]))
-        return ids
+        return sorted(self.view.selected)
 
     def edit_selected_hunt(self, event=None):
         # Debounce/Prevent accidental double firing if window is already opening
@@ -112,11 +391,9 @@ class HuntsTab(ctk.CTkFrame):
             return "break"
 
         if event:
-            try:
-                item = self.tree.identify_row(event.y)
-                if item:
-                    self.tree.selection_set(item)
-            except: pass
+            index = self.view.index_at(event.y)
+            if index is not None:
+                self.view.select_only(index)
 
         ids = self._get_selected_ids()
         if not ids:
@@ -129,12 +406,10 @@ class HuntsTab(ctk.CTkFrame):
             if event: return "break"
             return
             
-        hunt = self.repo.get_by_id(ids[0])
-        if not hunt: 
-            if event: return "break"
-            return
-        
-        self._open_edit_window(hunt)
+        self.worker.submit(
+            self.repo.get_by_id, ids[0],
+            key="hunts.edit", on_done=lambda hunt: hunt and self._open_edit_window(hunt),
+        )
         if event:
             return "break"
 
@@ -169,13 +444,15 @@ class HuntsTab(ctk.CTkFrame):
                 win.destroy()
                 return
 
-            try:
-                self.repo.update_many(ids, updates)
+            def done(_):
                 self.main_app.refresh_all()
                 win.destroy()
                 messagebox.showinfo("Sucesso", "Hunts atualizadas.")
-            except Exception as e:
-                messagebox.showerror("Erro", str(e))
+
+            self.worker.submit(
+                self.repo.update_many, ids, updates,
+                on_done=done, on_error=lambda e: messagebox.showerror("Erro", str(e)),
+            )
 
         win.bind("<Return>", apply_changes)
         ctk.CTkButton(win, text="Aplicar", command=apply_changes).grid(row=2, column=0, columnspan=2, pady=10)
@@ -262,13 +539,19 @@ class HuntsTab(ctk.CTkFrame):
                 hunt.balance = int(vals["balance"] or 0)
                 hunt.damage = int(vals["damage"] or 0)
                 hunt.healing = int(vals["healing"] or 0)
-                
-                self.repo.update(hunt)
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
+                return
+
+            def done(_):
                 self.main_app.refresh_all()
                 win.destroy()
                 # messagebox.showinfo("Sucesso", "Hunt atualizada!")  # Removed for faster flow
-            except Exception as e:
-                messagebox.showerror("Erro", str(e))
+
+            self.worker.submit(
+                self.repo.update, hunt,
+                on_done=done, on_error=lambda e: messagebox.showerror("Erro", str(e)),
+            )
 
         win.bind("<Return>", lambda e: save_changes())
         ctk.CTkButton(win, text="Salvar alterações", command=save_changes).grid(row=len(labels), column=0, columnspan=2, pady=10)
@@ -279,9 +562,14 @@ class HuntsTab(ctk.CTkFrame):
         if not messagebox.askyesno("Confirmar", f"Apagar {len(ids)} hunts?"):
             return
         
-        self.repo.delete_many(ids)
-        self.main_app.refresh_all()
-        messagebox.showinfo("Pronto", "Hunts apagadas.")
+        def done(_):
+            self.main_app.refresh_all()
+            messagebox.showinfo("Pronto", "Hunts apagadas.")
+
+        self.worker.submit(
+            self.repo.delete_many, ids,
+            on_done=done, on_error=lambda e: messagebox.showerror("Erro", str(e)),
+        )
 
     def export_selected_hunts(self):
         ids = self._get_selected_ids()
@@ -289,7 +577,15 @@ class HuntsTab(ctk.CTkFrame):
         
         folder = filedialog.askdirectory(title="Selecione a pasta de destino")
         if not folder: return
-        
+
+        self.worker.submit(
+            self._export_hunts, ids, folder,
+            on_done=lambda ok: messagebox.showinfo("Exportação", f"Exportadas: {ok}"),
+            on_error=lambda e: messagebox.showerror("Erro", str(e)),
+        )
+
+    def _export_hunts(self, ids: list[int], folder: str) -> int:
+        # Runs on the worker thread: no widget access here
         ok = 0
         for hid in ids:
             h = self.repo.get_by_id(hid)
@@ -306,4 +602,4 @@ class HuntsTab(ctk.CTkFrame):
                 ok += 1
             except: pass
             
-        messagebox.showinfo("Exportação", f"Exportadas: {ok}")
+        return ok
@@ -1,9 +1,11 @@
 import customtkinter as ctk
+import collections
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 from src.application.interfaces.repository import HuntRepository
 from src.infrastructure.parser.log_parser import LogParser
-from src.domain.entities import Hunt, Monster
+from src.application.services.import_pipeline import ImportPipeline, build_hunt
 
 class InsertTab(ctk.CTkFrame):
     def __init__(self, parent, repo: HuntRepository, parser: LogParser, main_app):
@@ -11,6 +13,8 @@ class InsertTab(ctk.CTkFrame):
         self.repo = repo
         self.parser = parser
         self.main_app = main_app
+        self.worker = main_app.worker
+        self._import = None  # (cancel event, thread) of the running import
         self._build()
 
     def _build(self):
@@ -48,12 +52,13 @@ class InsertTab(ctk.CTkFrame):
         )
         if not caminho:
             return
-        try:
-            with open(caminho, "r", encoding="utf-8") as f:
-                conteudo = f.read()
-        except UnicodeDecodeError:
-            with open(caminho, "r", encoding="latin-1") as f:
-                conteudo = f.read()
+        self.worker.submit(
+            self.parser.read_log, caminho,
+            key="insert.open", on_done=self._show_text,
+            on_error=lambda e: messagebox.showerror("Erro", str(e)),
+        )
+
+    def _show_text(self, conteudo):
         self.text_dados.delete("1.0", tk.END)
         self.text_dados.insert(tk.END, conteudo)
 
@@ -64,55 +69,111 @@ class InsertTab(ctk.CTkFrame):
         )
         if not caminhos:
             return
-        
-        ok, falhas = 0, 0
-        for c in caminhos:
-            try:
-                with open(c, "r", encoding="utf-8") as f:
-                    conteudo = f.read()
-            except UnicodeDecodeError:
-                with open(c, "r", encoding="latin-1") as f:
-                    conteudo = f.read()
-            
-            # Logic to save directly
-            info = self.parser.parse_hunt_data(conteudo)
-            if not info["data_inicio"] and not info["hora_inicio"]:
-                falhas += 1
-                continue
-                
-            # Default fallback character/location for bulk import
-            def_char = self.repo.get_default_character() or "Desconhecido"
-            def_loc = "Desconhecido"
-            
-            monsters_data = self.parser.extract_monsters(conteudo)
-            monsters_entities = [Monster(name=n, amount=q) for n, q in monsters_data]
-            
-            hunt = Hunt(
-                id=None,
-                character=def_char,
-                location=def_loc,
-                date=info["data_inicio"] or "",
-                start_time=info["hora_inicio"] or "",
-                end_time=info["hora_fim"] or "",
-                duration_min=info["duracao_min"],
-                raw_xp_gain=info["raw_xp_gain"],
-                xp_gain=info["xp_gain"],
-                loot=info["loot"],
-                supplies=info["supplies"],
-                balance=info["balance"],
-                damage=info["damage"],
-                healing=info["healing"],
-                raw_text=conteudo,
-                monsters=monsters_entities
-            )
+        self._start_import(list(caminhos))
+
+    def check_pending_import(self):
+        """Offers to resume an import that was cancelled or interrupted."""
+        pipeline = ImportPipeline(self.repo, self.parser)
+
+        def ask(pendentes):
+            if not pendentes:
+                return
+            if messagebox.askyesno(
+                "Importação interrompida",
+                f"{len(pendentes)} arquivo(s) da última importação não foram importados.\nRetomar importação?",
+            ):
+                self._start_import(pendentes)
+            else:
+                self.worker.submit(pipeline.discard_pending)
+
+        self.worker.submit(pipeline.pending, key="insert.pending", on_done=ask)
+
+    def _start_import(self, caminhos):
+        if self._import is not None:
+            messagebox.showinfo("Importação", "Já há uma importação em andamento.")
+            return
+        pipeline = ImportPipeline(self.repo, self.parser)
+        cancel = threading.Event()
+        latest = collections.deque(maxlen=1)  # last snapshot, written by the import thread
+        outcome = {}  # "result" or "error", set by the import thread before it ends
+
+        win = ctk.CTkToplevel(self)
+        win.title("Importando")
+        win.geometry("420x150")
+        win.transient(self.winfo_toplevel())
+        win.grab_set()
+        win.protocol("WM_DELETE_WINDOW", cancel.set)
+
+        lbl = ctk.CTkLabel(win, text=f"0 / {len(caminhos)} arquivos")
+        lbl.pack(padx=10, pady=(15, 5))
+        bar = ctk.CTkProgressBar(win, width=380)
+        bar.set(0)
+        bar.pack(padx=10, pady=5)
+        btn = ctk.CTkButton(win, text="Cancelar", fg_color="red", hover_color="darkred")
+        btn.configure(command=lambda: (cancel.set(), btn.configure(state="disabled", text="Cancelando…")))
+        btn.pack(pady=10)
+
+        def poll():
+            if self._import is None or self._import[1] is not thread:
+                return  # stopped by stop_import
+            if not thread.is_alive():
+                self._import = None
+                if "error" in outcome:
+                    failed(outcome["error"])
+                else:
+                    done(outcome["result"])
+                return
+            if latest and win.winfo_exists():
+                p = latest[-1]
+                bar.set(p.done / p.total if p.total else 1)
+                lbl.configure(text=f"{p.done} / {p.total} arquivos  ·  "
+                                   f"{p.files_per_s:.0f} arquivos/s  ·  {p.mb_per_s:.1f} MB/s")
+            self.after(200, poll)
+
+        def run():
+            # Its own thread, so the worker keeps answering the tabs' queries;
+            # no widget access here, progress is picked up by poll()
             try:
-                self.repo.save(hunt)
-                ok += 1
-            except:
-                falhas += 1
+                def_char = self.repo.get_default_character() or "Desconhecido"
+                outcome["result"] = pipeline.run(caminhos, def_char, "Desconhecido",
+                                                 progress=latest.append, cancel=cancel)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                self.repo.release_thread()
 
-        messagebox.showinfo("Importação concluída", f"Sucesso: {ok}\nFalhas: {falhas}")
-        self.main_app.refresh_all()
+        def done(result):
+            if win.winfo_exists():
+                win.destroy()
+            resumo = (f"Importadas: {result.saved}\nJá existentes: {result.duplicates}\n"
+                      f"Falhas: {result.failed}")
+            if result.errors:
+                resumo += "\n\n" + "\n".join(result.errors[:10])
+                if len(result.errors) > 10:
+                    resumo += f"\n… e mais {len(result.errors) - 10}"
+            if result.cancelled:
+                resumo += "\n\nImportação cancelada: pode ser retomada ao reabrir o programa."
+            messagebox.showinfo("Importação concluída", resumo)
+            self.main_app.refresh_all()
+
+        def failed(e):
+            if win.winfo_exists():
+                win.destroy()
+            messagebox.showerror("Erro", f"Importação interrompida: {e}")
+            self.main_app.refresh_all()
+
+        thread = threading.Thread(target=run, name="import", daemon=True)
+        self._import = (cancel, thread)
+        thread.start()
+        poll()
+
+    def stop_import(self):
+        """Cancels a running import and waits for its last batch; used when the app closes."""
+        if self._import is not None:
+            cancel, thread = self._import
+            self._import = None
+            cancel.set()
+            thread.join()
 
     def salvar_hunt_atual(self):
         dados_hunt = self.text_dados.get("1.0", tk.END).strip()
@@ -123,36 +184,25 @@ class InsertTab(ctk.CTkFrame):
             messagebox.showwarning("Aviso", "Informe Personagem, Local e carregue/cole a Hunt.")
             return
 
-        info = self.parser.parse_hunt_data(dados_hunt)
-        monsters_data = self.parser.extract_monsters(dados_hunt)
-        
-        monsters_entities = [Monster(name=n, amount=q) for n, q in monsters_data]
-        
-        hunt = Hunt(
-            id=None,
-            character=personagem,
-            location=local,
-            date=info["data_inicio"] or "",
-            start_time=info["hora_inicio"] or "",
-            end_time=info["hora_fim"] or "",
-            duration_min=info["duracao_min"],
-            raw_xp_gain=info["raw_xp_gain"],
-            xp_gain=info["xp_gain"],
-            loot=info["loot"],
-            supplies=info["supplies"],
-            balance=info["balance"],
-            damage=info["damage"],
-            healing=info["healing"],
-            raw_text=dados_hunt,
-            monsters=monsters_entities
+        def done(result):
+            if result.error:
+                messagebox.showerror("Erro", result.error)
+            elif result.existing:
+                messagebox.showinfo("Hunt já salva", f"Esta hunt já está salva (ID {result.hunt_id}).")
+            else:
+                messagebox.showinfo("Sucesso", "Hunt salva com sucesso!")
+                self.main_app.refresh_all()
+
+        self.worker.submit(
+            self._save_session, personagem, local, dados_hunt,
+            on_done=done, on_error=lambda e: messagebox.showerror("Erro", str(e)),
         )
 
-        try:
-            self.repo.save(hunt)
-            messagebox.showinfo("Sucesso", "Hunt salva com sucesso!")
-            self.main_app.refresh_all()
-        except Exception as e:
-             messagebox.showerror("Erro", str(e))
+    def _save_session(self, personagem, local, dados_hunt):
+        # Runs on the worker thread: no widget access here
+        info, monsters_data, items_data = self.parser.parse_session(dados_hunt)
+        hunt = build_hunt(info, monsters_data, items_data, dados_hunt, personagem, local)
+        return self.repo.save_many([hunt])[0]
 
     def manage_characters(self):
         win = ctk.CTkToplevel(self)
@@ -169,35 +219,42 @@ class InsertTab(ctk.CTkFrame):
         tree.column("default", width=80, anchor="center")
         tree.pack(fill="both", expand=True, padx=5, pady=5)
 
-        def refresh():
+        def show(result):
+            if not tree.winfo_exists(): return  # dialog closed meanwhile
+            chars, default = result
             tree.delete(*tree.get_children())
-            default = self.repo.get_default_character()
-            for nome in self.repo.list_characters():
+            for nome in chars:
                 tree.insert("", "end", values=(nome, "Sim" if nome == default else ""))
 
+        def refresh():
+            self.worker.submit(
+                lambda: (self.repo.list_characters(), self.repo.get_default_character()),
+                key="insert.characters", on_done=show,
+            )
+
+        def run(write, nome):
+            def done(_):
+                refresh()
+                self.main_app.refresh_all()
+            self.worker.submit(write, nome, on_done=done, on_error=lambda e: messagebox.showerror("Erro", str(e)))
+
         def set_default():
             item = tree.focus()
             if not item: return
             nome = tree.item(item, "values")[0]
-            self.repo.set_default_character(nome)
-            refresh()
-            self.main_app.refresh_all()
+            run(self.repo.set_default_character, nome)
 
         def add_new():
             nome = simpledialog.askstring("Novo personagem", "Nome do personagem:", parent=win)
             if nome:
-                self.repo.add_character(nome)
-                refresh()
-                self.main_app.refresh_all()
+                run(self.repo.add_character, nome)
 
         def delete_sel():
             item = tree.focus()
             if not item: return
             nome = tree.item(item, "values")[0]
             if messagebox.askyesno("Confirmar", f"Apagar personagem '{nome}'?"):
-                self.repo.delete_character(nome)
-                refresh()
-                self.main_app.refresh_all()
+                run(self.repo.delete_character, nome)
 
         btns = ctk.CTkFrame(win); btns.pack(pady=5)
         ctk.CTkButton(btns, text="Definir como Default", command=set_default).pack(side="left", padx=5)
@@ -218,26 +275,32 @@ class InsertTab(ctk.CTkFrame):
         tree.column("nome", width=360)
         tree.pack(fill="both", expand=True, padx=5, pady=5)
 
-        def refresh():
+        def show(locs):
+            if not tree.winfo_exists(): return  # dialog closed meanwhile
             tree.delete(*tree.get_children())
-            for nome in self.repo.list_locations():
+            for nome in locs:
                 tree.insert("", "end", values=(nome,))
 
+        def refresh():
+            self.worker.submit(self.repo.list_locations, key="insert.locations", on_done=show)
+
+        def run(write, nome):
+            def done(_):
+                refresh()
+                self.main_app.refresh_all()
+            self.worker.submit(write, nome, on_done=done, on_error=lambda e: messagebox.showerror("Erro", str(e)))
+
         def add_new():
             nome = simpledialog.askstring("Novo local", "Nome do local:", parent=win)
             if nome:
-                self.repo.add_location(nome)
-                refresh()
-                self.main_app.refresh_all()
+                run(self.repo.add_location, nome)
 
         def delete_sel():
             item = tree.focus()
             if not item: return
             nome = tree.item(item, "values")[0]
             if messagebox.askyesno("Confirmar", f"Apagar local '{nome}'?"):
-                self.repo.delete_location(nome)
-                refresh()
-                self.main_app.refresh_all()
+                run(self.repo.delete_location, nome)
 
         btns = ctk.CTkFrame(win); btns.pack(pady=5)
         ctk.CTkButton(btns, text="Adicionar", command=add_new).pack(side="left", padx=5)
@@ -245,14 +308,18 @@ class InsertTab(ctk.CTkFrame):
         refresh()
 
     def refresh_combos(self):
-        chars = self.repo.list_characters()
-        locs = self.repo.list_locations()
+        self.worker.submit(
+            lambda: (self.repo.list_characters(), self.repo.list_locations(), self.repo.get_default_character()),
+            key="insert.combos", on_done=self._apply_combos,
+        )
+
+    def _apply_combos(self, result):
+        chars, locs, default = result
         
         # CTk uses configure(values=...)
         self.combo_personagem_insert.configure(values=chars)
         self.combo_local_insert.configure(values=locs)
         
-        default = self.repo.get_default_character()
         current = self.combo_personagem_insert.get()
         if not current and default in chars:
             self.combo_personagem_insert.set(default)
@@ -0,0 +1,251 @@
+import tkinter as tk
+from abc import ABC, abstractmethod
+from tkinter import ttk
+from typing import Callable, Hashable, List, Optional, Sequence, Set
+
+
+class RowSource(ABC):
+    """Rows shown by a VirtualTreeview, looked up by position."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def values(self, index: int) -> Optional[tuple]:
+        """Display values of the row; None while it is not loaded."""
+
+    @abstractmethod
+    def key(self, index: int) -> Optional[Hashable]:
+        """Identity of the row, kept in the selection; None while it is not loaded."""
+
+    def prefetch(self, first: int, last: int) -> None:
+        """Called with the rows about to be shown, so missing ones can be loaded."""
+
+    def keys(self, first: int, last: int, done: Callable[[List[Hashable]], None]) -> None:
+        """Passes the keys of rows first..last-1 to done, once they are all loaded."""
+        done([self.key(i) for i in range(first, last)])
+
+
+class VirtualTreeview(ttk.Frame):
+    """A ttk.Treeview that only creates items for the rows on screen.
+
+    The Treeview holds a fixed pool of items, as many as fit in the widget
+    plus a few of overscan; scrolling refills them with the values of other
+    rows instead of creating and deleting items, so the cost of scrolling
+    and refreshing does not depend on the length of the list. The
+    scrollbar, mouse wheel, clicks and arrow keys are handled here, and the
+    selection is a set of row keys, as rows have no item of their own.
+    """
+
+    PLACEHOLDER = "…"  # cells of rows still loading
+
+    def __init__(self, parent, source: RowSource, columns: Sequence[str], widths: Sequence[int], overscan: int = 4):
+        super().__init__(parent)
+        self.source = source
+        self.overscan = overscan
+        self.top = 0                        # index of the first row shown
+        self.selected: Set[Hashable] = set()
+        self.on_select: Optional[Callable[[], None]] = None
+        self._visible = 20                  # rows that fit, updated on resize
+        self._row_height = 0                # measured from the first item
+        self._header_height = 0
+        self._items: List[str] = []         # Treeview item pool, top to bottom
+        self._anchor: Optional[int] = None  # row of the last plain click, for shift ranges
+        self._cursor: Optional[int] = None  # row moved by the arrow keys
+        self._render_pending = False
+        self._placeholder = tuple(self.PLACEHOLDER for _ in columns)
+
+        self.tree = ttk.Treeview(self, columns=tuple(columns), show="headings", selectmode="none")
+        for c, w in zip(columns, widths):
+            self.tree.heading(c, text=c.upper())
+            self.tree.column(c, width=w, anchor="center")
+        self.scroll = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scroll.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", lambda e: self._on_resize(e.height))
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+        self.tree.bind("<Button-1>", lambda e: self._on_click(e, "set"))
+        self.tree.bind("<Shift-Button-1>", lambda e: self._on_click(e, "extend"))
+        self.tree.bind("<Control-Button-1>", lambda e: self._on_click(e, "toggle"))
+        if self.tk.call("tk", "windowingsystem") == "aqua":
+            self.tree.bind("<Command-Button-1>", lambda e: self._on_click(e, "toggle"))
+        for keysym, step in (("Up", -1), ("Down", 1), ("Prior", "-page"), ("Next", "page"),
+                             ("Home", "home"), ("End", "end")):
+            self.tree.bind(f"<{keysym}>", lambda e, s=step: self._on_key(s, extend=False))
+            self.tree.bind(f"<Shift-{keysym}>", lambda e, s=step: self._on_key(s, extend=True))
+
+    # -- public ------------------------------------------------------------
+
+    def refresh(self, keep_position: bool = True) -> None:
+        """Redraws after the source changed (new rows loaded, or a new list)."""
+        if not keep_position:
+            self.top = 0
+            self._anchor = self._cursor = None
+        self._schedule_render()
+
+    def clear_selection(self) -> None:
+        self.selected.clear()
+        self._anchor = self._cursor = None
+        self._selection_changed()
+
+    def select_only(self, index: int) -> None:
+        key = self.source.key(index)
+        self.selected = {key} if key is not None else set()
+        self._anchor = self._cursor = index
+        self._selection_changed()
+
+    def index_at(self, y: int) -> Optional[int]:
+        """Row under a y coordinate of the Treeview (an event's y)."""
+        item = self.tree.identify_row(y)
+        if not item or item not in self._items:
+            return None
+        index = self.top + self._items.index(item)
+        return index if index < len(self.source) else None
+
+    def see(self, index: int) -> None:
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self._visible:
+            self.top = index - self._visible + 1
+        self._schedule_render()
+
+    # -- rendering ---------------------------------------------------------
+
+    def _schedule_render(self) -> None:
+        # A burst of scroll events is drawn once
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _render(self) -> None:
+        self._render_pending = False
+        total = len(self.source)
+        self.top = max(0, min(self.top, total - self._visible))
+        count = max(0, min(self._visible + self.overscan, total - self.top))
+
+        if len(self._items) > count:
+            self.tree.delete(*self._items[count:])
+            del self._items[count:]
+        while len(self._items) < count:
+            self._items.append(self.tree.insert("", "end"))
+
+        self.source.prefetch(self.top, self.top + count)
+        shown_selected = []
+        for offset, item in enumerate(self._items):
+            index = self.top + offset
+            values = self.source.values(index)
+            self.tree.item(item, values=values if values is not None else self._placeholder)
+            key = self.source.key(index)
+            if key is not None and key in self.selected:
+                shown_selected.append(item)
+        self.tree.selection_set(shown_selected)
+        self.tree.yview_moveto(0)  # the pool never scrolls; rows move through it
+
+        if total:
+            self.scroll.set(self.top / total, min(1.0, (self.top + self._visible) / total))
+        else:
+            self.scroll.set(0, 1)
+        if not self._row_height and self._items:
+            self._measure()
+
+    def _measure(self) -> None:
+        bbox = self.tree.bbox(self._items[0])
+        if bbox:
+            self._header_height, self._row_height = bbox[1], bbox[3]
+            self._on_resize(self.tree.winfo_height())
+
+    def _on_resize(self, height: int) -> None:
+        if not self._row_height:
+            self._schedule_render()  # measured once the first item is drawn
+            return
+        visible = max(1, (height - self._header_height) // self._row_height)
+        if visible != self._visible:
+            self._visible = visible
+            self._schedule_render()
+
+    # -- scrolling ---------------------------------------------------------
+
+    def _scroll_to(self, top: int) -> None:
+        top = max(0, min(top, len(self.source) - self._visible))
+        if top != self.top:
+            self.top = top
+            self._schedule_render()
+
+    def _on_scrollbar(self, action: str, amount: str, unit: str = "units") -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self.source)))
+        elif action == "scroll":
+            step = self._visible if unit == "pages" else 1
+            self._scroll_to(self.top + int(amount) * step)
+
+    def _on_wheel(self, event: tk.Event) -> str:
+        if event.num == 4:
+            lines = -3
+        elif event.num == 5:
+            lines = 3
+        elif abs(event.delta) >= 120:
+            lines = -3 * (event.delta // 120)  # Windows: 120 per notch
+        else:
+            lines = -event.delta               # macOS: already in lines
+        self._scroll_to(self.top + lines)
+        return "break"
+
+    # -- selection ---------------------------------------------------------
+
+    def _on_click(self, event: tk.Event, mode: str) -> Optional[str]:
+        if self.tree.identify_region(event.x, event.y) not in ("cell", "tree"):
+            return None  # headings and column resizing keep their default bindings
+        self.tree.focus_set()
+        index = self.index_at(event.y)
+        if index is not None:
+            self._select(index, mode)
+        return "break"
+
+    def _on_key(self, step, extend: bool) -> str:
+        total = len(self.source)
+        if not total:
+            return "break"
+        current = self._cursor if self._cursor is not None else self.top
+        if step == "home":
+            index = 0
+        elif step == "end":
+            index = total - 1
+        elif step in ("page", "-page"):
+            index = current + (self._visible if step == "page" else -self._visible)
+        else:
+            index = current + step
+        index = max(0, min(index, total - 1))
+        self.see(index)
+        self._select(index, "extend" if extend else "set")
+        self._cursor = index  # moves on even over a row still loading
+        return "break"
+
+    def _select(self, index: int, mode: str) -> None:
+        key = self.source.key(index)
+        if key is None:
+            return  # still loading
+        if mode == "extend" and self._anchor is not None:
+            self._cursor = index
+            first, last = sorted((self._anchor, index))
+
+            def apply(keys: List[Hashable], cursor=index) -> None:
+                if self._cursor == cursor:  # not superseded by another click meanwhile
+                    self.selected = set(keys)
+                    self._selection_changed()
+
+            self.source.keys(first, last + 1, apply)
+            return
+        if mode == "toggle":
+            self.selected.symmetric_difference_update({key})
+        else:
+            self.selected = {key}
+        self._anchor = self._cursor = index
+        self._selection_changed()
+
+    def _selection_changed(self) -> None:
+        self._schedule_render()
+        if self.on_select:
+            self.on_select()
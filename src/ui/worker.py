@@ -0,0 +1,108 @@
+import queue
+import threading
+import traceback
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_STOP = object()
+
+
+class BackgroundWorker:
+    """Runs repository calls and number crunching off the Tk thread.
+
+    Requests go through a queue to one dedicated thread, which therefore also
+    owns one SQLite connection (ConnectionManager opens one per thread) and
+    runs the requests in submission order. Each submit returns a Future; its
+    on_done/on_error callbacks are invoked on the Tk thread, picked up by an
+    after() poll, so they may touch widgets. The submitted function must not.
+
+    Requests sharing a key supersede each other: when a newer one is
+    submitted, an older one still queued is skipped and the result of one
+    already running is dropped instead of delivered.
+    """
+
+    def __init__(self, root, poll_ms: int = 30):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._requests: "queue.Queue" = queue.Queue()
+        self._done: "queue.Queue" = queue.Queue()
+        self._latest: Dict[Hashable, int] = {}  # key -> sequence of its newest request
+        self._seq = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="db-worker", daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_ms, self._poll)
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        key: Optional[Hashable] = None,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> Future:
+        """Queues fn(*args); must be called from the Tk thread."""
+        future: Future = Future()
+        if self._closed:
+            future.cancel()
+            return future
+        self._seq += 1
+        if key is not None:
+            self._latest[key] = self._seq
+        self._requests.put((future, fn, args, key, self._seq, on_done, on_error))
+        return future
+
+    def _is_current(self, key: Optional[Hashable], seq: int) -> bool:
+        return key is None or self._latest.get(key) == seq
+
+    def _run(self) -> None:
+        while True:
+            request = self._requests.get()
+            if request is _STOP:
+                break
+            future, fn, args, key, seq = request[:5]
+            if not self._is_current(key, seq):
+                future.cancel()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+            self._done.put(request)
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                future, _, _, key, seq, on_done, on_error = self._done.get_nowait()
+            except queue.Empty:
+                break
+            if not self._is_current(key, seq):
+                continue  # superseded while it ran
+            error = future.exception()
+            try:
+                if error is None:
+                    if on_done:
+                        on_done(future.result())
+                elif on_error:
+                    on_error(error)
+                else:
+                    traceback.print_exception(type(error), error, error.__traceback__)
+            except Exception:
+                traceback.print_exc()
+        if not self._closed:
+            self.root.after(self.poll_ms, self._poll)
+
+    def close(self) -> None:
+        """Skips the requests still queued and waits for the running one."""
+        if self._closed:
+            return
+        self._closed = True
+        while True:
+            try:
+                request = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            request[0].cancel()
+        self._requests.put(_STOP)
+        self._thread.join()
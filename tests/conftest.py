@@ -0,0 +1,166 @@
+import random
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from src.domain.entities import Hunt, LootItem, Monster
+from src.infrastructure.database.cached_repository import CachedHuntRepository
+from src.infrastructure.database.migrations import MIGRATIONS, schema_version
+from src.infrastructure.database.sqlite_repository import SQLiteHuntRepository
+
+LOGS = Path(__file__).parent / "fixtures" / "logs"
+
+CHARACTERS = ("Elite Vini", "Draconian Xereta", "Estagiario Sorcerer")
+LOCATIONS = ("Roshamuul", "Issavi", "Falcon Bastion", "Desconhecido")
+CREATURES = ("dragon lord", "vexclaw", "grimeleech", "dark torturer", "hellspawn", "bruxa")
+
+# Tables exactly as the first release created them (before PRAGMA user_version)
+BASELINE_SCHEMA = """
+CREATE TABLE Characters (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT UNIQUE NOT NULL,
+    is_default INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE Locations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT UNIQUE NOT NULL
+);
+CREATE TABLE Hunts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    personagem TEXT NOT NULL,
+    local TEXT NOT NULL,
+    data TEXT,
+    hora_inicio TEXT,
+    hora_fim TEXT,
+    duracao_min INTEGER,
+    raw_xp_gain INTEGER,
+    xp_gain INTEGER,
+    loot INTEGER,
+    supplies INTEGER,
+    pagamento INTEGER,
+    balance INTEGER,
+    damage INTEGER,
+    healing INTEGER,
+    raw_text TEXT
+);
+CREATE TABLE Hunts_Monstros (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hunt_id INTEGER NOT NULL,
+    personagem TEXT NOT NULL,
+    criatura TEXT NOT NULL,
+    quantidade INTEGER NOT NULL,
+    FOREIGN KEY(hunt_id) REFERENCES Hunts(id) ON DELETE CASCADE
+);
+CREATE TABLE Settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def make_hunt(rng: random.Random, n: int, **overrides) -> Hunt:
+    """A plausible hunt; its log text is unique to n and the generator's state."""
+    tag = f"{n}-{rng.getrandbits(32):08x}"
+    day = rng.randrange(1, 29)
+    start = f"{rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}"
+    loot = rng.randrange(0, 3_000_000)
+    supplies = rng.randrange(0, 1_500_000)
+    fields = dict(
+        id=None,
+        character=rng.choice(CHARACTERS),
+        location=rng.choice(LOCATIONS),
+        date=f"2025-{rng.randrange(1, 13):02d}-{day:02d}",
+        start_time=start,
+        end_time=start,
+        duration_min=rng.choice((0, rng.randrange(1, 240))),
+        raw_xp_gain=rng.randrange(0, 5_000_000),
+        xp_gain=rng.randrange(0, 7_000_000),
+        loot=loot,
+        supplies=supplies,
+        balance=loot - supplies,
+        damage=rng.randrange(0, 9_000_000),
+        healing=rng.randrange(0, 2_000_000),
+        raw_text=f"Session data: hunt {tag}\nKilled Monsters:\n  None\n",
+        monsters=[Monster(c, rng.randrange(1, 400)) for c in rng.sample(CREATURES, rng.randrange(0, 4))],
+        looted_items=[LootItem(f"item {i}", rng.randrange(1, 50)) for i in range(rng.randrange(0, 3))],
+    )
+    fields.update(overrides)
+    return Hunt(**fields)
+
+
+def make_hunts(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [make_hunt(rng, n) for n in range(count)]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "hunts.db")
+
+
+@pytest.fixture
+def repo(db_path):
+    repository = CachedHuntRepository(SQLiteHuntRepository(db_path))
+    yield repository
+    repository.close()
+
+
+@pytest.fixture
+def baseline_db(db_path):
+    """A database as the first release left it: no user_version, text keys, inline raw_text.
+
+    Besides generated hunts it holds: the fixture logs as raw_text (one of
+    them twice), hunts without date or start time, a hunt of a character and
+    location no longer listed, and monster rows of a deleted hunt.
+    """
+    rng = random.Random(3)
+    with closing(sqlite3.connect(db_path)) as conn:
+        conn.executescript(BASELINE_SCHEMA)
+        conn.executemany(
+            "INSERT INTO Characters (nome, is_default) VALUES (?, ?)",
+            [(c, int(i == 0)) for i, c in enumerate(CHARACTERS)],
+        )
+        conn.executemany("INSERT INTO Locations (nome) VALUES (?)", [(loc,) for loc in LOCATIONS])
+
+        hunts = [make_hunt(rng, n) for n in range(60)]
+        logs = [p.read_bytes().decode("utf-8", "replace") for p in sorted(LOGS.glob("session_*.txt"))]
+        for hunt, text in zip(hunts, logs + logs[:1]):
+            hunt.raw_text = text
+        hunts[10].date = None
+        hunts[11].start_time = None
+        hunts[12].character, hunts[12].location = "Old Knight", "Ankrahmun"
+        for hunt in hunts:
+            cur = conn.execute(
+                """
+                INSERT INTO Hunts (
+                    personagem, local, data, hora_inicio, hora_fim, duracao_min,
+                    raw_xp_gain, xp_gain, loot, supplies, pagamento, balance, damage, healing, raw_text
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    hunt.character, hunt.location, hunt.date, hunt.start_time, hunt.end_time,
+                    hunt.duration_min, hunt.raw_xp_gain, hunt.xp_gain, hunt.loot, hunt.supplies,
+                    hunt.payment, hunt.balance, hunt.damage, hunt.healing, hunt.raw_text,
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO Hunts_Monstros (hunt_id, personagem, criatura, quantidade) VALUES (?, ?, ?, ?)",
+                [(cur.lastrowid, hunt.character, m.name, m.amount) for m in hunt.monsters],
+            )
+        # Monster rows left by a hunt deleted with foreign keys off
+        conn.execute("DELETE FROM Hunts WHERE id = 20")
+        conn.commit()
+    return db_path
+
+
+def migrate_to(path: str, version: int) -> None:
+    """Applies the migrations up to version only, as an older release left the database."""
+    with closing(sqlite3.connect(path)) as conn:
+        conn.isolation_level = None
+        for v in range(schema_version(conn) + 1, version + 1):
+            conn.execute("BEGIN IMMEDIATE")
+            MIGRATIONS[v - 1](conn)
+            conn.execute(f"PRAGMA user_version = {v}")
+            conn.execute("COMMIT")
@@ -0,0 +1,78 @@
+"""HuntChanges: what the repository records per write, and which filters it touches."""
+import random
+
+import pytest
+
+from src.application.interfaces.repository import HuntChanges
+from tests.conftest import make_hunt, make_hunts
+
+CHANGED = HuntChanges(
+    updated={7}, characters={"Elite Vini", "Druid Novo"}, locations={"Falcon Bastion"}, dates={"2025-03-10"},
+)
+
+
+@pytest.mark.parametrize("filters, touched", [
+    ({}, True),
+    ({"character": "Todos"}, True),
+    ({"character": "Druid Novo"}, True),
+    ({"character": "Draconian Xereta"}, False),
+    ({"location_like": "bastion"}, True),
+    ({"location_like": "issavi"}, False),
+    ({"date_start": "2025-03-01", "date_end": "2025-03-31"}, True),
+    ({"date_start": "2025-03-10"}, True),
+    ({"date_end": "2025-03-09"}, False),
+    ({"date_start": "2025-04-01", "date_end": "2025-04-30"}, False),
+    ({"character": "Elite Vini", "date_start": "2025-04-01"}, False),
+])
+def test_touches(filters, touched):
+    assert CHANGED.touches(filters) is touched
+
+
+def test_list_changes_and_bulk_changes():
+    lists = HuntChanges(lists=True)
+    assert lists and not lists.touches({})
+    assert HuntChanges(everything=True).touches({"character": "Ninguem"})
+    assert not HuntChanges()
+
+
+def test_merge():
+    changes = HuntChanges(inserted={1}, characters={"A"})
+    changes.merge(HuntChanges(deleted={2}, dates={"2025-01-01"}, lists=True))
+    assert changes == HuntChanges(inserted={1}, deleted={2}, characters={"A"}, dates={"2025-01-01"}, lists=True)
+
+
+def test_writes_record_old_and_new_values(repo):
+    hunts = make_hunts(6, seed=24)
+    hunts[0].character, hunts[0].location, hunts[0].date = "Elite Vini", "Issavi", "2025-02-02"
+    ids = [r.hunt_id for r in repo.save_many(hunts)]
+    saved = repo.drain_changes()
+    assert saved.inserted == set(ids) and saved.lists
+    assert {h.character for h in hunts} <= saved.characters
+    assert repo.drain_changes() == HuntChanges()  # drained
+
+    moved = repo.get_by_id(ids[0])
+    moved.character, moved.location, moved.date = "Draconian Xereta", "Roshamuul", "2025-09-09"
+    repo.update(moved)
+    changes = repo.drain_changes()
+    assert changes.updated == {ids[0]}
+    # A list of the old values and one of the new both see the change
+    assert changes.touches({"character": "Elite Vini", "date_start": "2025-02-01", "date_end": "2025-02-28"})
+    assert changes.touches({"character": "Draconian Xereta", "location_like": "rosha"})
+
+    repo.update_many(ids[1:3], {"location": "Falcon Bastion"})
+    changes = repo.drain_changes()
+    assert changes.updated == set(ids[1:3])
+    assert {hunts[1].location, hunts[2].location, "Falcon Bastion"} <= changes.locations
+
+    repo.delete_many(ids[3:5])
+    changes = repo.drain_changes()
+    assert changes.deleted == set(ids[3:5])
+    assert {hunts[3].date, hunts[4].date} <= changes.dates
+
+
+def test_a_log_already_stored_is_not_an_insert(repo):
+    hunt = make_hunt(random.Random(1), 1)
+    repo.save(hunt)
+    repo.drain_changes()
+    repo.save(hunt)
+    assert repo.drain_changes().inserted == set()
@@ -0,0 +1,58 @@
+"""get_columns: typed NumPy arrays in chronological order."""
+import random
+
+import numpy as np
+import pytest
+
+from tests.conftest import CHARACTERS, make_hunt, make_hunts
+
+FIELDS = ("id", "date", "start_time", "duration_min", "xp_gain", "loot", "payment", "balance")
+
+
+@pytest.fixture
+def filled(repo):
+    hunts = make_hunts(80, seed=13)
+    hunts[3].date = None
+    hunts[4].start_time = None
+    hunts[5].loot = None
+    hunts[6].balance = -1_250_000
+    hunts[7].xp_gain = 2**40  # beyond int32
+    repo.save_many(hunts)
+    return repo
+
+
+@pytest.mark.parametrize("filters", [{}, {"character": CHARACTERS[2]}, {"date_start": "2025-03-01", "date_end": "2025-08-31"}])
+def test_columns_are_the_hunt_list_reversed(filled, filters):
+    hunts = filled.get_all(filters)[::-1]
+    cols = filled.get_columns(filters, FIELDS)
+    assert list(cols) == list(FIELDS)
+    assert cols["id"].tolist() == [h.id for h in hunts]
+    for field in ("duration_min", "xp_gain", "loot", "payment", "balance"):
+        assert cols[field].dtype == np.int64
+        assert cols[field].tolist() == [getattr(h, field) or 0 for h in hunts]
+    assert cols["date"].dtype == np.dtype("datetime64[D]")
+    assert [None if np.isnat(d) else str(d) for d in cols["date"]] == [h.date for h in hunts]
+    assert cols["start_time"].dtype == np.dtype("timedelta64[s]")
+    assert [None if np.isnat(t) else int(t.astype(np.int64)) for t in cols["start_time"]] == [
+        None if h.start_time is None else
+        sum(int(p) * s for p, s in zip(h.start_time.split(":"), (3600, 60, 1)))
+        for h in hunts
+    ]
+
+
+def test_undated_hunts_come_last(filled):
+    dates = filled.get_columns({}, ["date"])["date"]
+    assert np.isnat(dates[-1]) and not np.isnat(dates[:-1]).any()
+    assert (np.diff(dates[:-1].astype(np.int64)) >= 0).all()
+
+
+def test_no_rows_and_no_fields(repo):
+    cols = repo.get_columns({}, FIELDS)
+    assert all(len(a) == 0 and a.dtype.kind in "iMm" for a in cols.values())
+    repo.save(make_hunt(random.Random(2), 1))
+    assert repo.get_columns({}, []) == {}
+
+
+def test_unknown_field(repo):
+    with pytest.raises(ValueError):
+        repo.get_columns({}, ["raw_text"])
@@ -0,0 +1,64 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.infrastructure.database.connection import ConnectionManager
+
+
+def _in_thread(target):
+    result = []
+    t = threading.Thread(target=lambda: result.append(target()))
+    t.start()
+    t.join()
+    return result[0]
+
+
+def test_one_connection_per_thread(db_path):
+    manager = ConnectionManager(db_path)
+    try:
+        main = manager.get()
+        assert manager.get() is main
+        other = _in_thread(manager.get)
+        assert other is not main
+    finally:
+        manager.close_all()
+
+
+def test_connections_of_finished_threads_are_closed(db_path):
+    manager = ConnectionManager(db_path)
+
+    def abandon():
+        conn = manager.get()
+        conn.execute("CREATE TABLE IF NOT EXISTS t (x)")
+        conn.execute("INSERT INTO t VALUES (1)")  # transaction left open
+        return conn
+
+    try:
+        left = _in_thread(abandon)
+        # The next thread may get the same ident; it must not inherit the connection
+        assert _in_thread(manager.get) is not left
+        with pytest.raises(sqlite3.ProgrammingError):
+            left.execute("SELECT 1")
+        assert manager.get().execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        assert len(manager._connections) == 1
+    finally:
+        manager.close_all()
+
+
+def test_release_closes_the_threads_connection(db_path):
+    manager = ConnectionManager(db_path)
+
+    def work():
+        conn = manager.get()
+        conn.execute("CREATE TABLE IF NOT EXISTS t (x)")
+        manager.release()
+        return conn
+
+    try:
+        conn = _in_thread(work)
+        assert manager._connections == {}
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    finally:
+        manager.close_all()
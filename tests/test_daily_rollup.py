@@ -0,0 +1,113 @@
+"""DailyRollup against the same totals recomputed with GROUP BY over Hunts."""
+import random
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from src.infrastructure.database.sqlite_repository import SQLiteHuntRepository
+from tests.conftest import CHARACTERS, make_hunt, make_hunts
+
+_METRICS = (
+    ("minutes", "duracao_min"), ("xp", "xp_gain"), ("raw_xp", "raw_xp_gain"),
+    ("loot", "loot"), ("supplies", "supplies"), ("pagamento", "pagamento"),
+    ("balance", "balance"), ("damage", "damage"), ("healing", "healing"),
+)
+
+
+def _rollup(conn: sqlite3.Connection) -> dict:
+    cols = ", ".join(c for c, _ in _METRICS)
+    return {
+        (r[0], r[1]): tuple(r[2:])
+        for r in conn.execute(f"SELECT character_id, data, hunts, {cols}, kills FROM DailyRollup")
+    }
+
+
+def _recomputed(conn: sqlite3.Connection) -> dict:
+    sums = ", ".join(f"SUM(COALESCE(h.{h_col}, 0))" for _, h_col in _METRICS)
+    return {
+        (r[0], r[1]): tuple(r[2:])
+        for r in conn.execute(f"""
+            SELECT h.character_id, COALESCE(h.data, ''), COUNT(*), {sums}, COALESCE(SUM(k.kills), 0)
+            FROM Hunts h
+            LEFT JOIN (SELECT hunt_id, SUM(quantidade) AS kills FROM Hunts_Monstros GROUP BY hunt_id) k
+                   ON k.hunt_id = h.id
+            GROUP BY h.character_id, COALESCE(h.data, '')
+        """)
+    }
+
+
+def _assert_exact(repo) -> None:
+    conn = repo._get_connection()
+    assert _rollup(conn) == _recomputed(conn)
+
+
+def test_rollup_after_migration(baseline_db):
+    repo = SQLiteHuntRepository(baseline_db)
+    try:
+        _assert_exact(repo)
+    finally:
+        repo.close()
+
+
+def test_rollup_follows_writes(db_path):
+    repo = SQLiteHuntRepository(db_path)
+    rng = random.Random(11)
+    try:
+        repo.save_many(make_hunts(300))
+        for n in range(5):
+            repo.save(make_hunt(rng, 1000 + n))
+        _assert_exact(repo)
+
+        ids = [h.id for h in repo.get_all({})]
+        hunt = repo.get_by_id(ids[0])
+        hunt.character, hunt.date, hunt.loot, hunt.balance = "New Char", "2024-02-29", 1, -5
+        repo.update(hunt)
+        hunt = repo.get_by_id(ids[1])
+        hunt.date = None
+        repo.update(hunt)
+        _assert_exact(repo)
+
+        repo.update_many(ids[10:40], {"character": CHARACTERS[0], "location": "Issavi"})
+        _assert_exact(repo)
+
+        repo.delete_many(ids[40:90])
+        _assert_exact(repo)
+        conn = repo._get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM DailyRollup WHERE hunts <= 0").fetchone()[0] == 0
+    finally:
+        repo.close()
+
+
+def test_rollup_after_duplicate_removal(baseline_db):
+    repo = SQLiteHuntRepository(baseline_db)
+    try:
+        assert repo.remove_duplicate_hunts().removed == 1
+        _assert_exact(repo)
+    finally:
+        repo.close()
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"character": CHARACTERS[1]},
+    {"date_start": "2025-03-01", "date_end": "2025-08-31"},
+    {"character": CHARACTERS[2], "date_start": "2025-01-01", "date_end": "2025-06-30"},
+])
+def test_get_analytics_matches_hunts(repo, filters):
+    repo.save_many(make_hunts(400, seed=5))
+    hunts = repo.get_all(filters)
+    totals = repo.get_analytics(filters)
+    assert totals["count"] == len(hunts)
+    assert totals["total_min"] == sum(h.duration_min for h in hunts)
+    assert totals["total_xp"] == sum(h.xp_gain for h in hunts)
+    assert totals["total_raw_xp"] == sum(h.raw_xp_gain for h in hunts)
+    assert totals["total_supplies"] == sum(h.supplies for h in hunts)
+    assert totals["total_balance"] == sum(h.balance for h in hunts)
+    with closing(sqlite3.connect(repo.inner.db_path)) as conn:
+        ids = [h.id for h in hunts] or [0]
+        kills = conn.execute(
+            f"SELECT COALESCE(SUM(quantidade), 0) FROM Hunts_Monstros WHERE hunt_id IN ({','.join('?' * len(ids))})",
+            ids,
+        ).fetchone()[0]
+    assert totals["total_kills"] == kills
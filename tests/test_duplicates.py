@@ -0,0 +1,115 @@
+"""Content-hash dedup on save and the user-triggered duplicate removal."""
+import sqlite3
+import threading
+from contextlib import closing
+from dataclasses import replace
+
+from src.infrastructure.database.sqlite_repository import SQLiteHuntRepository
+from tests.conftest import make_hunts
+
+
+def _index_sql(conn):
+    return conn.execute("SELECT sql FROM sqlite_master WHERE name = 'idx_hunts_content_hash'").fetchone()[0]
+
+
+def test_save_many_reports_stored_and_repeated_logs(repo):
+    first = repo.save_many(make_hunts(4))
+    again = make_hunts(6)  # the same four logs, then two new ones
+    batch = again + [replace(again[5], id=None)]
+    results = repo.save_many(batch)
+
+    assert [r.existing for r in results] == [True] * 4 + [False, False, True]
+    assert [r.hunt_id for r in results[:4]] == [r.hunt_id for r in first]
+    assert results[6].hunt_id == results[5].hunt_id
+    assert repo.count({}) == 6
+    assert repo.count_duplicate_hunts() == 0
+
+
+def test_save_returns_the_stored_hunt(repo):
+    (hunt,) = make_hunts(1)
+    hunt_id = repo.save(hunt)
+    assert repo.save(replace(hunt, character="Someone Else")) == hunt_id
+    assert repo.count({}) == 1
+
+
+def test_remove_duplicates_backs_up_first(baseline_db):
+    repo = SQLiteHuntRepository(baseline_db)
+    try:
+        before = repo.count({})
+        cleanup = repo.remove_duplicate_hunts()
+        assert cleanup.removed == 1
+        assert repo.count({}) == before - 1
+        assert repo.get_by_id(1) is not None  # the first copy is kept
+        assert repo.get_by_id(5) is None
+
+        with closing(sqlite3.connect(cleanup.backup_path)) as backup:
+            assert backup.execute("SELECT COUNT(*) FROM Hunts").fetchone()[0] == before
+            assert backup.execute("SELECT 1 FROM Hunts WHERE id = 5").fetchone()
+
+        conn = repo._get_connection()
+        assert "UNIQUE" in _index_sql(conn)
+        assert repo.count_duplicate_hunts() == 0
+    finally:
+        repo.close()
+
+
+def test_nothing_to_remove_makes_no_backup(repo, tmp_path):
+    repo.save_many(make_hunts(5))
+    cleanup = repo.remove_duplicate_hunts()
+    assert cleanup == (0, None)
+    assert not list(tmp_path.glob("*.bak"))
+    assert "UNIQUE" in _index_sql(repo.inner._get_connection())
+
+
+def test_dedup_after_unique_index(baseline_db):
+    repo = SQLiteHuntRepository(baseline_db)
+    try:
+        repo.remove_duplicate_hunts()
+        stored = repo.get_by_id(1)
+        assert repo.save(replace(stored, id=None)) == 1
+        (result,) = repo.save_many([replace(stored, id=None)])
+        assert result.existing and result.hunt_id == 1
+        assert repo.count_duplicate_hunts() == 0
+    finally:
+        repo.close()
+
+
+def test_new_database_has_a_unique_index(repo):
+    assert "UNIQUE" in _index_sql(repo.inner._get_connection())
+
+
+def test_migration_without_duplicates_makes_the_index_unique(baseline_db):
+    with closing(sqlite3.connect(baseline_db)) as conn:
+        conn.execute("DELETE FROM Hunts WHERE id = 5")  # the repeated log
+        conn.commit()
+    repo = SQLiteHuntRepository(baseline_db)
+    try:
+        assert "UNIQUE" in _index_sql(repo._get_connection())
+    finally:
+        repo.close()
+
+
+def test_concurrent_saves_of_one_log_store_it_once(db_path):
+    # Separate repositories: each thread writes over its own connection,
+    # as the import thread, the worker and the watcher do
+    repos = [SQLiteHuntRepository(db_path) for _ in range(4)]
+    hunts = make_hunts(20, seed=4)
+    barrier = threading.Barrier(len(repos))
+    ids = []
+
+    def save_all(repo):
+        barrier.wait()
+        ids.append([repo.save(replace(h, id=None)) for h in hunts])
+        repo.release_thread()
+
+    threads = [threading.Thread(target=save_all, args=(r,)) for r in repos]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(ids) == len(repos) and all(row == ids[0] for row in ids)
+        assert repos[0].count({}) == len(hunts)
+    finally:
+        for r in repos:
+            r.close()
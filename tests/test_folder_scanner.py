@@ -0,0 +1,101 @@
+"""FolderScanner: classification from the ScanManifest, reading only changed files."""
+import os
+
+import pytest
+
+from src.application.services.folder_scanner import FolderScanner
+from src.application.services.import_pipeline import build_hunt
+from src.infrastructure.parser.log_parser import LogParser
+from tests.conftest import LOGS
+
+FULL_LOG = (LOGS / "session_full.txt").read_text(encoding="utf-8")
+
+
+class CountingParser(LogParser):
+    """Records the files whose first bytes are read."""
+
+    def __init__(self):
+        super().__init__()
+        self.heads = []
+
+    def read_head(self, path):
+        self.heads.append(os.path.basename(path))
+        return LogParser.read_head(path)
+
+
+def _log(day):
+    return FULL_LOG.replace("2025-07-11", f"2025-07-{day:02d}")
+
+
+@pytest.fixture
+def folder(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    for day in (1, 2, 3):
+        (logs / f"Hunting_Session_{day}.txt").write_text(_log(day), encoding="utf-8")
+    (logs / "notes.txt").write_text("not a session\n", encoding="utf-8")
+    (logs / "picture.png").write_bytes(b"\x89PNG")
+    return logs
+
+
+@pytest.fixture
+def scanner(repo):
+    return FolderScanner(repo, CountingParser())
+
+
+def test_first_scan_reads_every_log_file(scanner, folder):
+    result = scanner.scan(str(folder))
+    assert sorted(os.path.basename(p) for p in result.new_files) == [
+        "Hunting_Session_1.txt", "Hunting_Session_2.txt", "Hunting_Session_3.txt"
+    ]
+    assert (result.known, result.ignored, result.opened) == (0, 1, 4)
+    assert "picture.png" not in scanner.parser.heads
+
+
+def test_unchanged_files_are_not_opened(scanner, folder):
+    scanner.scan(str(folder))
+    scanner.parser.heads.clear()
+    result = scanner.scan(str(folder))
+    assert scanner.parser.heads == []
+    assert (len(result.new_files), result.known, result.ignored, result.opened) == (3, 0, 1, 0)
+
+
+def test_imported_logs_become_known_without_reading_them(scanner, folder, repo):
+    scanner.scan(str(folder))
+    info, monsters, items = LogParser().parse_session(_log(2))
+    repo.save(build_hunt(info, monsters, items, _log(2), "Elite Vini", "Issavi"))
+    scanner.parser.heads.clear()
+
+    result = scanner.scan(str(folder))
+    assert scanner.parser.heads == []
+    assert (len(result.new_files), result.known) == (2, 1)
+    manifest = {os.path.basename(e.path): e for e in repo.get_scan_manifest(str(folder))}
+    assert manifest["Hunting_Session_2.txt"].hunt_id is not None
+    assert manifest["Hunting_Session_1.txt"].session_key == "2025-07-01 10:51:14"
+
+
+def test_changed_files_are_reclassified_from_their_head(scanner, folder, repo):
+    scanner.scan(str(folder))
+    hashes = {os.path.basename(e.path): e.content_hash for e in repo.get_scan_manifest(str(folder))}
+
+    touched = folder / "Hunting_Session_1.txt"
+    st = touched.stat()
+    os.utime(touched, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    (folder / "Hunting_Session_2.txt").write_text(_log(2) + "  1x a gold coin\n", encoding="utf-8")
+    (folder / "Hunting_Session_3.txt").write_text(_log(4), encoding="utf-8")  # another session
+    (folder / "notes.txt").unlink()
+    scanner.parser.heads.clear()
+
+    result = scanner.scan(str(folder))
+    assert sorted(scanner.parser.heads) == [
+        "Hunting_Session_1.txt", "Hunting_Session_2.txt", "Hunting_Session_3.txt"
+    ]
+    assert (len(result.new_files), result.ignored) == (3, 0)
+    manifest = {os.path.basename(e.path): e for e in repo.get_scan_manifest(str(folder))}
+    assert set(manifest) == {"Hunting_Session_1.txt", "Hunting_Session_2.txt", "Hunting_Session_3.txt"}
+    # Only the first bytes are hashed: a change past them keeps the same hash
+    assert manifest["Hunting_Session_1.txt"].content_hash == hashes["Hunting_Session_1.txt"]
+    assert manifest["Hunting_Session_2.txt"].content_hash == hashes["Hunting_Session_2.txt"]
+    assert manifest["Hunting_Session_3.txt"].content_hash != hashes["Hunting_Session_3.txt"]
+    assert manifest["Hunting_Session_3.txt"].session_key == "2025-07-04 10:51:14"
+    assert manifest["Hunting_Session_1.txt"].mtime_ns == touched.stat().st_mtime_ns
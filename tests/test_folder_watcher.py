@@ -0,0 +1,143 @@
+"""FolderWatcher: settling, filtering, overflow and the polling fallback."""
+import os
+import threading
+import time
+
+import pytest
+
+from src.infrastructure import folder_watcher
+from src.infrastructure.folder_watcher import FolderWatcher
+
+
+def _event(mask, name=""):
+    raw = os.fsencode(name)
+    if raw:  # null-terminated, padded like the kernel does
+        raw += b"\0" * (16 - len(raw) % 16)
+    return folder_watcher._EVENT.pack(1, mask, 0, len(raw)) + raw
+
+
+def _wait_for(watcher, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        paths = watcher.drain()
+        if paths:
+            return paths
+        time.sleep(0.01)
+    return []
+
+
+class Steps:
+    """Stands in for the stop event: each wait() runs the next step, then one poll follows."""
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+        self.intervals = []
+
+    def wait(self, interval):
+        self.intervals.append(interval)
+        if not self.steps:
+            return True
+        self.steps.pop(0)()
+        return False
+
+
+def test_events_are_parsed_with_their_names():
+    data = (_event(folder_watcher._IN_CLOSE_WRITE, "Hunting_Session_1.txt")
+            + _event(folder_watcher._IN_Q_OVERFLOW)
+            + _event(folder_watcher._IN_MOVED_TO, "Hunting_Session_ção.txt"))
+    assert FolderWatcher._events(data) == [
+        (folder_watcher._IN_CLOSE_WRITE, "Hunting_Session_1.txt"),
+        (folder_watcher._IN_Q_OVERFLOW, ""),
+        (folder_watcher._IN_MOVED_TO, "Hunting_Session_ção.txt"),
+    ]
+
+
+def test_polling_reports_files_once_they_stop_changing(tmp_path):
+    (tmp_path / "Hunting_Session_old.txt").write_text("already there")
+    watcher = FolderWatcher(str(tmp_path), min_interval=1, max_interval=4)
+    new, doomed = tmp_path / "Hunting_Session_new.txt", tmp_path / "Hunting_Session_doomed.log"
+    drained = []
+    watcher._stop = Steps(
+        lambda: new.write_text("Session data:"),
+        lambda: (new.write_text("Session data: more"), drained.append(watcher.drain())),
+        lambda: drained.append(watcher.drain()),
+        lambda: (drained.append(watcher.drain()), doomed.write_text("x"),
+                 (tmp_path / "notes.txt").write_text("x"), (tmp_path / "Hunting_Session_1.png").write_text("x")),
+        lambda: doomed.unlink(),
+        lambda: None,
+        lambda: None,
+    )
+    watcher._watch_polling()
+    assert drained == [[], [], [str(new)]]
+    assert watcher.drain() == []  # the deleted file never settled, the others are not logs
+    # Back to the minimum on activity, doubling while idle
+    assert watcher._stop.intervals == [1, 1, 1, 1, 1, 2, 4, 4]
+
+
+def test_inotify_events_settle_before_they_are_reported(tmp_path):
+    read_fd, write_fd = os.pipe()
+    watcher = FolderWatcher(str(tmp_path), settle=0.05, min_interval=0.05)
+    thread = threading.Thread(target=watcher._watch_inotify, args=(read_fd,))
+    thread.start()
+    try:
+        os.write(write_fd, _event(folder_watcher._IN_CLOSE_WRITE, "Hunting_Session_1.txt"))
+        os.write(write_fd, _event(folder_watcher._IN_CLOSE_WRITE, "notes.txt"))
+        os.write(write_fd, _event(folder_watcher._IN_CLOSE_WRITE, "Hunting_Session_1.txt"))
+        assert _wait_for(watcher) == [str(tmp_path / "Hunting_Session_1.txt")]
+
+        # Lost events: everything modified since the watch began
+        late = tmp_path / "Hunting_Session_2.txt"
+        late.write_text("Session data:")
+        os.write(write_fd, _event(folder_watcher._IN_Q_OVERFLOW))
+        assert _wait_for(watcher) == [str(late)]
+
+        # The folder went away: the watcher keeps going by polling
+        os.write(write_fd, _event(folder_watcher._IN_IGNORED))
+        deadline = time.monotonic() + 5
+        while watcher.mode != "polling" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert watcher.mode == "polling"
+    finally:
+        watcher._stop.set()
+        thread.join(5)
+        os.close(write_fd)
+    assert not thread.is_alive()
+
+
+def test_modified_since_skips_older_files(tmp_path):
+    old, new = tmp_path / "Hunting_Session_old.txt", tmp_path / "Hunting_Session_new.txt"
+    old.write_text("x")
+    new.write_text("x")
+    os.utime(old, (time.time() - 3600,) * 2)
+    watcher = FolderWatcher(str(tmp_path))
+    assert watcher._modified_since(time.time() - 60) == [str(new)]
+
+
+def test_start_falls_back_to_polling(tmp_path, monkeypatch):
+    monkeypatch.setattr(FolderWatcher, "_inotify_fd", lambda self: None)
+    watcher = FolderWatcher(str(tmp_path), min_interval=0.02, max_interval=0.02)
+    polled = threading.Event()
+    snapshot = watcher._snapshot
+    watcher._snapshot = lambda: (snapshot(), polled.set())[0]
+    watcher.start()
+    try:
+        assert watcher.mode == "polling"
+        assert polled.wait(5)  # files present before the first poll are left to the startup scan
+        (tmp_path / "Hunting_Session_1.txt").write_text("Session data:")
+        assert _wait_for(watcher) == [str(tmp_path / "Hunting_Session_1.txt")]
+    finally:
+        watcher.stop()
+
+
+def test_inotify_reports_closed_files(tmp_path):
+    watcher = FolderWatcher(str(tmp_path), settle=0.05)
+    watcher.start()
+    try:
+        if watcher.mode != "inotify":
+            pytest.skip("inotify unavailable")
+        with open(tmp_path / "Hunting_Session_1.txt", "w") as f:
+            f.write("Session data:")
+        (tmp_path / "notes.txt").write_text("x")
+        assert _wait_for(watcher) == [str(tmp_path / "Hunting_Session_1.txt")]
+    finally:
+        watcher.stop()
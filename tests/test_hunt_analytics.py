@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from src.application.services.hunt_analytics import ANALYSIS_FIELDS, analyze
+from tests.conftest import CHARACTERS, make_hunts
+
+
+def _cols(balances, minutes):
+    n = len(balances)
+    zeros = np.zeros(n, dtype=np.int64)
+    return {
+        "date": np.array([f"2025-01-{d + 1:02d}" for d in range(n)], dtype="datetime64[D]"),
+        "duration_min": np.array(minutes, dtype=np.int64),
+        "xp_gain": zeros, "raw_xp_gain": zeros, "loot": zeros, "supplies": zeros, "damage": zeros,
+        "balance": np.array(balances, dtype=np.int64),
+    }
+
+
+def test_best_ties_go_to_the_latest_hunt():
+    r = analyze(_cols([5, 9, 2, 9, 9, 1], [60, 60, 60, 60, 60, 0]))
+    assert (r.best_balance.value, r.best_balance.date) == (9, "2025-01-05")
+    assert r.best_balance_h.date == "2025-01-05"
+    assert r.best_raw_xp_h.date == "2025-01-06"  # all 0: the latest hunt
+
+
+def test_empty_period():
+    r = analyze(_cols([], []))
+    assert r.hunts == 0 and r.best_balance is None and r.growth_balance_h is None
+
+
+@pytest.mark.parametrize("filters", [{}, {"character": CHARACTERS[0]}])
+def test_matches_the_hunt_list(repo, filters):
+    repo.save_many(make_hunts(300, seed=15))
+    hunts = repo.get_all(filters)  # newest first
+    r = analyze(repo.get_columns(filters, ANALYSIS_FIELDS))
+
+    rate = lambda h, v: v / (h.duration_min / 60) if h.duration_min else 0.0  # noqa: E731
+    assert r.hunts == len(hunts)
+    assert r.total_balance == sum(h.balance for h in hunts)
+    assert r.avg_balance_h == pytest.approx(np.mean([rate(h, h.balance) for h in hunts]))
+    for best, value in ((r.best_balance, lambda h: h.balance),
+                        (r.best_balance_h, lambda h: rate(h, h.balance)),
+                        (r.best_raw_xp_h, lambda h: rate(h, h.raw_xp_gain))):
+        top = max(hunts, key=value)  # first of the newest-first list among ties
+        assert (best.value, best.date) == (pytest.approx(value(top)), top.date)
+
+    oldest = [rate(h, h.balance) for h in reversed(hunts)]
+    first, last = np.mean(oldest[:3]), np.mean(oldest[-3:])
+    assert r.growth_balance_h == pytest.approx((last - first) / first * 100)
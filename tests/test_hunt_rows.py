@@ -0,0 +1,145 @@
+"""HuntRowSource: the Hunts list read a page at a time through the worker."""
+import pytest
+
+pytest.importorskip("customtkinter")
+
+from src.application.interfaces.repository import DEFAULT_ORDER  # noqa: E402
+from src.ui.tab_hunts import HuntRowSource, HuntsTab  # noqa: E402
+from tests.conftest import make_hunts  # noqa: E402
+
+PAGE = 10
+
+
+class QueuedWorker:
+    """BackgroundWorker stand-in: requests run when the test says so, on its thread."""
+
+    def __init__(self):
+        self.queue = []
+
+    def submit(self, fn, *args, key=None, on_done=None, on_error=None):
+        self.queue.append((fn, args, on_done, on_error))
+
+    def run(self):
+        while self.queue:
+            fn, args, on_done, on_error = self.queue.pop(0)
+            try:
+                result = fn(*args)
+            except Exception as e:
+                on_error(e)
+            else:
+                on_done(result)
+
+
+@pytest.fixture
+def listed(repo):
+    repo.save_many(make_hunts(95, seed=23))
+    return repo, [h.id for h in repo.get_all({})]
+
+
+@pytest.fixture
+def source(listed):
+    repo, _ = listed
+    loaded = []
+    rows = HuntRowSource(repo, QueuedWorker(), PAGE, on_loaded=lambda: loaded.append(True))
+    rows.loaded = loaded
+    rows.reset({}, DEFAULT_ORDER, repo.count({}), repo.get_page({}, None, PAGE))
+    return rows
+
+
+def test_pages_load_in_order_as_they_come_into_view(source, listed):
+    repo, ids = listed
+    assert len(source) == 95
+    assert [source.key(i) for i in range(PAGE)] == ids[:PAGE]
+    assert source.values(0) == HuntsTab._row_values(repo.get_by_id(ids[0]))
+    assert source.key(PAGE) is None
+
+    for first in range(0, 95, PAGE):
+        source.prefetch(first, first + PAGE)
+        source.worker.run()
+    assert [source.key(i) for i in range(95)] == ids
+    assert len(source.loaded) == 9
+
+
+def test_a_page_waits_for_its_key(source, listed):
+    _, ids = listed
+    source.prefetch(50, 60)
+    assert source.worker.queue == []  # page 5's after_key is not known yet
+    source.set_keys(source.generation, source.repo.get_page_keys({}, PAGE))
+    source.prefetch(50, 80)
+    assert len(source.worker.queue) == HuntRowSource.MAX_IN_FLIGHT
+    source.worker.run()
+    assert [source.key(i) for i in range(50, 70)] == ids[50:70]
+    assert source.key(70) is None
+
+
+def test_keys_walk_to_pages_not_loaded(source, listed):
+    _, ids = listed
+    found = []
+    source.keys(35, 72, found.append)
+    source.worker.run()
+    assert found == [ids[35:72]]
+    source.keys(0, 5, found.append)  # in memory: answered at once
+    assert found[-1] == ids[:5]
+
+
+def test_responses_for_an_old_list_are_dropped(source, listed):
+    repo, ids = listed
+    source.prefetch(10, 20)
+    generation = source.generation
+    source.reset({"ids": tuple(ids[:3])}, DEFAULT_ORDER, 3, repo.get_page({"ids": tuple(ids[:3])}, None, PAGE))
+    source.worker.run()
+    assert source.generation == generation + 1
+    assert source.loaded == []
+    assert [source.key(i) for i in range(3)] == ids[:3]
+    source.set_keys(generation, [("stale",)])  # ignored
+    assert source.key(10) is None
+
+
+def test_least_recently_shown_pages_are_dropped(source, listed, monkeypatch):
+    _, ids = listed
+    monkeypatch.setattr(HuntRowSource, "MAX_PAGES", 2)
+    source.prefetch(10, 20)
+    source.worker.run()
+    source.values(0)  # page 0 shown again
+    source.prefetch(20, 30)
+    source.worker.run()
+    assert source.key(0) == ids[0]
+    assert source.key(10) is None
+    assert source.key(20) == ids[20]
+
+
+def test_rows_are_replaced_in_place(source, listed):
+    repo, ids = listed
+    hunt = repo.get_by_id(ids[3])
+    assert source.values(3)[5] == hunt.character
+    hunt.character = "Outro Char"
+    source.replace_rows({hunt.id: hunt})
+    assert source.values(3)[5] == "Outro Char"
+    assert source.loaded_hunts({ids[3], ids[50]}) == {hunt.id: hunt}
+
+
+def test_rows_past_a_shrunken_list_are_empty(source, listed):
+    repo, ids = listed
+    repo.delete_many(ids[PAGE:2 * PAGE])
+    for first in range(PAGE, 95, PAGE):
+        source.prefetch(first, first + PAGE)
+        source.worker.run()
+    assert [source.key(i) for i in range(85)] == ids[:PAGE] + ids[2 * PAGE:]
+    assert source.values(85) is None and source.values(94) is None
+
+
+class FailingRepo:
+    def get_page(self, *args):
+        raise OSError("disk I/O error")
+
+
+def test_errors_reach_the_tab(source):
+    errors = []
+    source.on_error = errors.append
+    source.repo = FailingRepo()
+    source.prefetch(10, 20)
+    source.worker.run()
+    assert [str(e) for e in errors] == ["disk I/O error"]
+    assert source.key(10) is None
+    source.prefetch(10, 20)  # asked again once the error is reported
+    assert len(source.worker.queue) == 1
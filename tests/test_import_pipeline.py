@@ -0,0 +1,92 @@
+"""ImportPipeline: dedup, cancellation and the resume state kept in Settings."""
+import json
+import threading
+
+import pytest
+
+from src.application.services.import_pipeline import ImportPipeline
+from src.infrastructure.parser.log_parser import LogParser
+from tests.conftest import LOGS
+
+FILES = 23
+BATCH = 5
+
+
+@pytest.fixture
+def log_paths(tmp_path):
+    # The same session with a different start time per file, so every log is new
+    lines = (LOGS / "session_full.txt").read_text(encoding="utf-8").splitlines(keepends=True)
+    paths = []
+    for n in range(FILES):
+        path = tmp_path / f"log_{n:02d}.txt"
+        header = f"Session data: From 2025-07-{n + 1:02d}, 10:51:14 to 2025-07-{n + 1:02d}, 11:52:09\n"
+        path.write_text(header + "".join(lines[1:]), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def _pipeline(repo):
+    return ImportPipeline(repo, LogParser(), batch_size=BATCH, workers=1)
+
+
+def test_import_counts_new_repeated_and_broken_files(repo, log_paths, tmp_path):
+    missing = str(tmp_path / "missing.txt")
+    (tmp_path / "notes.txt").write_text("nothing to see\n", encoding="utf-8")
+    paths = log_paths + [log_paths[0], missing, str(tmp_path / "notes.txt")]
+    pipeline = _pipeline(repo)
+
+    result = pipeline.run(paths, "Elite Vini", "Issavi")
+    assert (result.total, result.done, result.saved, result.duplicates, result.failed) == (
+        len(paths), len(paths), FILES, 1, 2
+    )
+    assert not result.cancelled
+    assert repo.count({}) == FILES
+    assert pipeline.pending() == []
+
+
+def test_cancelled_import_resumes_where_it_stopped(repo, log_paths):
+    pipeline = _pipeline(repo)
+    cancel = threading.Event()
+    snapshots = []
+
+    def progress(snapshot):
+        snapshots.append(snapshot)
+        cancel.set()  # stop after the first batch
+
+    first = pipeline.run(log_paths, "Elite Vini", "Issavi", progress=progress, cancel=cancel)
+    assert first.cancelled
+    assert 0 < first.done < FILES
+    assert repo.count({}) == first.saved == first.done
+    pending = pipeline.pending()
+    assert pending == log_paths[first.done:]
+
+    rest = _pipeline(repo).run(pending, "Elite Vini", "Issavi")
+    assert not rest.cancelled
+    assert rest.saved == len(pending) and rest.duplicates == 0
+    assert repo.count({}) == FILES
+    assert pipeline.pending() == []
+
+
+def test_resume_after_an_interruption_skips_saved_files(repo, log_paths):
+    # Position stored before the last batch was: its files come back as pending
+    pipeline = _pipeline(repo)
+    pipeline.run(log_paths[:BATCH], "Elite Vini", "Issavi")
+    repo.set_setting(ImportPipeline.SETTING_PATHS, json.dumps(log_paths))
+    repo.set_setting(ImportPipeline.SETTING_POSITION, "0")
+
+    result = pipeline.run(pipeline.pending(), "Elite Vini", "Issavi")
+    assert (result.saved, result.duplicates) == (FILES - BATCH, BATCH)
+    assert repo.count({}) == FILES
+
+
+def test_background_imports_keep_the_pending_list(repo, log_paths):
+    pipeline = _pipeline(repo)
+    cancel = threading.Event()
+    pipeline.run(log_paths, "Elite Vini", "Issavi", progress=lambda _: cancel.set(), cancel=cancel)
+    pending = pipeline.pending()
+    assert pending
+
+    pipeline.run(log_paths[:2], "Elite Vini", "Issavi", resumable=False)
+    assert pipeline.pending() == pending
+    pipeline.discard_pending()
+    assert pipeline.pending() == []
@@ -0,0 +1,92 @@
+"""Integer keys for characters, locations and creatures, behind an API that speaks names."""
+import sqlite3
+from collections import Counter
+from contextlib import closing
+from pathlib import Path
+
+from src.infrastructure.database.migrations import SCHEMA_VERSION
+from src.infrastructure.database.sqlite_repository import SQLiteHuntRepository
+from tests.conftest import CHARACTERS, make_hunts, migrate_to
+
+
+def test_v5_rekeys_a_populated_database(baseline_db):
+    migrate_to(baseline_db, 4)
+    with closing(sqlite3.connect(baseline_db)) as conn:
+        kills = Counter()
+        for hunt_id, criatura, quantidade in conn.execute("SELECT hunt_id, criatura, quantidade FROM Hunts_Monstros"):
+            kills[hunt_id, criatura] += quantidade
+        # A hunt the legacy script saved at v4: new names, inline log text
+        cur = conn.execute(
+            "INSERT INTO Hunts (personagem, local, data, hora_inicio, raw_text) VALUES (?, ?, ?, ?, ?)",
+            ("Novo Druid", "Zao", "2025-12-24", "20:00:00", "Session data: legacy\n"),
+        )
+        legacy_id = cur.lastrowid
+        conn.execute(
+            "INSERT INTO Hunts_Monstros (hunt_id, personagem, criatura, quantidade) VALUES (?, ?, ?, ?)",
+            (legacy_id, "Novo Druid", "lizard chosen", 12),
+        )
+        conn.commit()
+    kills[legacy_id, "lizard chosen"] += 12
+    migrate_to(baseline_db, 5)
+
+    with closing(sqlite3.connect(baseline_db)) as conn:
+        rekeyed = Counter()
+        for hunt_id, nome, quantidade in conn.execute(
+            "SELECT hm.hunt_id, cr.nome, hm.quantidade FROM Hunts_Monstros hm JOIN Creatures cr ON cr.id = hm.creature_id"
+        ):
+            rekeyed[hunt_id, nome] += quantidade
+        assert rekeyed == Counter({k: v for k, v in kills.items() if k[0] != 20})
+        assert conn.execute("SELECT COUNT(*) FROM Creatures").fetchone()[0] == len({c for _, c in kills})
+        hunt_cols = {r[1] for r in conn.execute("PRAGMA table_info(Hunts)")}
+        monster_cols = {r[1] for r in conn.execute("PRAGMA table_info(Hunts_Monstros)")}
+        assert not {"personagem", "local", "raw_text"} & hunt_cols
+        assert monster_cols == {"id", "hunt_id", "creature_id", "quantidade"}
+
+    repo = SQLiteHuntRepository(baseline_db)
+    try:
+        hunt = repo.get_by_id(legacy_id)
+        assert (hunt.character, hunt.location, hunt.raw_text) == ("Novo Druid", "Zao", "Session data: legacy\n")
+        assert [(m.name, m.amount) for m in hunt.monsters] == [("lizard chosen", 12)]
+        # Names only known from hunts are kept but not listed
+        assert "Novo Druid" not in repo.list_characters()
+        assert "Zao" not in repo.list_locations()
+    finally:
+        repo.close()
+
+
+def test_the_legacy_script_knows_its_last_schema():
+    source = (Path(__file__).parents[1] / "Hunt-Analizer.py").read_text(encoding="utf-8")
+    limit = int(source.split("ULTIMO_SCHEMA_SUPORTADO = ", 1)[1].split()[0])
+    assert limit == 4 < SCHEMA_VERSION
+
+
+def test_reassigning_hunts_leaves_their_monster_rows(repo):
+    repo.save_many(make_hunts(40, seed=14))
+    conn = repo.inner._get_connection()
+    monsters = conn.execute("SELECT * FROM Hunts_Monstros ORDER BY id").fetchall()
+    moved = [h.id for h in repo.get_all({"character": CHARACTERS[0]})][:5]
+    kills = Counter(dict(repo.get_monster_aggregates({"character": CHARACTERS[1]})))
+    for hunt_id in moved:
+        kills.update({m.name: m.amount for m in repo.get_by_id(hunt_id).monsters})
+
+    repo.update_many(moved, {"character": CHARACTERS[1], "location": "Nova Area"})
+
+    assert conn.execute("SELECT * FROM Hunts_Monstros ORDER BY id").fetchall() == monsters
+    assert dict(repo.get_monster_aggregates({"character": CHARACTERS[1]})) == dict(kills)
+    assert {(h.character, h.location) for h in repo.get_all({"ids": tuple(moved)})} == {(CHARACTERS[1], "Nova Area")}
+    assert "Nova Area" in repo.list_locations()
+
+
+def test_deleted_names_stay_resolvable(repo):
+    hunts = make_hunts(20, seed=4)
+    repo.save_many(hunts)
+    used = hunts[0].character
+    repo.delete_character(used)
+    assert used not in repo.list_characters()
+    assert repo.count({"character": used}) == sum(h.character == used for h in hunts)
+    repo.add_character(used)  # comes back with its hunts
+    assert used in repo.list_characters()
+    repo.add_character("Sem Hunts")
+    repo.delete_character("Sem Hunts")
+    conn = repo.inner._get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM Characters WHERE nome = 'Sem Hunts'").fetchone()[0] == 0
@@ -0,0 +1,157 @@
+"""LogParser against the output of the original parser.
+
+fixtures/parser_baseline.json holds what the regex-per-field LogParser of
+the first release (parse_hunt_data / extract_monsters) returned for each
+log in fixtures/logs, read as it read files: UTF-8, else latin-1, with
+universal newlines. Every session of a file has one entry, in order.
+"""
+import json
+import mmap
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.parser import log_parser
+from src.infrastructure.parser.log_parser import LogParser, SessionKey
+
+FIXTURES = Path(__file__).parent / "fixtures"
+LOGS = FIXTURES / "logs"
+BASELINE = json.loads((FIXTURES / "parser_baseline.json").read_text(encoding="utf-8"))
+
+
+def _monsters(expected):
+    return [tuple(m) for m in expected["monsters"]]
+
+
+@pytest.fixture
+def parser():
+    return LogParser()
+
+
+@pytest.mark.parametrize("name", sorted(BASELINE))
+def test_sessions_match_baseline(parser, name):
+    _, texts = parser.read_sessions(LOGS / name)
+    assert len(texts) == len(BASELINE[name])
+    for text, expected in zip(texts, BASELINE[name]):
+        info, monsters, _ = parser.parse_session(text)
+        assert info == expected["hunt_data"]
+        assert monsters == _monsters(expected)
+
+
+@pytest.mark.parametrize("name", sorted(n for n in BASELINE if len(BASELINE[n]) == 1))
+def test_wrappers_match_baseline(parser, name):
+    text = parser.read_log(LOGS / name)
+    expected = BASELINE[name][0]
+    assert parser.parse_hunt_data(text) == expected["hunt_data"]
+    assert parser.extract_monsters(text) == _monsters(expected)
+
+
+def test_wrappers_do_not_mix_texts(parser):
+    full = parser.read_log(LOGS / "session_full.txt")
+    empty = parser.read_log(LOGS / "session_empty.txt")
+    assert parser.extract_monsters(full)
+    assert parser.extract_monsters(empty) == []
+    assert parser.parse_hunt_data(full) == BASELINE["session_full.txt"][0]["hunt_data"]
+
+
+def test_looted_items(parser):
+    _, _, items = parser.parse_session(parser.read_log(LOGS / "session_odd_layout.txt"))
+    assert items == [("a small sapphire", 3), ("a dragon scale mail", 1), ("a platinum coin", 640)]
+    _, _, items = parser.parse_session(parser.read_log(LOGS / "session_latin1_crlf.txt"))
+    assert items == [("uma espada de aço", 1), ("a gold coin", 130)]
+    _, _, items = parser.parse_session(parser.read_log(LOGS / "session_empty.txt"))
+    assert items == []
+
+
+def test_read_log_decodes_latin1_and_crlf(parser):
+    text = parser.read_log(LOGS / "session_latin1_crlf.txt")
+    assert "\r" not in text
+    assert "pirata corsário" in text
+
+
+@pytest.mark.parametrize("name", sorted(BASELINE))
+def test_large_files_are_mapped(parser, name, monkeypatch):
+    path = LOGS / name
+    expected = parser.read_sessions(path)
+    with parser.open_log(path) as data:
+        assert isinstance(data, bytes)
+    monkeypatch.setattr(log_parser, "_MMAP_MIN_SIZE", 16)
+    with parser.open_log(path) as data:
+        assert isinstance(data, mmap.mmap)
+    assert parser.read_sessions(path) == expected
+    assert parser.read_log(path) == "".join(expected[1])
+
+
+def test_session_spans():
+    data = b"preamble\nSession data: a\nLoot: 1\nSession data: b\n"
+    second = data.index(b"Session data: b")
+    assert LogParser.session_spans(data) == [(0, second), (second, len(data))]
+    assert LogParser.session_spans(b"no session\n") == [(0, 11)]
+    assert LogParser.session_spans(b"") == [(0, 0)]
+
+
+def test_concatenated_sessions_are_split(parser):
+    size, texts = parser.read_sessions(LOGS / "two_sessions.txt")
+    assert size == (LOGS / "two_sessions.txt").stat().st_size
+    assert len(texts) == 2 and all(t.startswith("Session data:") for t in texts)
+    assert "".join(texts) == parser.read_log(LOGS / "two_sessions.txt")
+
+
+def test_decode_log():
+    assert LogParser.decode_log("açaí\r\nLoot: 1\r".encode("utf-8")) == "açaí\nLoot: 1\n"
+    assert LogParser.decode_log("corsário\r\n".encode("latin-1")) == "corsário\n"
+
+
+@pytest.mark.parametrize("name", sorted(BASELINE))
+def test_header_fast_paths_agree(parser, name):
+    path = LOGS / name
+    data = path.read_bytes()
+    first = BASELINE[name][0]["hunt_data"]
+    assert parser.parse_header(data[:parser.session_spans(data)[0][1]]) == first
+    assert parser.session_key(parser.read_head(path), path) == SessionKey(
+        first["data_inicio"], first["hora_inicio"], first["hora_fim"]
+    )
+
+
+def test_session_key_ignores_other_files(parser, tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("Not a hunting session\n", encoding="utf-8")
+    assert parser.session_key(parser.read_head(path), path) is None
+    path.write_text("Session data:\nno dates here\n", encoding="utf-8")
+    assert parser.session_key(parser.read_head(path), path) is None
+
+
+def test_read_head_reads_only_the_start(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"x" * (log_parser.HEAD_SIZE * 4))
+    assert len(LogParser.read_head(path)) == log_parser.HEAD_SIZE
+    path.write_bytes(b"short")
+    assert LogParser.read_head(path) == b"short"
+
+
+def test_session_key_falls_back_to_the_header(parser, tmp_path):
+    # Values on the line after the label: the byte pattern misses them
+    text = parser.read_log(LOGS / "two_sessions.txt").replace("Session data: From", "Session data:\nFrom")
+    path = tmp_path / "Hunting_Session.txt"
+    path.write_text(text, encoding="utf-8")
+    head = parser.read_head(path)
+    assert log_parser._SESSION_KEY_BYTES.search(head) is None
+    first = BASELINE["two_sessions.txt"][0]["hunt_data"]
+    assert parser.session_key(head, path) == SessionKey(first["data_inicio"], first["hora_inicio"], first["hora_fim"])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many_keeps_order_and_reports_errors(parser, workers, tmp_path):
+    single = [LOGS / n for n in sorted(BASELINE) if len(BASELINE[n]) == 1]
+    items = single * 3 + [tmp_path / "missing.txt", parser.read_log(single[0])]
+    results = parser.parse_many(items, workers=workers)
+
+    assert [r.source for r in results] == items
+    for path, r in zip(single * 3, results):
+        expected = BASELINE[path.name][0]
+        assert r.error is None
+        assert (r.info, r.monsters) == (expected["hunt_data"], _monsters(expected))
+        assert r.text == parser.read_log(path)
+    missing = results[-2]
+    assert missing.error and (missing.text, missing.info, missing.monsters) == ("", {}, [])
+    assert results[-1].info == BASELINE[single[0].name][0]["hunt_data"]
@@ -0,0 +1,67 @@
+"""Hunts_Loot: items saved with their hunt, aggregates, and the raw_text backfill."""
+from collections import Counter
+
+import pytest
+
+from src.infrastructure.database.sqlite_repository import SQLiteHuntRepository
+from src.infrastructure.parser.log_parser import LogParser
+from tests.conftest import CHARACTERS, LOGS, make_hunts
+
+FULL_LOG = (LOGS / "session_full.txt").read_text(encoding="utf-8")
+
+
+def _logged_hunts(count):
+    # Hunts whose loot is only in their log text, as saved before Hunts_Loot
+    hunts = make_hunts(count, seed=3)
+    for n, hunt in enumerate(hunts):
+        hunt.raw_text = FULL_LOG.replace("10:51:14", f"10:{n // 60:02d}:{n % 60:02d}", 1)
+        hunt.looted_items = []
+    return hunts
+
+
+def _loot(repo):
+    conn = repo._get_connection()
+    return {r[0]: r[1] for r in conn.execute("SELECT hunt_id, COUNT(*) FROM Hunts_Loot GROUP BY hunt_id")}
+
+
+@pytest.mark.parametrize("filters", [{}, {"character": CHARACTERS[1]}, {"date_start": "2025-04-01", "date_end": "2025-06-30"}])
+def test_loot_aggregates_sum_the_saved_items(repo, filters):
+    repo.save_many(make_hunts(150, seed=9))
+    expected = Counter()
+    for hunt in repo.get_all(filters):
+        for item in repo.get_by_id(hunt.id).looted_items:
+            expected[item.name] += item.amount
+    aggregates = repo.get_loot_aggregates(filters)
+    assert dict(aggregates) == expected
+    assert [total for _, total in aggregates] == sorted(expected.values(), reverse=True)
+
+
+def test_backfill_resumes_from_its_stored_position(db_path):
+    extract = LogParser().extract_items
+    expected_items = len(extract(FULL_LOG))
+    repo = SQLiteHuntRepository(db_path)
+    ids = [r.hunt_id for r in repo.save_many(_logged_hunts(7))]
+    first = repo.backfill_loot(extract, batch_size=3, max_batches=1)
+    assert first == (3, False)
+    assert repo.get_setting("loot_backfill_last_id") == str(ids[2])
+    repo.close()
+
+    # A new session picks up after the last batch: rows before it are not revisited
+    repo = SQLiteHuntRepository(db_path)
+    try:
+        repo._get_connection().execute("DELETE FROM Hunts_Loot WHERE hunt_id = ?", (ids[0],))
+        repo._get_connection().commit()
+        assert repo.backfill_loot(extract, batch_size=3) == (4, True)
+        assert _loot(repo) == {i: expected_items for i in ids[1:]}
+        assert repo.backfill_loot(extract, batch_size=3) == (0, True)
+    finally:
+        repo.close()
+
+
+def test_backfill_skips_hunts_saved_with_their_items(repo):
+    repo.save_many(make_hunts(10, seed=2) + _logged_hunts(2))
+    before = _loot(repo.inner)
+    assert repo.backfill_loot(LogParser().extract_items, batch_size=4) == (2, True)
+    after = _loot(repo.inner)
+    assert {i: n for i, n in after.items() if i in before} == before
+    assert len(after) == len(before) + 2
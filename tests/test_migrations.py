@@ -0,0 +1,91 @@
+import sqlite3
+from collections import Counter
+from contextlib import closing
+
+from src.infrastructure.database.migrations import SCHEMA_VERSION, migrate, schema_version
+from src.infrastructure.database.sqlite_repository import SQLiteHuntRepository
+
+
+def _baseline_rows(path):
+    with closing(sqlite3.connect(path)) as conn:
+        conn.row_factory = sqlite3.Row
+        hunts = {r["id"]: dict(r) for r in conn.execute("SELECT * FROM Hunts")}
+        monsters = {}
+        for r in conn.execute("SELECT hunt_id, criatura, quantidade FROM Hunts_Monstros"):
+            monsters.setdefault(r["hunt_id"], Counter())[(r["criatura"], r["quantidade"])] += 1
+        seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'Hunts'").fetchone()[0]
+    return hunts, monsters, seq
+
+
+def test_migrate_baseline_to_current(baseline_db):
+    with closing(sqlite3.connect(baseline_db)) as conn:
+        assert schema_version(conn) == 0
+        assert migrate(conn) == SCHEMA_VERSION
+        assert schema_version(conn) == SCHEMA_VERSION
+        assert migrate(conn) == 0  # nothing pending
+
+
+def test_migrate_keeps_every_hunt(baseline_db):
+    hunts, monsters, seq = _baseline_rows(baseline_db)
+    repo = SQLiteHuntRepository(baseline_db)  # migrates on open
+    try:
+        assert repo.count({}) == len(hunts)
+        for hunt_id, row in hunts.items():
+            hunt = repo.get_by_id(hunt_id)
+            assert (hunt.character, hunt.location, hunt.date, hunt.start_time, hunt.end_time) == (
+                row["personagem"], row["local"], row["data"], row["hora_inicio"], row["hora_fim"]
+            )
+            assert (hunt.duration_min, hunt.raw_xp_gain, hunt.xp_gain, hunt.loot, hunt.supplies,
+                    hunt.balance, hunt.damage, hunt.healing) == (
+                row["duracao_min"], row["raw_xp_gain"], row["xp_gain"], row["loot"], row["supplies"],
+                row["balance"], row["damage"], row["healing"]
+            )
+            assert hunt.raw_text == row["raw_text"]
+            assert Counter((m.name, m.amount) for m in hunt.monsters) == monsters.get(hunt_id, Counter())
+
+        # AUTOINCREMENT carried over: ids of deleted hunts are not reused
+        conn = repo._get_connection()
+        assert conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'Hunts'").fetchone()[0] == seq
+        assert conn.execute("SELECT COUNT(*) FROM Hunts_Monstros WHERE hunt_id = 20").fetchone()[0] == 0
+    finally:
+        repo.close()
+
+
+def test_migrated_schema(baseline_db):
+    repo = SQLiteHuntRepository(baseline_db)
+    try:
+        conn = repo._get_connection()
+        cols = {r[1] for r in conn.execute("PRAGMA table_info(Hunts)")}
+        assert {"character_id", "location_id", "content_hash"} <= cols
+        assert not {"personagem", "local", "raw_text"} & cols
+        assert conn.execute("SELECT COUNT(*) FROM Hunts WHERE content_hash IS NULL").fetchone()[0] == 0
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+        # A character only referenced by hunts is kept, hidden from the lists
+        assert "Old Knight" not in repo.list_characters()
+        assert repo.get_all({"character": "Old Knight"})
+        assert repo.get_default_character() == "Elite Vini"
+    finally:
+        repo.close()
+
+
+def test_migrate_leaves_duplicates_to_the_user(baseline_db):
+    repo = SQLiteHuntRepository(baseline_db)
+    try:
+        conn = repo._get_connection()
+        (index_sql,) = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'idx_hunts_content_hash'"
+        ).fetchone()
+        assert "UNIQUE" not in index_sql
+        assert repo.count_duplicate_hunts() == 1
+    finally:
+        repo.close()
+
+
+def test_migrate_empty_database(db_path):
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert migrate(conn) == SCHEMA_VERSION
+    repo = SQLiteHuntRepository(db_path)
+    try:
+        assert repo.count({}) == 0
+    finally:
+        repo.close()
@@ -0,0 +1,103 @@
+"""Keyset paging (get_page / get_page_keys) through every SORT_COLUMNS order."""
+import random
+
+import pytest
+
+from src.application.interfaces.repository import SORT_COLUMNS
+from tests.conftest import CHARACTERS, make_hunt
+
+PAGE = 7
+FILTERS = [
+    {},
+    {"character": CHARACTERS[0]},
+    {"date_start": "2025-02-01", "date_end": "2025-09-30"},
+    {"character": CHARACTERS[1], "location": "Issavi"},
+]
+
+
+def _sort_key(column):
+    if column == "date":
+        return lambda h: (h.date or "9999-99-99", h.start_time or "00:00:00", h.id)
+    if column == "id":
+        return lambda h: (h.id,)
+    return lambda h: (getattr(h, column) or 0, h.id)
+
+
+@pytest.fixture
+def paged_repo(repo):
+    rng = random.Random(25)
+    hunts = [make_hunt(rng, n) for n in range(230)]
+    for n, hunt in enumerate(hunts):
+        hunt.xp_gain = rng.choice((0, 100, 250))  # long runs of ties
+        if n % 17 == 0:
+            hunt.date = None
+        if n % 13 == 0:
+            hunt.start_time = None
+        if n % 11 == 0:
+            hunt.loot = hunt.supplies = None
+            hunt.balance = 0
+    repo.save_many(hunts)
+    return repo
+
+
+def _walk(repo, filters, order):
+    ids, after = [], None
+    while True:
+        page = repo.get_page(filters, after, PAGE, order)
+        assert len(page.hunts) <= PAGE
+        ids.extend(h.id for h in page.hunts)
+        if page.next_key is None:
+            return ids
+        after = page.next_key
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("column", SORT_COLUMNS)
+def test_pages_cover_the_list_in_order(paged_repo, column, descending, filters):
+    order = (column, descending)
+    expected = [h.id for h in sorted(paged_repo.get_all(filters), key=_sort_key(column), reverse=descending)]
+    assert expected  # every filter selects something
+    assert _walk(paged_repo, filters, order) == expected
+    assert paged_repo.count(filters) == len(expected)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("column", SORT_COLUMNS)
+def test_page_keys_jump_to_any_page(paged_repo, column, descending, filters):
+    order = (column, descending)
+    expected = _walk(paged_repo, filters, order)
+    keys = paged_repo.get_page_keys(filters, PAGE, order)
+    assert len(keys) == (len(expected) - 1) // PAGE
+    for i, key in enumerate(keys):
+        page = paged_repo.get_page(filters, key, PAGE, order)
+        assert [h.id for h in page.hunts] == expected[(i + 1) * PAGE:(i + 2) * PAGE]
+
+
+def test_unknown_sort_column(paged_repo):
+    with pytest.raises(ValueError):
+        paged_repo.get_page({}, None, PAGE, ("raw_text", True))
+
+
+@pytest.mark.parametrize("filters", FILTERS + [{"location_like": "bast"}, {"ids": tuple(range(1, 230, 3))}])
+def test_default_order_pages_follow_the_hunt_list(paged_repo, filters):
+    expected = [h.id for h in paged_repo.get_all(filters)]
+    ids, after = [], None
+    while True:
+        page = paged_repo.get_page(filters, after, PAGE)
+        ids.extend(h.id for h in page.hunts)
+        if page.next_key is None:
+            break
+        after = page.next_key
+    assert ids == expected
+    assert paged_repo.count(filters) == len(expected)
+
+
+def test_writes_before_the_key_do_not_shift_later_pages(paged_repo):
+    first = paged_repo.get_page({}, None, PAGE)
+    expected = [h.id for h in paged_repo.get_page({}, first.next_key, PAGE).hunts]
+    # A hunt newer than every listed one, and the removal of a listed one
+    paged_repo.save(make_hunt(random.Random(1), 999, date="2030-01-01"))
+    paged_repo.delete_many([first.hunts[0].id])
+    assert [h.id for h in paged_repo.get_page({}, first.next_key, PAGE).hunts] == expected
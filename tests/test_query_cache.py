@@ -0,0 +1,123 @@
+import pytest
+
+from src.infrastructure.database.cached_repository import QueryCache
+from src.infrastructure.parser.log_parser import LogParser
+from tests.conftest import CHARACTERS, LOGS, make_hunts
+
+
+def test_hits_and_invalidation():
+    cache = QueryCache()
+    calls = []
+    compute = lambda: calls.append(1) or [1, 2, 3]  # noqa: E731
+    assert cache.get_or_compute(("q",), compute) == [1, 2, 3]
+    assert cache.get_or_compute(("q",), compute) == [1, 2, 3]
+    assert (len(calls), cache.hits, cache.misses) == (1, 1, 1)
+    cache.invalidate()
+    assert cache.size_bytes == 0
+    cache.get_or_compute(("q",), compute)
+    assert len(calls) == 2
+
+
+def test_result_of_a_query_overlapping_a_write_is_not_kept():
+    cache = QueryCache()
+
+    def compute():
+        cache.invalidate()  # a write committed while the query ran
+        return "stale"
+
+    assert cache.get_or_compute(("q",), compute) == "stale"
+    assert cache.get_or_compute(("q",), lambda: "fresh") == "fresh"
+
+
+def test_least_recently_used_results_are_evicted():
+    cache = QueryCache(max_bytes=3000)
+    for n in range(10):
+        cache.get_or_compute((n,), lambda: "x" * 900)
+        cache.get_or_compute((0,), lambda: pytest.fail("entry 0 was evicted"))
+    assert cache.size_bytes <= 3000
+    misses = cache.misses
+    cache.get_or_compute((1,), lambda: "x" * 900)
+    assert cache.misses == misses + 1
+
+
+@pytest.fixture
+def filled(repo):
+    repo.save_many(make_hunts(40))
+    return repo
+
+
+def _ids(repo):
+    return [h.id for h in repo.get_all({})]
+
+
+WRITES = {
+    "save": lambda r: r.save(make_hunts(1, seed=99)[0]),
+    "save_many": lambda r: r.save_many(make_hunts(3, seed=98)),
+    "update": lambda r: r.update(_with(r.get_by_id(_ids(r)[0]), character="Renamed")),
+    "update_many": lambda r: r.update_many(_ids(r)[:5], {"location": "Issavi"}),
+    "delete_many": lambda r: r.delete_many(_ids(r)[:5]),
+    "remove_duplicate_hunts": lambda r: r.remove_duplicate_hunts(),
+    "add_character": lambda r: r.add_character("Fresh Druid"),
+    "set_default_character": lambda r: r.set_default_character(CHARACTERS[2]),
+    "set_setting": lambda r: r.set_setting("window_geometry", "800x600"),
+}
+
+
+def _with(hunt, **changes):
+    for name, value in changes.items():
+        setattr(hunt, name, value)
+    return hunt
+
+
+@pytest.mark.parametrize("write", sorted(WRITES))
+def test_every_write_invalidates(filled, write):
+    filled.get_all({})
+    filled.list_characters()
+    assert filled.cache.size_bytes > 0
+    generation = filled.cache.generation
+    WRITES[write](filled)
+    assert filled.cache.generation > generation
+    assert filled.cache.size_bytes == 0
+    assert filled.get_all({}) == filled.inner.get_all({})
+    assert filled.list_characters() == filled.inner.list_characters()
+
+
+def test_failed_write_still_invalidates(filled):
+    filled.count({})
+    generation = filled.cache.generation
+    with pytest.raises(Exception):
+        filled.update_many([1], {"character": None})  # NOT NULL
+    assert filled.cache.generation > generation
+
+
+def test_equivalent_filters_share_an_entry(filled):
+    filled.count({})
+    hits = filled.cache.hits
+    assert filled.count({"character": "Todos", "date_start": "", "date_end": None}) == 40
+    assert filled.cache.hits == hits + 1
+
+
+def test_callers_cannot_change_cached_results(filled):
+    hunts = filled.get_all({})
+    hunts.clear()
+    assert len(filled.get_all({})) == 40
+    columns = filled.get_columns({}, ("loot",))
+    with pytest.raises(ValueError):
+        columns["loot"][0] = 0
+
+
+def test_loot_backfill_invalidates_only_when_it_fills(filled):
+    extract = LogParser().extract_items
+    filled.get_all({})
+    generation = filled.cache.generation
+    assert filled.backfill_loot(extract).filled == 0  # hunts saved with their loot
+    assert filled.cache.generation == generation and filled.cache.size_bytes > 0
+
+    (hunt,) = make_hunts(1, seed=3)
+    hunt.raw_text, hunt.looted_items = (LOGS / "session_full.txt").read_text(encoding="utf-8"), []
+    filled.save(hunt)
+    filled.get_loot_aggregates({})
+    generation = filled.cache.generation
+    assert filled.backfill_loot(extract).filled == 1
+    assert filled.cache.generation > generation
+    assert filled.get_loot_aggregates({}) == filled.inner.get_loot_aggregates({})
@@ -0,0 +1,69 @@
+"""HuntsRaw: the raw_text codecs and the migration moving the inline text out of Hunts."""
+import sqlite3
+import zlib
+from contextlib import closing
+
+import pytest
+
+from src.infrastructure.database.raw_text_codec import (
+    CODEC_PLAIN, CODEC_ZLIB_DICT_1, decode_raw_text, encode_raw_text, raw_text_hash,
+)
+from src.infrastructure.database.sqlite_repository import SQLiteHuntRepository
+from tests.conftest import LOGS, migrate_to
+
+TEXTS = [p.read_bytes().decode("utf-8", "replace") for p in sorted(LOGS.glob("*.txt"))]
+
+
+@pytest.mark.parametrize("text", TEXTS + ["Açaí, 1x a gold coin ✓\n", " "])
+def test_round_trip(text):
+    codec, blob = encode_raw_text(text)
+    assert codec == CODEC_ZLIB_DICT_1
+    assert decode_raw_text(codec, blob) == text
+
+
+def test_the_dictionary_shrinks_short_logs():
+    text = (LOGS / "session_full.txt").read_text(encoding="utf-8")
+    _, blob = encode_raw_text(text)
+    assert len(blob) < len(zlib.compress(text.encode("utf-8"), 9))
+    assert len(blob) < len(text.encode("utf-8")) // 2
+
+
+def test_other_codecs():
+    assert decode_raw_text(CODEC_PLAIN, "Loot: 1\n".encode("utf-8")) == "Loot: 1\n"
+    with pytest.raises(ValueError):
+        decode_raw_text(99, b"")
+    assert encode_raw_text("") is None
+    assert encode_raw_text(None) is None
+
+
+def test_hash_ignores_whitespace_layout():
+    text = (LOGS / "session_full.txt").read_text(encoding="utf-8")
+    pasted = "\r\n".join("    " + line.strip() + "  " for line in text.splitlines()) + "\r\n\r\n"
+    assert raw_text_hash(pasted) == raw_text_hash(text)
+    assert raw_text_hash(text.replace("Loot:", "Loot: 1")) != raw_text_hash(text)
+    assert raw_text_hash("") is None
+    assert raw_text_hash(None) is None
+
+
+def test_v3_moves_the_inline_text(baseline_db):
+    migrate_to(baseline_db, 2)
+    with closing(sqlite3.connect(baseline_db)) as conn:
+        texts = dict(conn.execute("SELECT id, raw_text FROM Hunts"))
+    migrate_to(baseline_db, 3)
+
+    with closing(sqlite3.connect(baseline_db)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM Hunts WHERE raw_text IS NOT NULL").fetchone()[0] == 0
+        moved = {hunt_id: decode_raw_text(codec, data)
+                 for hunt_id, codec, data in conn.execute("SELECT hunt_id, codec, data FROM HuntsRaw")}
+        assert moved == {i: t for i, t in texts.items() if t}
+        # The legacy script still writes the column until v5
+        conn.execute("UPDATE Hunts SET raw_text = 'Session data: edited' WHERE id = 2")
+        conn.commit()
+
+    repo = SQLiteHuntRepository(baseline_db)
+    try:
+        assert repo.get_by_id(1).raw_text == texts[1]
+        assert repo.get_by_id(2).raw_text == "Session data: edited"
+        assert all(h.raw_text == "" for h in repo.get_all({}))  # listings leave the text out
+    finally:
+        repo.close()
@@ -0,0 +1,47 @@
+import pytest
+
+from tests.conftest import make_hunts
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 500])
+def test_failing_rows_do_not_stop_their_chunk(repo, chunk_size):
+    hunts = make_hunts(10)
+    hunts[3].character = None  # NOT NULL
+    hunts[7].location = None
+    results = repo.save_many(hunts, chunk_size=chunk_size)
+
+    assert [r.error is not None for r in results] == [i in (3, 7) for i in range(10)]
+    saved = [r.hunt_id for r in results if r.error is None]
+    assert saved == sorted(saved) and len(set(saved)) == 8
+    assert not any(r.existing for r in results)
+    assert repo.count({}) == 8
+
+    conn = repo.inner._get_connection()
+    orphans = conn.execute(
+        "SELECT COUNT(*) FROM Hunts_Monstros WHERE hunt_id NOT IN (SELECT id FROM Hunts)"
+    ).fetchone()[0]
+    assert orphans == 0
+    for hunt, result in zip(hunts, results):
+        if result.error is None:
+            stored = repo.get_by_id(result.hunt_id)
+            assert (stored.character, stored.balance, stored.raw_text) == (hunt.character, hunt.balance, hunt.raw_text)
+            assert sorted((m.name, m.amount) for m in stored.monsters) == sorted((m.name, m.amount) for m in hunt.monsters)
+            assert sorted((i.name, i.amount) for i in stored.looted_items) == sorted(
+                (i.name, i.amount) for i in hunt.looted_items
+            )
+
+
+def test_saved_hunts_are_reported_as_changes(repo):
+    repo.drain_changes()
+    results = repo.save_many(make_hunts(5))
+    changes = repo.drain_changes()
+    assert changes.inserted == {r.hunt_id for r in results}
+    assert repo.drain_changes().inserted == set()
+
+
+def test_ids_continue_after_deleted_hunts(repo):
+    first = repo.save_many(make_hunts(5))
+    repo.delete_many([first[-1].hunt_id])
+    (result,) = repo.save_many(make_hunts(1, seed=1))
+    assert not result.existing
+    assert result.hunt_id > first[-1].hunt_id
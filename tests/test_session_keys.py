@@ -0,0 +1,31 @@
+import random
+
+from tests.conftest import CHARACTERS, make_hunt, make_hunts
+
+
+def test_existing_session_keys(repo):
+    hunts = make_hunts(30, seed=5)
+    ids = [r.hunt_id for r in repo.save_many(hunts)]
+    first, second = hunts[0], hunts[1]
+    other = next(c for c in CHARACTERS if c != first.character)
+    keys = [
+        (first.character, first.date, first.start_time),
+        (None, second.date, second.start_time),
+        (None, first.date, ""),                      # any session that day
+        (other, first.date, first.start_time),       # someone else's
+        (None, "1999-01-01", "10:00:00"),
+        (first.character, first.date, first.start_time),  # repeated
+    ]
+    found = repo.existing_session_keys(keys)
+    same_day = min(i for i, h in zip(ids, hunts) if h.date == first.date)
+    assert found == {keys[0]: ids[0], keys[1]: ids[1], keys[2]: same_day}
+
+
+def test_each_call_answers_only_its_keys(repo):
+    rng = random.Random(1)
+    a = make_hunt(rng, 1, date="2025-05-01", start_time="10:00:00")
+    b = make_hunt(rng, 2, date="2025-05-02", start_time="11:00:00")
+    id_a, id_b = repo.save(a), repo.save(b)
+    assert repo.existing_session_keys([(None, a.date, a.start_time)]) == {(None, a.date, a.start_time): id_a}
+    assert repo.existing_session_keys([(None, b.date, b.start_time)]) == {(None, b.date, b.start_time): id_b}
+    assert repo.existing_session_keys([]) == {}
@@ -0,0 +1,73 @@
+"""Startup trace budget, and the heavy modules kept off the startup imports."""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure import startup_trace
+
+ROOT = Path(__file__).parents[1]
+
+
+@pytest.fixture
+def trace(monkeypatch):
+    monkeypatch.setattr(startup_trace, "ENABLED", True)
+    monkeypatch.setattr(startup_trace, "_marks", [])
+    monkeypatch.setattr(startup_trace, "_START", 100.0)
+    monkeypatch.setattr(startup_trace, "BUDGET_MS", 1500.0)
+    return startup_trace
+
+
+def test_phases_are_reported_against_the_budget(trace, capsys):
+    trace._marks[:] = [("imports", 100.4), ("database open/migrate", 100.5), ("first idle", 101.2)]
+    assert trace.report()
+    out = capsys.readouterr().out
+    assert "imports" in out and "400.0 ms" in out and "700.0 ms" in out
+    assert "1200.0 ms (budget 1500 ms)" in out
+
+    trace._marks.append(("late", 101.6))
+    assert not trace.report()
+    assert "EXCEEDED" in capsys.readouterr().out
+
+
+def test_marks_are_only_kept_when_enabled(trace, monkeypatch):
+    trace.mark("a")
+    monkeypatch.setattr(startup_trace, "ENABLED", False)
+    trace.mark("b")
+    assert [label for label, _ in trace._marks] == ["a"]
+
+
+@pytest.mark.parametrize("over_budget", [False, True])
+def test_exit_mode_closes_the_app_with_the_budget_status(trace, monkeypatch, capsys, over_budget):
+    monkeypatch.setattr(startup_trace, "MODE", "exit")
+    monkeypatch.setattr(startup_trace, "BUDGET_MS", -1.0 if over_budget else 10**9)
+    closed = []
+    with pytest.raises(SystemExit) as exc:
+        trace.finish(lambda: closed.append(True))
+    assert closed == [True]
+    assert exc.value.code == (1 if over_budget else 0)
+    assert "first idle" in capsys.readouterr().out
+
+
+def test_startup_imports_leave_the_heavy_modules_out():
+    modules = [
+        "src.infrastructure.startup_trace",
+        "src.infrastructure.database.cached_repository",
+        "src.infrastructure.database.sqlite_repository",
+        "src.infrastructure.parser.log_parser",
+        "src.application.services.import_pipeline",
+        "src.application.services.folder_scanner",
+        "src.ui.worker",
+    ]
+    try:
+        import customtkinter  # noqa: F401
+        modules.append("src.ui.main_window")
+    except ImportError:
+        pass
+    code = "\n".join(f"import {m}" for m in modules) + (
+        "\nimport sys\nfrom src.infrastructure.startup_trace import HEAVY_MODULES\n"
+        "print(','.join(m for m in HEAVY_MODULES if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
@@ -0,0 +1,103 @@
+"""BackgroundWorker: one thread, results delivered through after(), keyed supersession."""
+import threading
+
+import pytest
+
+from src.ui.worker import BackgroundWorker
+
+
+class FakeRoot:
+    """Stands in for Tk: after() callbacks run when the test pumps them."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, fn):
+        self.pending.append(fn)
+
+    def pump(self):
+        pending, self.pending = self.pending, []
+        for fn in pending:
+            fn()
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+@pytest.fixture
+def worker(root):
+    w = BackgroundWorker(root)
+    yield w
+    w.close()
+
+
+def _deliver(root, worker):
+    # Requests are handed back after their future completes: wait for one
+    # submitted last, by then every earlier one is in the done queue.
+    worker.submit(lambda: None).result(timeout=5)
+    root.pump()
+
+
+def test_requests_run_in_order_and_callbacks_on_the_polling_thread(root, worker):
+    ran, delivered = [], []
+    futures = [
+        worker.submit(lambda n: ran.append((n, threading.current_thread().name)) or n * 10, n,
+                      on_done=lambda r: delivered.append((r, threading.current_thread().name)))
+        for n in range(5)
+    ]
+    assert [f.result(timeout=5) for f in futures] == [0, 10, 20, 30, 40]
+    assert ran == [(n, "db-worker") for n in range(5)]
+    assert delivered == []  # nothing until the next poll
+    _deliver(root, worker)
+    assert delivered == [(n * 10, threading.current_thread().name) for n in range(5)]
+
+
+def test_a_newer_request_skips_a_queued_one(root, worker):
+    gate = threading.Event()
+    delivered = []
+    worker.submit(gate.wait)
+    older = worker.submit(lambda: "older", key="list", on_done=delivered.append)
+    worker.submit(lambda: "newer", key="list", on_done=delivered.append)
+    worker.submit(lambda: "other", key="chart", on_done=delivered.append)
+    gate.set()
+    _deliver(root, worker)
+    assert older.cancelled()
+    assert delivered == ["newer", "other"]
+
+
+def test_the_result_of_a_superseded_running_request_is_dropped(root, worker):
+    started, gate = threading.Event(), threading.Event()
+    delivered = []
+    running = worker.submit(lambda: started.set() or gate.wait() and "stale", key="list", on_done=delivered.append)
+    assert started.wait(5)
+    worker.submit(lambda: "fresh", key="list", on_done=delivered.append)
+    gate.set()
+    _deliver(root, worker)
+    assert running.result() == "stale"  # computed, but not delivered
+    assert delivered == ["fresh"]
+
+
+def test_errors_go_to_on_error(root, worker):
+    errors, delivered = [], []
+    worker.submit(lambda: 1 / 0, on_done=delivered.append, on_error=errors.append)
+    worker.submit(lambda: "still running", on_done=delivered.append)
+    _deliver(root, worker)
+    assert [type(e) for e in errors] == [ZeroDivisionError]
+    assert delivered == ["still running"]
+
+
+def test_close_skips_queued_requests(root):
+    worker = BackgroundWorker(root)
+    started, gate = threading.Event(), threading.Event()
+    running = worker.submit(lambda: started.set() or gate.wait())
+    assert started.wait(5)
+    queued = worker.submit(lambda: "never")
+    threading.Timer(0.05, gate.set).start()
+    worker.close()
+    assert running.result() is True  # the running one finishes
+    assert queued.cancelled()
+    assert worker.submit(lambda: "late").cancelled()
+    root.pump()
+    assert root.pending == []  # polling stopped